@@ -0,0 +1,6 @@
+"""Offline load-test harness: drives the real Application against fake Telegram and X backends."""
+
+# Telegram ids used by the fixtures
+ADMIN_ID = 900000001
+CUSTOMER_ID = 900000002
+KOL_ID_BASE = 100000
@@ -0,0 +1,192 @@
+"""Synthetic data generator: realistic KOLs, campaigns and acceptances at any scale.
+
+    python -m bench.datagen --acceptances 100000 --sqlite-path /tmp/kols-100k.db
+    python -m bench.datagen --acceptances 100000 --backend postgres --database-url postgresql://localhost/kols_bench
+
+The target database is emptied first. Distributions are skewed the way real
+traffic is: a minority of KOLs take most campaigns, most campaigns are
+finished, and most verified work is paid.
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+from bench import CUSTOMER_ID, KOL_ID_BASE
+
+_CHUNK = 5000
+
+# (status, weight) for campaigns, and acceptance status mixes per campaign status
+_CAMPAIGN_STATUS_WEIGHTS = [
+    ("live", 15), ("filled", 5), ("completed", 45), ("expired", 20), ("cancelled", 5), ("pending_payment", 10),
+]
+_ACCEPTANCE_MIX = {
+    "live": [("accepted", 40), ("submitted", 20), ("verified", 35), ("rejected", 5)],
+    "filled": [("accepted", 20), ("submitted", 25), ("verified", 50), ("rejected", 5)],
+    "completed": [("verified", 92), ("rejected", 8)],
+    "expired": [("accepted", 30), ("submitted", 20), ("verified", 35), ("rejected", 15)],
+    "cancelled": [("accepted", 100)],
+}
+
+
+def sizes_for(acceptances: int) -> dict:
+    """KOL and campaign counts that go with a given number of acceptances."""
+    return {
+        "kols": max(100, acceptances // 20),
+        "campaigns": max(10, acceptances // 20),
+        "acceptances": acceptances,
+    }
+
+
+def _ts(dt: datetime.datetime) -> str:
+    return dt.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _pick(rng, weighted):
+    return rng.choices([v for v, _ in weighted], weights=[w for _, w in weighted])[0]
+
+
+def _insert(cur, sql: str, rows: list):
+    for i in range(0, len(rows), _CHUNK):
+        cur.executemany(sql, rows[i:i + _CHUNK])
+
+
+def generate(kols: int, campaigns: int, acceptances: int, seed: int = 42, analyze: bool = True) -> dict:
+    """Empty the configured database and fill it. Returns the counts written.
+
+    analyze=False skips ANALYZE, leaving SQLite's planner on its index-favouring
+    heuristics (used by the plan guard).
+    """
+    from bench.seed import reset
+    from config import SERVICE_TIERS
+    from db.campaign_repo import rebuild_search_index, reconcile_campaign_counters
+    from db.connection import get_conn, ph
+
+    rng = random.Random(seed)
+    now = datetime.datetime.utcnow()
+    p = ph()
+    reset()
+    conn = get_conn()
+    cur = conn.cursor()
+
+    # --- KOLs: log-normal followers, mostly verified and active ---
+    kol_ids = list(range(KOL_ID_BASE, KOL_ID_BASE + kols))
+    kol_rows = []
+    for tid in kol_ids:
+        followers = int(rng.lognormvariate(8, 1.6))
+        kol_rows.append((
+            tid, f"@kol{tid}", f"KOL {tid}", f"kol{tid}",
+            f"0x{rng.getrandbits(160):040x}" if rng.random() < 0.97 else None,
+            f"{rng.getrandbits(48)}", followers, rng.random() < 0.85, rng.random() < 0.95,
+            round(rng.uniform(60, 100), 1), _ts(now - datetime.timedelta(days=rng.uniform(0, 365))),
+        ))
+    _insert(cur, f"INSERT INTO kols (telegram_id, telegram_handle, name, x_account, wallet_address, x_user_id, "
+                 f"follower_count, is_verified, is_active, reputation_score, registered_at) "
+                 f"VALUES ({p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p})", kol_rows)
+
+    # --- customers ---
+    n_customers = max(1, campaigns // 5)
+    customer_ids = [CUSTOMER_ID + i for i in range(n_customers)]
+    _insert(cur, f"INSERT INTO customers (telegram_id, telegram_handle, name, project_x_account) VALUES ({p},{p},{p},{p})",
+            [(cid, f"@cust{cid}", f"Customer {cid}", f"project{cid}") for cid in customer_ids])
+
+    # --- campaigns ---
+    services = list(SERVICE_TIERS)
+    campaign_rows = []
+    for i in range(campaigns):
+        service = rng.choice(services)
+        _, rate, mn, mx = SERVICE_TIERS[service]
+        status = _pick(rng, _CAMPAIGN_STATUS_WEIGHTS)
+        kol_count = rng.randint(mn, mx)
+        created = now - datetime.timedelta(days=rng.uniform(0, 120))
+        deadline = now + datetime.timedelta(days=rng.uniform(1, 14)) if status in ("live", "filled", "pending_payment") \
+            else created + datetime.timedelta(days=rng.uniform(3, 14))
+        fee = rate * kol_count * 15 // 100
+        campaign_rows.append((
+            rng.choice(customer_ids), f"Project {i} {service}", service,
+            f"https://x.com/project/status/{rng.getrandbits(60)}", "Talking points for the campaign",
+            "#bench", kol_count, rate, fee, rate * kol_count + fee, _ts(deadline), status, _ts(created),
+        ))
+    _insert(cur, f"INSERT INTO campaigns (customer_telegram_id, project_name, service_type, target_url, talking_points, "
+                 f"hashtags, kol_count, per_kol_rate, platform_fee, total_cost, deadline, status, created_at) "
+                 f"VALUES ({p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p})", campaign_rows)
+    conn.commit()
+    cur.execute("SELECT id, kol_count, status FROM campaigns ORDER BY id")
+    campaign_list = [c for c in cur.fetchall() if c[2] != "pending_payment"]
+
+    # --- acceptances: Zipf-weighted KOL choice, unique per campaign ---
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(kols)]
+    shuffled = kol_ids[:]
+    rng.shuffle(shuffled)
+    capacity = sum(min(c[1], kols) for c in campaign_list) or 1
+    scale = acceptances / capacity
+    acc_rows = []
+    for campaign_id, kol_count, status in campaign_list:
+        want = min(kols, max(1, round(kol_count * scale)))
+        chosen = set()
+        while len(chosen) < want:
+            chosen.update(rng.choices(shuffled, weights=weights, k=want - len(chosen)))
+        for kid in chosen:
+            a_status = _pick(rng, _ACCEPTANCE_MIX[status])
+            accepted_at = now - datetime.timedelta(days=rng.uniform(0, 60))
+            url = submitted = verified = paid_at = None
+            payout = "unpaid"
+            if a_status in ("submitted", "verified", "rejected"):
+                url = f"https://x.com/kol{kid}/status/{rng.getrandbits(60)}"
+                submitted = _ts(accepted_at + datetime.timedelta(hours=rng.uniform(1, 48)))
+            if a_status == "verified":
+                verified = _ts(now - datetime.timedelta(days=rng.uniform(0, 30)))
+                if rng.random() < 0.7:
+                    payout, paid_at = "paid", verified
+            acc_rows.append((campaign_id, kid, a_status, url, _ts(accepted_at), submitted, verified, payout, paid_at))
+            if len(acc_rows) >= acceptances:
+                break
+        if len(acc_rows) >= acceptances:
+            break
+    _insert(cur, f"INSERT INTO campaign_acceptances (campaign_id, kol_telegram_id, status, submission_tweet_url, "
+                 f"accepted_at, submitted_at, verified_at, payout_status, paid_at) "
+                 f"VALUES ({p},{p},{p},{p},{p},{p},{p},{p},{p})", acc_rows)
+
+    # --- alert subscriptions: about a third of KOLs, each for a few service types ---
+    _insert(cur, f"INSERT INTO kol_alert_prefs (service_type, kol_telegram_id) VALUES ({p},{p})",
+            [(service, tid) for tid in kol_ids if rng.random() < 0.35
+             for service in rng.sample(services, rng.randint(1, 3))])
+
+    cur.execute(
+        "UPDATE campaigns SET accepted_count = "
+        "(SELECT COUNT(*) FROM campaign_acceptances ca WHERE ca.campaign_id = campaigns.id)"
+    )
+    if analyze:
+        cur.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+    reconcile_campaign_counters()
+    rebuild_search_index()
+    return {"kols": kols, "customers": n_customers, "campaigns": campaigns, "acceptances": len(acc_rows)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--acceptances", type=int, default=100000)
+    parser.add_argument("--kols", type=int, help="default: acceptances / 20")
+    parser.add_argument("--campaigns", type=int, help="default: acceptances / 20")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--backend", default="sqlite", choices=["sqlite", "postgres"])
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    parser.add_argument("--sqlite-path", help="SQLite file to fill (required for sqlite, to avoid touching kols.db)")
+    args = parser.parse_args(argv)
+    if args.backend == "sqlite" and not args.sqlite_path:
+        sys.exit("--sqlite-path is required for the sqlite backend")
+
+    from bench.env import configure
+    configure(args.backend, args.database_url, args.sqlite_path)
+    sizes = sizes_for(args.acceptances)
+    started = time.perf_counter()
+    counts = generate(args.kols or sizes["kols"], args.campaigns or sizes["campaigns"], args.acceptances, args.seed)
+    print(f"Generated {counts} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Environment setup shared by the bench entry points (must run before any project import)."""
+import os
+import sys
+import tempfile
+
+from bench import ADMIN_ID
+
+
+def configure(backend: str, database_url: str | None = None, sqlite_path: str | None = None):
+    """Point config at the bench database and enable the fake X client.
+
+    SQLite defaults to a fresh temp file so a bench never touches kols.db.
+    """
+    if backend == "postgres":
+        if not database_url:
+            sys.exit("--backend postgres needs --database-url (or BENCH_DATABASE_URL)")
+        os.environ["DATABASE_URL"] = database_url
+    elif backend == "sqlite":
+        os.environ["DATABASE_URL"] = ""
+        os.environ["SQLITE_PATH"] = sqlite_path or os.path.join(tempfile.mkdtemp(prefix="kols-bench-"), "bench.db")
+    else:
+        sys.exit(f"unknown backend {backend!r}; use sqlite or postgres")
+    os.environ.update({
+        "ADMIN_TELEGRAM_IDS": str(ADMIN_ID),
+        "ANNOUNCEMENT_CHANNEL_ID": "",
+        "GAME_TWITTER_ACCESS_TOKEN": "bench",
+        "METRICS_PORT": "0",
+        "SLOW_QUERY_MS": "60000",
+    })
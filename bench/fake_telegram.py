@@ -0,0 +1,115 @@
+"""A local stand-in for the Telegram Bot API, plugged in as the bot's request object."""
+import asyncio
+import itertools
+import json
+import time
+from collections import Counter
+
+from telegram.request import BaseRequest
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}
+
+# Methods that return True rather than a Message
+_BOOLEAN_METHODS = {
+    "answerCallbackQuery", "setMyCommands", "deleteMessage", "deleteWebhook",
+    "answerInlineQuery", "sendChatAction", "close", "logOut",
+}
+
+
+# Methods that count toward the global rate limit (messages sent or changed), as on Telegram
+_LIMITED_PREFIXES = ("send", "edit", "copy", "forward")
+
+
+class TokenBucket:
+    """Simple token bucket; rate=None means unlimited."""
+
+    def __init__(self, rate: float | None, burst: float | None = None):
+        self.rate = rate
+        self.capacity = burst or rate or 0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        if not self.rate:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class FakeBotAPI(BaseRequest):
+    """Answers Bot API calls locally with a configurable latency and global rate limit.
+
+    Message sends and edits over the rate limit get a 429 with retry_after, like the real API.
+    The last inline keyboard sent to each chat is kept so scenarios can
+    "press" buttons the bot rendered, and sent messages are counted per chat.
+    """
+
+    def __init__(self, latency: float = 0.0, rate_limit: float | None = None):
+        self.latency = latency
+        self.bucket = TokenBucket(rate_limit)
+        self.calls = Counter()
+        self.throttled = 0
+        self.last_markup = {}  # chat_id -> inline_keyboard rows
+        self.messages = Counter()  # (chat_id, first line of text) per sendMessage, to spot duplicates
+        self._message_ids = itertools.count(1000)
+
+    @property
+    def read_timeout(self) -> float | None:
+        """Nothing to time out on; abstract in BaseRequest on newer PTB releases."""
+        return None
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_request(self, url, method, request_data=None, *args, **kwargs):
+        api_method = url.rsplit("/", 1)[-1]
+        params = request_data.parameters if request_data else {}
+        self.calls[api_method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if api_method.startswith(_LIMITED_PREFIXES) and not self.bucket.take():
+            self.throttled += 1
+            return 429, json.dumps({
+                "ok": False, "error_code": 429,
+                "description": "Too Many Requests: retry after 1",
+                "parameters": {"retry_after": 1},
+            }).encode()
+        return 200, json.dumps({"ok": True, "result": self._result(api_method, params)}).encode()
+
+    def _result(self, api_method: str, params: dict):
+        if api_method == "getMe":
+            return BOT_USER
+        if api_method in _BOOLEAN_METHODS:
+            return True
+        chat_id = params.get("chat_id", 0)
+        if not isinstance(chat_id, int):
+            chat_id = -abs(hash(chat_id)) % 10**12
+        if api_method == "sendMessage":
+            self.messages[chat_id, (params.get("text") or "").split("\n", 1)[0]] += 1
+        markup = params.get("reply_markup")
+        if isinstance(markup, dict) and "inline_keyboard" in markup:
+            self.last_markup[chat_id] = markup["inline_keyboard"]
+        return {
+            "message_id": params.get("message_id") or next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private" if chat_id > 0 else "channel"},
+            "from": BOT_USER,
+            "text": params.get("text") or params.get("caption") or "",
+        }
+
+    def find_button(self, chat_id: int, label_prefix: str = "", data_prefix: str = "") -> str | None:
+        """callback_data of the first button in the chat's last keyboard matching the prefixes."""
+        for row in self.last_markup.get(chat_id, []):
+            for button in row:
+                data = button.get("callback_data")
+                if data and button.get("text", "").startswith(label_prefix) and data.startswith(data_prefix):
+                    return data
+        return None
@@ -0,0 +1,65 @@
+"""A stand-in for virtuals_tweepy.Client with configurable latency and rate limit.
+
+services.x_api calls the client from worker threads, so this is thread-safe
+and sleeps synchronously like the real SDK.
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+from bench.fake_telegram import TokenBucket
+
+
+class FakeXClient:
+    def __init__(self, latency: float = 0.15, rate_limit: float | None = None):
+        self.latency = latency
+        self.bucket = TokenBucket(rate_limit)
+        self.tweets = {}  # tweet_id -> author x_user_id
+        self.deleted = set()  # tweet ids that 404
+        self.retweeters = {}  # tweet_id -> [x_user_id]
+        self.calls = 0
+        self.throttled = 0
+        self.timings = []  # seconds per call, including throttled ones
+        self._lock = threading.Lock()
+
+    def _call(self):
+        started = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+            allowed = self.bucket.take()
+            if not allowed:
+                self.throttled += 1
+            self.timings.append(time.perf_counter() - started)
+        if not allowed:
+            raise Exception("429 Too Many Requests")
+
+    def get_user(self, username, user_fields=None):
+        self._call()
+        return SimpleNamespace(data=SimpleNamespace(
+            id=f"x_{username}", name=username, username=username,
+            public_metrics={"followers_count": 1000},
+        ))
+
+    def get_tweet(self, id, tweet_fields=None, expansions=None):
+        self._call()
+        tweet_id = str(id)
+        if tweet_id in self.deleted or tweet_id not in self.tweets:
+            return SimpleNamespace(data=None)
+        return SimpleNamespace(data=SimpleNamespace(
+            id=tweet_id, text="bench tweet", author_id=self.tweets[tweet_id],
+            entities=None, referenced_tweets=None, created_at=None,
+        ))
+
+    def get_retweeters(self, id):
+        self._call()
+        users = self.retweeters.get(str(id), [])
+        return SimpleNamespace(data=[SimpleNamespace(id=u) for u in users] or None)
+
+    def get_liking_users(self, id):
+        return self.get_retweeters(id)
+
+    def get_users_tweets(self, id, max_results=10):
+        self._call()
+        return SimpleNamespace(data=None)
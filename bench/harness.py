@@ -0,0 +1,103 @@
+"""Drives the Application built by bot.build_application with synthetic updates."""
+import asyncio
+import logging
+import time
+
+from bench.fake_telegram import FakeBotAPI
+from bench.fake_x import FakeXClient
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class Harness:
+    """One Application plus its fake backends, rebuilt for every scenario.
+
+    Updates go through ``send()``, which serializes processing the way the
+    Application's own update queue does (``concurrent_updates``, 1 by default)
+    and measures latency from arrival, so queueing delay under a burst counts.
+    """
+
+    def __init__(self, tg_latency: float, tg_rate: float | None, x_latency: float, x_rate: float | None):
+        from bot import build_application
+        from services import x_api
+
+        self.tg = FakeBotAPI(latency=tg_latency, rate_limit=tg_rate)
+        self.x = FakeXClient(latency=x_latency, rate_limit=x_rate)
+        x_api._client = self.x
+        x_api._read_available = True
+
+        self.app = build_application(token="123456:BENCH", request=self.tg)
+        self.app.add_error_handler(self._on_error)
+        self.errors = 0
+        self.latencies = []
+        self._slots = asyncio.Semaphore(self.app.update_processor.max_concurrent_updates)
+
+    @property
+    def bot(self):
+        return self.app.bot
+
+    async def _on_error(self, update, context):
+        self.errors += 1
+
+    async def __aenter__(self):
+        await self.app.initialize()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.app.shutdown()
+
+    async def send(self, update) -> float:
+        arrived = time.perf_counter()
+        async with self._slots:
+            await self.app.process_update(update)
+        latency = time.perf_counter() - arrived
+        self.latencies.append(latency)
+        return latency
+
+
+async def run_scenario(name: str, func, scale: float, opts: dict) -> dict:
+    async with Harness(**opts) as h:
+        started = time.perf_counter()
+        details = await func(h, scale)
+        wall = time.perf_counter() - started
+        latencies = details.pop("latencies", None) or h.latencies
+        return {
+            "scenario": name,
+            "operations": len(latencies),
+            "wall_s": round(wall, 3),
+            "throughput_per_s": round(len(latencies) / wall, 1) if wall else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "max_ms": round(max(latencies, default=0.0) * 1000, 2),
+            "errors": h.errors,
+            "tg_calls": sum(h.tg.calls.values()),
+            "tg_throttled": h.tg.throttled,
+            "x_calls": h.x.calls,
+            "x_throttled": h.x.throttled,
+            "checks": details,
+        }
+
+
+def format_report(results: list[dict]) -> str:
+    header = f"{'scenario':<18}{'backend':<10}{'ops':>7}{'wall s':>9}{'ops/s':>9}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>8}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r['scenario']:<18}{r.get('backend', ''):<10}{r['operations']:>7}{r['wall_s']:>9.2f}"
+            f"{r['throughput_per_s']:>9.1f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['max_ms']:>10.2f}{r['errors']:>8}"
+        )
+    for r in results:
+        checks = ", ".join(f"{k}={v}" for k, v in r["checks"].items())
+        lines.append(
+            f"  {r['scenario']} [{r.get('backend', '')}]: {checks}; "
+            f"telegram calls {r['tg_calls']} ({r['tg_throttled']} throttled), "
+            f"X calls {r['x_calls']} ({r['x_throttled']} throttled)"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,144 @@
+"""Query-plan regression guard for the hot queries registered in db/hot_queries.py.
+
+    python -m bench.plan_guard                 # SQLite (temp file)
+    python -m bench.plan_guard --backend postgres --database-url postgresql://localhost/kols_bench
+    python -m bench.plan_guard -v              # print every plan
+
+Each registered call runs inside a rolled-back unit of work. Every statement
+it executes is captured and EXPLAINed: EXPLAIN QUERY PLAN on SQLite, and
+EXPLAIN (FORMAT JSON) with enable_seqscan=off on Postgres, so a Seq Scan
+means no usable index exists. The exit status is 1 if a large table is
+scanned or an expected index is missing.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|UPDATE|DELETE|INSERT|WITH)\b", re.IGNORECASE)
+_ALIAS = re.compile(
+    r"\b(?:FROM|JOIN|UPDATE)\s+(\w+)(?:\s+(?:AS\s+)?(?!(?:WHERE|JOIN|ON|SET|ORDER|GROUP|LEFT|INNER|LIMIT|RETURNING)\b)(\w+))?",
+    re.IGNORECASE,
+)
+
+
+def _aliases(sql: str) -> dict:
+    names = {}
+    for table, alias in _ALIAS.findall(sql):
+        names[table.lower()] = table.lower()
+        if alias:
+            names[alias.lower()] = table.lower()
+    return names
+
+
+def explain_sqlite(cur, sql: str, params) -> tuple[list[str], set[str], list[str]]:
+    """(plan lines, indexes used, large tables scanned)."""
+    from db.hot_queries import LARGE_TABLES
+
+    cur.execute("EXPLAIN QUERY PLAN " + sql, params or ())
+    lines = [row[3] for row in cur.fetchall()]
+    aliases = _aliases(sql)
+    used, scanned = set(), []
+    for detail in lines:
+        used.update(re.findall(r"USING (?:COVERING )?INDEX (\w+)", detail))
+        match = re.match(r"SCAN (\w+)", detail)
+        if match and aliases.get(match.group(1).lower(), match.group(1).lower()) in LARGE_TABLES:
+            scanned.append(detail)
+    return lines, used, scanned
+
+
+def explain_postgres(cur, sql: str, params) -> tuple[list[str], set[str], list[str]]:
+    from db.hot_queries import LARGE_TABLES
+
+    cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+    plan = cur.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    lines, used, scanned = [], set(), []
+
+    def walk(node, depth=0):
+        relation = node.get("Relation Name")
+        label = node["Node Type"] + (f" on {relation}" if relation else "")
+        if node.get("Index Name"):
+            used.add(node["Index Name"])
+            label += f" using {node['Index Name']}"
+        lines.append("  " * depth + label)
+        if node["Node Type"] == "Seq Scan" and relation in LARGE_TABLES:
+            scanned.append(label)
+        for child in node.get("Plans", []):
+            walk(child, depth + 1)
+
+    walk(plan[0]["Plan"])
+    return lines, used, scanned
+
+
+def check(fx: dict, verbose: bool = False) -> list[str]:
+    """Run every registered hot query; return failure messages."""
+    from db.connection import connect, is_postgres, mark_rollback_only, unit_of_work
+    from db.hot_queries import HOT_QUERIES
+    from db.instrumentation import capture_statements
+
+    failures = []
+    conn = connect()
+    cur = conn.cursor()
+    if is_postgres():
+        cur.execute("SET enable_seqscan = off")
+    explain = explain_postgres if is_postgres() else explain_sqlite
+
+    for entry in HOT_QUERIES:
+        with unit_of_work(), capture_statements() as statements:
+            entry["call"](fx)
+            mark_rollback_only()
+
+        used_all, problems = set(), []
+        for sql, params in statements:
+            if not _EXPLAINABLE.match(sql):
+                continue
+            lines, used, scanned = explain(cur, sql, params)
+            used_all |= used
+            problems += [f"full scan: {s}" for s in scanned]
+            if verbose:
+                print(f"  {' '.join(sql.split())[:110]}")
+                print("\n".join(f"      {line}" for line in lines))
+        for expected in entry["indexes"]:
+            options = expected if isinstance(expected, tuple) else (expected,)
+            if not used_all & set(options):
+                problems.append(f"expected index {' or '.join(options)} not used")
+
+        print(f"{'FAIL' if problems else 'ok  '} {entry['name']}")
+        for problem in problems:
+            print(f"       {problem}")
+            failures.append(f"{entry['name']}: {problem}")
+    conn.rollback()
+    conn.close()
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="sqlite", choices=["sqlite", "postgres"])
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    parser.add_argument("--acceptances", type=int, default=2000, help="size of the generated dataset")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args(argv)
+
+    from bench.env import configure
+    configure(args.backend, args.database_url)
+
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+
+    from bench.datagen import generate, sizes_for
+    from bench.repo_bench import fixtures
+
+    generate(**sizes_for(args.acceptances), analyze=args.backend == "postgres")
+    failures = check(fixtures(), args.verbose)
+    if failures:
+        print(f"\n{len(failures)} plan regression(s).")
+        sys.exit(1)
+    print("\nAll hot queries use their indexes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Repo-level micro-benchmarks at increasing data sizes, with JSON baselines.
+
+    python -m bench.repo_bench                          # 1k, 10k, 100k acceptances on SQLite
+    python -m bench.repo_bench --sizes 10000 --save-baseline
+    python -m bench.repo_bench --backend postgres --database-url postgresql://localhost/kols_bench
+
+Each size is generated with bench.datagen, then every repo function runs
+--repeat times and its median is recorded. Write functions run inside a
+unit of work that is rolled back, so each repeat sees the same data.
+Results are compared against the baseline file (bench/baselines/repo-<backend>.json
+by default). The exit status is 1 when a function is slower than its baseline
+by more than --threshold (relative) and --min-delta-ms (absolute), and 2 when
+there is no baseline to compare with: save one on the machine that runs the
+check, timings from other hardware mean nothing.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+def _sample(cur, sql: str):
+    cur.execute(sql)
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def fixtures() -> dict:
+    """Representative ids from the generated data (busiest KOL, a live campaign, ...)."""
+    from db.connection import get_conn
+
+    conn = get_conn()
+    cur = conn.cursor()
+    fx = {
+        "busy_kol": _sample(cur, "SELECT kol_telegram_id FROM campaign_acceptances GROUP BY kol_telegram_id "
+                                 "ORDER BY COUNT(*) DESC LIMIT 1"),
+        "campaign": _sample(cur, "SELECT campaign_id FROM campaign_acceptances GROUP BY campaign_id "
+                                 "ORDER BY COUNT(*) DESC LIMIT 1"),
+        "live_campaign": _sample(cur, "SELECT id FROM campaigns WHERE status = 'live' ORDER BY id LIMIT 1"),
+        "submitted_campaign": _sample(cur, "SELECT campaign_id FROM campaign_acceptances WHERE status = 'submitted' "
+                                           "GROUP BY campaign_id ORDER BY COUNT(*) DESC LIMIT 1"),
+        "acceptance": _sample(cur, "SELECT id FROM campaign_acceptances WHERE status = 'accepted' ORDER BY id LIMIT 1"),
+        "unpaid_ids": [r[0] for r in _all(cur, "SELECT id FROM campaign_acceptances WHERE status = 'verified' "
+                                               "AND payout_status = 'unpaid' ORDER BY id LIMIT 200")],
+        "wallet": _sample(cur, "SELECT k.wallet_address FROM kols k JOIN campaign_acceptances ca "
+                               "ON ca.kol_telegram_id = k.telegram_id WHERE ca.status = 'verified' "
+                               "AND ca.payout_status = 'unpaid' AND k.wallet_address IS NOT NULL LIMIT 1"),
+        "mid_campaign_id": _sample(cur, "SELECT MAX(id) / 2 FROM campaigns"),
+        "mid_kol_id": _sample(cur, "SELECT MAX(id) / 2 FROM kols"),
+        "customer": _sample(cur, "SELECT customer_telegram_id FROM campaigns GROUP BY customer_telegram_id "
+                                 "ORDER BY COUNT(*) DESC LIMIT 1"),
+    }
+    conn.close()
+    return fx
+
+
+def _all(cur, sql: str):
+    cur.execute(sql)
+    return cur.fetchall()
+
+
+def cases(fx: dict) -> list[tuple]:
+    """(name, callable, is_write) for every repo function worth timing."""
+    from db import acceptance_repo, campaign_repo, customer_repo, kol_repo, payout_repo, tier_repo
+
+    now_ts = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+    return [
+        ("kol_repo.get_kol", lambda: kol_repo.get_kol(fx["busy_kol"]), False),
+        ("kol_repo.get_all_kols", kol_repo.get_all_kols, False),
+        ("kol_repo.get_roster_page", lambda: kol_repo.get_roster_page("followers", True, (1000, fx["mid_kol_id"])), False),
+        ("customer_repo.get_all_customers", customer_repo.get_all_customers, False),
+        ("tier_repo.get_all_tiers", tier_repo.get_all_tiers, False),
+        ("campaign_repo.get_campaign", lambda: campaign_repo.get_campaign(fx["campaign"]), False),
+        ("campaign_repo.get_live_campaigns", campaign_repo.get_live_campaigns, False),
+        ("campaign_repo.get_campaigns_by_status", lambda: campaign_repo.get_campaigns_by_status("completed"), False),
+        ("campaign_repo.get_campaigns_page", lambda: campaign_repo.get_campaigns_page("completed", fx["mid_campaign_id"]), False),
+        ("campaign_repo.get_upcoming_deadlines", campaign_repo.get_upcoming_deadlines, False),
+        ("campaign_repo.get_all_campaigns", campaign_repo.get_all_campaigns, False),
+        ("acceptance_repo.get_acceptance_by_id", lambda: acceptance_repo.get_acceptance_by_id(fx["acceptance"]), False),
+        ("acceptance_repo.get_acceptances_for_kol", lambda: acceptance_repo.get_acceptances_for_kol(fx["busy_kol"]), False),
+        ("acceptance_repo.get_acceptances_for_campaign", lambda: acceptance_repo.get_acceptances_for_campaign(fx["campaign"]), False),
+        ("acceptance_repo.get_pending_verifications", acceptance_repo.get_pending_verifications, False),
+        ("acceptance_repo.get_pending_verifications_page", acceptance_repo.get_pending_verifications_page, False),
+        ("acceptance_repo.get_unpaid_verified", acceptance_repo.get_unpaid_verified, False),
+        ("acceptance_repo.get_unpaid_verified_page", acceptance_repo.get_unpaid_verified_page, False),
+        ("acceptance_repo.get_recent_verified_with_tweets", acceptance_repo.get_recent_verified_with_tweets, False),
+        ("campaign_repo.reconcile_campaign_counters", campaign_repo.reconcile_campaign_counters, True),
+        ("campaign_repo.expire_due_campaigns", lambda: campaign_repo.expire_due_campaigns(now_ts), True),
+        ("acceptance_repo.update_acceptance_status",
+         lambda: acceptance_repo.update_acceptance_status(fx["acceptance"], "submitted"), True),
+        ("acceptance_repo.bulk_update_submission_status",
+         lambda: acceptance_repo.bulk_update_submission_status(fx["submitted_campaign"], "verified"), True),
+        ("acceptance_repo.mark_paid_bulk", lambda: acceptance_repo.mark_paid_bulk(fx["unpaid_ids"]), True),
+        ("acceptance_repo.mark_paid_for_wallet", lambda: acceptance_repo.mark_paid_for_wallet(fx["wallet"]), True),
+        ("payout_repo.create_payout_batch", payout_repo.create_payout_batch, True),
+    ]
+
+
+def _time(func, is_write: bool, repeat: int) -> float:
+    from db.connection import mark_rollback_only, unit_of_work
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        if is_write:
+            with unit_of_work():
+                func()
+                mark_rollback_only()
+        else:
+            func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run(sizes: list[int], repeat: int) -> dict:
+    """{size: {function: median ms}}"""
+    from bench.datagen import generate, sizes_for
+
+    results = {}
+    for size in sizes:
+        print(f"generating {size} acceptances...", file=sys.stderr)
+        generate(**sizes_for(size))
+        fx = fixtures()
+        results[str(size)] = {}
+        for name, func, is_write in cases(fx):
+            results[str(size)][name] = round(_time(func, is_write, repeat), 3)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list[str]:
+    """Regressions as human-readable lines (empty if none)."""
+    regressions = []
+    for size, funcs in results.items():
+        for name, ms in funcs.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                continue
+            if ms > base * (1 + threshold) and ms - base > min_delta_ms:
+                regressions.append(f"{name} @ {size}: {base:.2f}ms -> {ms:.2f}ms (+{(ms / base - 1) * 100:.0f}%)")
+    return regressions
+
+
+def format_table(results: dict, baseline: dict) -> str:
+    sizes = list(results)
+    names = list(next(iter(results.values())))
+    width = max(len(n) for n in names) + 2
+    lines = [f"{'function':<{width}}" + "".join(f"{s + ' acc':>16}" for s in sizes)]
+    for name in names:
+        row = f"{name:<{width}}"
+        for size in sizes:
+            ms = results[size][name]
+            base = baseline.get(size, {}).get(name)
+            delta = f" ({(ms / base - 1) * 100:+.0f}%)" if base else ""
+            row += f"{f'{ms:.2f}ms{delta}':>16}"
+        lines.append(row)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated acceptance counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backend", default="sqlite", choices=["sqlite", "postgres"])
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    parser.add_argument("--baseline", help="baseline JSON path (default bench/baselines/repo-<backend>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore slowdowns smaller than this")
+    args = parser.parse_args(argv)
+
+    from bench.env import configure
+    configure(args.backend, args.database_url)
+
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"repo-{args.backend}.json")
+    baseline = {}
+    if os.path.exists(baseline_path) and not args.save_baseline:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+
+    results = run([int(s) for s in args.sizes.split(",")], args.repeat)
+    print(format_table(results, baseline))
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {baseline_path}")
+        return
+
+    if not baseline:
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one.", file=sys.stderr)
+        sys.exit(2)
+    if not any(name in baseline.get(size, {}) for size, funcs in results.items() for name in funcs):
+        print(f"Baseline {baseline_path} has none of these sizes or functions; save a new one.", file=sys.stderr)
+        sys.exit(2)
+    regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("\nNo regressions beyond the threshold.")
+
+
+if __name__ == "__main__":
+    main()
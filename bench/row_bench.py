@@ -0,0 +1,151 @@
+"""Row materialization benchmark: dict(row) from SELECT * vs the db.rows classes.
+
+    python -m bench.row_bench                      # 50k rows per table on SQLite
+    python -m bench.row_bench --rows 200000 --repeat 3
+    python -m bench.row_bench --backend postgres --database-url postgresql://localhost/kols_bench
+
+Generates --rows KOLs, campaigns and acceptances with bench.datagen, then for
+each table reads every row the old way (dict cursor, ``SELECT *``,
+``dict(r)``) and the way the repos do now. Reports the median read time and
+the memory the resulting list keeps alive (tracemalloc, measured on a
+separate run so tracing does not skew the timing).
+"""
+import argparse
+import gc
+import os
+import statistics
+import time
+import tracemalloc
+
+
+def _legacy(table: str, order: str):
+    from db.connection import dict_cursor, get_conn
+
+    def read():
+        conn = get_conn()
+        cur = dict_cursor(conn)
+        cur.execute(f"SELECT * FROM {table} ORDER BY {order}")
+        rows = [dict(r) for r in cur.fetchall()]
+        conn.close()
+        return rows
+    return read
+
+
+def _kol_listings():
+    """The whole roster with only the columns its pages show."""
+    from db.connection import get_conn
+    from db.rows import KolListing, columns, fetch_all
+
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(f"SELECT {columns(KolListing)} FROM kols ORDER BY id DESC")
+    rows = fetch_all(cur, KolListing)
+    conn.close()
+    return rows
+
+
+def _acceptances_for_kols():
+    """Every acceptance with its campaign brief, as /mywork reads them per KOL."""
+    from db.connection import get_conn
+    from db.rows import Acceptance, AcceptanceForKol, columns, fetch_all
+
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        SELECT {columns(Acceptance, "ca")},
+               c.project_name, c.service_type, c.deadline, c.status as campaign_status,
+               c.target_url, c.talking_points, c.hashtags, c.mentions, c.media_file_id, c.media_kind
+        FROM campaign_acceptances ca
+        JOIN campaigns c ON c.id = ca.campaign_id
+        ORDER BY ca.id
+        """
+    )
+    rows = fetch_all(cur, AcceptanceForKol)
+    conn.close()
+    return rows
+
+
+def _acceptances_for_kols_legacy():
+    from db.connection import dict_cursor, get_conn
+
+    conn = get_conn()
+    cur = dict_cursor(conn)
+    cur.execute(
+        """
+        SELECT ca.*, c.project_name, c.service_type, c.deadline, c.status as campaign_status,
+               c.target_url, c.talking_points, c.hashtags, c.mentions, c.media_file_id, c.media_kind
+        FROM campaign_acceptances ca
+        JOIN campaigns c ON c.id = ca.campaign_id
+        ORDER BY ca.id
+        """
+    )
+    rows = [dict(r) for r in cur.fetchall()]
+    conn.close()
+    return rows
+
+
+def cases():
+    """(table, label, read) triples; the first of each table is the dict baseline."""
+    from db import campaign_repo, kol_repo
+
+    return [
+        ("kols", "dict(SELECT *)", _legacy("kols", "registered_at DESC")),
+        ("kols", "Kol", kol_repo.get_all_kols),
+        ("kols", "KolListing", _kol_listings),
+        ("campaigns", "dict(SELECT *)", _legacy("campaigns", "created_at DESC")),
+        ("campaigns", "CampaignSummary", campaign_repo.get_all_campaigns),
+        ("campaign_acceptances", "dict(ca.* + brief)", _acceptances_for_kols_legacy),
+        ("campaign_acceptances", "AcceptanceForKol", _acceptances_for_kols),
+    ]
+
+
+def measure(read, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        rows = read()
+        timings.append((time.perf_counter() - started) * 1000)
+        del rows
+
+    gc.collect()
+    tracemalloc.start()
+    rows = read()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"rows": len(rows), "ms": statistics.median(timings), "bytes": retained}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000, help="KOLs, campaigns and acceptances to generate")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backend", default="sqlite", choices=["sqlite", "postgres"])
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    args = parser.parse_args(argv)
+
+    from bench.env import configure
+    configure(args.backend, args.database_url)
+
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+
+    from bench.datagen import generate
+    generate(kols=args.rows, campaigns=args.rows, acceptances=args.rows)
+
+    print(f"{'table':<22}{'rows as':<22}{'rows':>8}{'median ms':>12}{'retained MiB':>15}{'vs dict':>18}")
+    base = {}
+    for table, label, read in cases():
+        m = measure(read, args.repeat)
+        if table not in base:
+            base[table] = m
+            versus = ""
+        else:
+            b = base[table]
+            versus = f"{m['ms'] / b['ms'] - 1:+.0%} t, {m['bytes'] / b['bytes'] - 1:+.0%} mem"
+        print(f"{table:<22}{label:<22}{m['rows']:>8}{m['ms']:>12.1f}{m['bytes'] / 2**20:>15.1f}{versus:>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Offline load test for the bot: real handlers, fake Telegram and X.
+
+    python -m bench.run                                  # all scenarios on a temp SQLite file
+    python -m bench.run -s accept_race -s kols_paging --scale 0.2
+    python -m bench.run --backend postgres --database-url postgresql://localhost/kols_bench
+    python -m bench.run --backend sqlite,postgres --database-url ... --json results.json
+
+The Postgres database is TRUNCATED before every scenario; point it at a
+throwaway database. Latencies are measured from update arrival, so queueing
+behind other updates in a burst is included. For integrity_sweep they are
+per X API call.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import warnings
+
+from bench.env import configure
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-s", "--scenario", action="append", help="scenario to run (repeatable; default all)")
+    parser.add_argument("--backend", default="sqlite", help="sqlite, postgres, or a comma-separated list")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), help="Postgres URL for --backend postgres")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply scenario sizes (e.g. 0.1 for a smoke run)")
+    parser.add_argument("--tg-latency-ms", type=float, default=20.0, help="fake Bot API latency per call")
+    parser.add_argument("--tg-rate", type=float, default=None, help="fake Bot API global rate limit (message sends and edits/s)")
+    parser.add_argument("--x-latency-ms", type=float, default=20.0, help="fake X API latency per call")
+    parser.add_argument("--x-rate", type=float, default=None, help="fake X API rate limit (calls/s)")
+    parser.add_argument("--json", dest="json_path", help="also write results as JSON to this path")
+    return parser.parse_args(argv)
+
+
+async def _run(args, backend: str) -> list[dict]:
+    import bot  # noqa: F401  (configures logging; quieten it below)
+    from bench.harness import run_scenario
+    from bench.scenarios import SCENARIOS
+
+    logging.getLogger().setLevel(logging.WARNING)
+    warnings.filterwarnings("ignore", message=".*per_message=False.*")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    opts = {
+        "tg_latency": args.tg_latency_ms / 1000,
+        "tg_rate": args.tg_rate,
+        "x_latency": args.x_latency_ms / 1000,
+        "x_rate": args.x_rate,
+    }
+    results = []
+    for name in args.scenario or list(SCENARIOS):
+        if name not in SCENARIOS:
+            sys.exit(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        print(f"[{backend}] running {name}...", file=sys.stderr)
+        result = await run_scenario(name, SCENARIOS[name], args.scale, opts)
+        result["backend"] = backend
+        results.append(result)
+    return results
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    backends = [b.strip() for b in args.backend.split(",") if b.strip()]
+
+    if len(backends) == 1:
+        configure(backends[0], args.database_url)
+        results = asyncio.run(_run(args, backends[0]))
+    else:
+        # config is read once at import, so each backend runs in its own process
+        results = []
+        passthrough = [a for a in (argv if argv is not None else sys.argv[1:])]
+        for backend in backends:
+            with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+                out = tmp.name
+            cmd = [sys.executable, "-m", "bench.run", *_strip_options(passthrough, ("--backend", "--json")),
+                   "--backend", backend, "--json", out]
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+            with open(out) as f:
+                results.extend(json.load(f))
+            os.remove(out)
+
+    from bench.harness import format_report
+    print(format_report(results))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+def _strip_options(argv: list[str], names: tuple) -> list[str]:
+    """Drop ``--name value`` / ``--name=value`` pairs from an argument list."""
+    out = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+            continue
+        if arg in names:
+            skip = True
+            continue
+        if any(arg.startswith(n + "=") for n in names):
+            continue
+        out.append(arg)
+    return out
+
+
+if __name__ == "__main__":
+    main()
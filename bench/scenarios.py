@@ -0,0 +1,213 @@
+"""Load-test scenarios. Each seeds a fresh database, drives the bot, and returns checks."""
+import asyncio
+import time
+
+from bench import seed, updates
+from db.campaign_repo import get_campaign
+from db.connection import get_conn, ph
+
+
+def _count(sql: str, params: tuple = ()) -> int:
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    n = cur.fetchone()[0]
+    conn.close()
+    return n
+
+
+async def accept_race(h, scale: float) -> dict:
+    """500 KOLs press Accept on one campaign with 50 spots at the same instant."""
+    n_kols = max(2, int(500 * scale))
+    spots = max(1, n_kols // 10)
+    seed.reset()
+    seed.add_customer()
+    kols = seed.add_kols(n_kols)
+    campaign_id = seed.add_campaign(kol_count=spots)
+
+    presses = [updates.callback(h.bot, kid, f"accept_campaign:{campaign_id}") for kid in kols]
+    await asyncio.gather(*(h.send(u) for u in presses))
+
+    accepted = _count(f"SELECT COUNT(*) FROM campaign_acceptances WHERE campaign_id = {ph()}", (campaign_id,))
+    campaign = get_campaign(campaign_id)
+    return {
+        "spots": spots,
+        "acceptances": accepted,
+        "accepted_count": campaign["accepted_count"],
+        "overbooked": accepted > spots or campaign["accepted_count"] != accepted,
+    }
+
+
+async def kols_paging(h, scale: float) -> dict:
+    """An admin opens /kols over 10k KOLs and pages forward by pressing Next."""
+    n_kols = max(10, int(10000 * scale))
+    pages = max(5, int(200 * scale))
+    seed.reset()
+    seed.add_kols(n_kols)
+
+    await h.send(updates.command(h.bot, seed.ADMIN_ID, "/kols"))
+    visited = 1
+    for _ in range(pages):
+        data = h.tg.find_button(seed.ADMIN_ID, label_prefix="Next")
+        if not data:
+            break
+        await h.send(updates.callback(h.bot, seed.ADMIN_ID, data))
+        visited += 1
+    return {"kols": n_kols, "pages_viewed": visited}
+
+
+async def submission_burst(h, scale: float) -> dict:
+    """200 KOLs run /submit -> pick campaign -> paste tweet URL at the same time."""
+    n_kols = max(2, int(200 * scale))
+    seed.reset()
+    seed.add_customer()
+    kols = seed.add_kols(n_kols)
+    campaign_id = seed.add_campaign(service_type="original_post", kol_count=n_kols)
+    seed.add_acceptances([(campaign_id, kid, None) for kid in kols])
+    for kid in kols:
+        h.x.tweets[str(kid)] = f"x_{kid}"
+
+    url_latencies = []
+
+    async def flow(kid: int):
+        await h.send(updates.command(h.bot, kid, "/submit"))
+        data = h.tg.find_button(kid, data_prefix="sub_pick:")
+        if not data:
+            return
+        await h.send(updates.callback(h.bot, kid, data))
+        url_latencies.append(await h.send(updates.text(h.bot, kid, f"https://x.com/kol{kid}/status/{kid}")))
+
+    await asyncio.gather(*(flow(kid) for kid in kols))
+    verified = _count(
+        f"SELECT COUNT(*) FROM campaign_acceptances WHERE campaign_id = {ph()} AND status = 'verified'",
+        (campaign_id,),
+    )
+    return {"kols": n_kols, "submitted": len(url_latencies), "verified": verified, "latencies": url_latencies}
+
+
+async def integrity_sweep(h, scale: float) -> dict:
+    """The daily integrity check over 5k verified tweets, 1% of them deleted."""
+    from services import integrity_service
+
+    n_tweets = max(5, int(5000 * scale))
+    per_kol = 5
+    seed.reset()
+    seed.add_customer()
+    kols = seed.add_kols(max(1, n_tweets // per_kol))
+    campaigns = [seed.add_campaign(kol_count=len(kols)) for _ in range(per_kol)]
+    rows = []
+    for i in range(n_tweets):
+        kid = kols[i % len(kols)]
+        tweet_id = str(10**12 + i)
+        h.x.tweets[tweet_id] = f"x_{kid}"
+        if i % 100 == 99:
+            h.x.deleted.add(tweet_id)
+        rows.append((campaigns[i // len(kols)], kid, f"https://x.com/kol{kid}/status/{tweet_id}"))
+    seed.add_acceptances(rows, status="verified")
+
+    integrity_service.CHECK_INTERVAL_SECONDS = 0  # the fake client enforces its own rate limit
+    started = time.perf_counter()
+    result = await integrity_service.run_integrity_check()
+    elapsed = time.perf_counter() - started
+    return {
+        "tweets": result["total"],
+        "deleted": result["deleted"],
+        "api_errors": result["errors"],
+        "bans": len(result["bans"]),
+        "sweep_s": round(elapsed, 2),
+        "latencies": list(h.x.timings),
+    }
+
+
+async def inline_storm(h, scale: float) -> dict:
+    """1000 users type "@bot retweet >$20" while KOLs take every spot of a new campaign."""
+    from services import live_campaigns
+
+    n_users = max(10, int(1000 * scale))
+    seed.reset()
+    seed.add_customer()
+    kols = seed.add_kols(max(2, int(100 * scale)))
+    campaign_id = seed.add_campaign(service_type="retweet", kol_count=len(kols), per_kol_rate=2500)
+    live_campaigns._loaded_at = float("-inf")  # forget the previous scenario's campaigns
+    reloads = live_campaigns.get_stats()["reloads"]
+
+    typed = ["r", "re", "ret", "retw", "retweet", "retweet >$20"]
+    queries = [updates.inline_query(h.bot, 10**9 + i, q) for i in range(n_users) for q in typed]
+    presses = [updates.callback(h.bot, kid, f"accept_campaign:{campaign_id}") for kid in kols]
+    # Interleave the accepts with the typing so the index is invalidated throughout
+    step = max(1, len(queries) // len(presses))
+    stream = []
+    for i, press in enumerate(presses):
+        stream.extend(queries[i * step:(i + 1) * step])
+        stream.append(press)
+    stream.extend(queries[len(presses) * step:])
+    await asyncio.gather(*(h.send(u) for u in stream))
+
+    return {
+        "queries": len(queries),
+        "answered": h.tg.calls["answerInlineQuery"],
+        "accepted": get_campaign(campaign_id)["accepted_count"],
+        "index_reloads": live_campaigns.get_stats()["reloads"] - reloads,
+    }
+
+
+async def alert_fanout(h, scale: float) -> dict:
+    """A campaign goes live for 2000 opted-in KOLs under Telegram's 30 msg/s limit; the
+    bot restarts mid-broadcast and KOLs accept from their DMs until the campaign fills."""
+    from bench.fake_telegram import TokenBucket
+    from db.alert_repo import get_broadcast
+    from services import campaign_alerts, leader
+    from services.campaign_service import activate_campaign
+
+    n_kols = max(20, int(2000 * scale))
+    spots = max(2, n_kols // 10)
+    seed.reset()
+    seed.add_customer()
+    kols = seed.add_kols(n_kols)
+    seed.add_alert_prefs(kols, "retweet")
+    campaign_id = seed.add_campaign(service_type="retweet", kol_count=spots, status="pending_payment")
+    activate_campaign(campaign_id)
+    h.tg.bucket = TokenBucket(30)
+    leader._is_leader = True
+
+    await h.app.start()
+    try:
+        await campaign_alerts.resume(h.app)
+        while h.tg.calls["sendMessage"] < spots // 2:
+            await asyncio.sleep(0.01)
+        await campaign_alerts.stop()  # restart: the next sender resumes from the saved position
+        resumed_after = get_broadcast(campaign_id).sent_count
+        await campaign_alerts.resume(h.app)
+
+        pressed = set()
+        while campaign_alerts._tasks:
+            for kid in kols:
+                if kid not in pressed and h.tg.find_button(kid, data_prefix=f"accept_campaign:{campaign_id}"):
+                    pressed.add(kid)
+                    await h.send(updates.callback(h.bot, kid, f"accept_campaign:{campaign_id}"))
+            await asyncio.sleep(0.05)
+    finally:
+        await h.app.stop()
+        leader._is_leader = False
+
+    broadcast = get_broadcast(campaign_id)
+    alerts = [n for (chat_id, line), n in h.tg.messages.items() if line.startswith(f"New campaign #{campaign_id}:")]
+    return {
+        "subscribed": n_kols,
+        "spots": spots,
+        "resumed_after": resumed_after,
+        "alerted": len(alerts),
+        "duplicates": sum(n - 1 for n in alerts),
+        "broadcast": broadcast.status,
+        "accepted": get_campaign(campaign_id)["accepted_count"],
+    }
+
+
+SCENARIOS = {
+    "accept_race": accept_race,
+    "kols_paging": kols_paging,
+    "submission_burst": submission_burst,
+    "integrity_sweep": integrity_sweep,
+    "inline_storm": inline_storm,
+    "alert_fanout": alert_fanout,
+}
@@ -0,0 +1,122 @@
+"""Bulk fixtures for the load-test scenarios (one executemany per table)."""
+import datetime
+
+from bench import ADMIN_ID, CUSTOMER_ID, KOL_ID_BASE  # noqa: F401  (re-exported for scenarios)
+from db.campaign_repo import rebuild_search_index
+from db.connection import get_conn, is_postgres, ph
+from db.migrations import run_migrations
+
+_TABLES = [
+    "kol_alert_prefs", "campaign_broadcasts", "campaign_acceptances", "payout_batches", "campaigns", "customers",
+    "kols", "export_state", "leader_lease",
+]
+
+
+def reset():
+    """Create the schema and empty every data table (service tiers are kept)."""
+    run_migrations()
+    conn = get_conn()
+    cur = conn.cursor()
+    if is_postgres():
+        cur.execute(f"TRUNCATE {', '.join(_TABLES)} RESTART IDENTITY CASCADE")
+    else:
+        for table in _TABLES:
+            cur.execute(f"DELETE FROM {table}")
+    conn.commit()
+    conn.close()
+    rebuild_search_index()
+
+
+def kol_ids(n: int) -> list[int]:
+    return list(range(KOL_ID_BASE, KOL_ID_BASE + n))
+
+
+def add_kols(n: int, verified: bool = True) -> list[int]:
+    ids = kol_ids(n)
+    p = ph()
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.executemany(
+        f"INSERT INTO kols (telegram_id, telegram_handle, name, x_account, wallet_address, "
+        f"x_user_id, follower_count, is_verified, is_active) "
+        f"VALUES ({p},{p},{p},{p},{p},{p},{p},{p},{p})",
+        [
+            (tid, f"@kol{tid}", f"KOL {tid}", f"kol{tid}", f"0x{tid:040x}",
+             f"x_{tid}", (tid * 7919) % 250000, verified, True)
+            for tid in ids
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return ids
+
+
+def add_customer(telegram_id: int = CUSTOMER_ID):
+    p = ph()
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"INSERT INTO customers (telegram_id, telegram_handle, name, project_x_account) VALUES ({p},{p},{p},{p})",
+        (telegram_id, "@bench_customer", "Bench Customer", "benchproject"),
+    )
+    conn.commit()
+    conn.close()
+
+
+def add_campaign(service_type: str = "original_post", kol_count: int = 50, status: str = "live",
+                 per_kol_rate: int = 5000, target_url: str | None = None) -> int:
+    p = ph()
+    deadline = (datetime.datetime.utcnow() + datetime.timedelta(days=7)).strftime("%Y-%m-%d %H:%M:%S")
+    conn = get_conn()
+    cur = conn.cursor()
+    sql = (
+        f"INSERT INTO campaigns (customer_telegram_id, project_name, service_type, target_url, "
+        f"kol_count, per_kol_rate, platform_fee, total_cost, deadline, status) "
+        f"VALUES ({p},{p},{p},{p},{p},{p},{p},{p},{p},{p})"
+    )
+    fee = per_kol_rate * kol_count * 15 // 100
+    params = (CUSTOMER_ID, f"Bench {service_type}", service_type, target_url,
+              kol_count, per_kol_rate, fee, per_kol_rate * kol_count + fee, deadline, status)
+    if is_postgres():
+        cur.execute(sql + " RETURNING id", params)
+        campaign_id = cur.fetchone()[0]
+    else:
+        cur.execute(sql, params)
+        campaign_id = cur.lastrowid
+    conn.commit()
+    conn.close()
+    rebuild_search_index()
+    return campaign_id
+
+
+def add_acceptances(rows: list[tuple], status: str = "accepted"):
+    """rows: (campaign_id, kol_telegram_id, submission_tweet_url or None)."""
+    p = ph()
+    verified_at = "CURRENT_TIMESTAMP" if status == "verified" else "NULL"
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.executemany(
+        f"INSERT INTO campaign_acceptances (campaign_id, kol_telegram_id, status, submission_tweet_url, verified_at) "
+        f"VALUES ({p},{p},{p},{p},{verified_at})",
+        [(cid, kid, status, url) for cid, kid, url in rows],
+    )
+    counter = {"accepted": None, "verified": "verified_count"}.get(status)
+    for cid in {r[0] for r in rows}:
+        n = sum(1 for r in rows if r[0] == cid)
+        extra = f", {counter} = {counter} + {n}" if counter else ""
+        cur.execute(f"UPDATE campaigns SET accepted_count = accepted_count + {n}{extra} WHERE id = {p}", (cid,))
+    conn.commit()
+    conn.close()
+
+
+def add_alert_prefs(kol_ids: list[int], service_type: str):
+    """Subscribe every KOL in *kol_ids* to new-campaign alerts for *service_type*."""
+    p = ph()
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.executemany(
+        f"INSERT INTO kol_alert_prefs (service_type, kol_telegram_id) VALUES ({p},{p})",
+        [(service_type, kid) for kid in kol_ids],
+    )
+    conn.commit()
+    conn.close()
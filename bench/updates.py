@@ -0,0 +1,62 @@
+"""Synthetic Telegram updates fed straight into Application.process_update."""
+import itertools
+import time
+
+from telegram import Update
+
+_update_ids = itertools.count(1)
+
+
+def _user(user_id: int) -> dict:
+    return {"id": user_id, "is_bot": False, "first_name": f"User{user_id}", "username": f"user{user_id}"}
+
+
+def _message(user_id: int, text: str) -> dict:
+    return {
+        "message_id": next(_update_ids),
+        "date": int(time.time()),
+        "chat": {"id": user_id, "type": "private"},
+        "from": _user(user_id),
+        "text": text,
+    }
+
+
+def command(bot, user_id: int, text: str) -> Update:
+    """A private-chat message starting with a /command."""
+    message = _message(user_id, text)
+    message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+    return Update.de_json({"update_id": next(_update_ids), "message": message}, bot)
+
+
+def text(bot, user_id: int, body: str) -> Update:
+    """A plain private-chat text message."""
+    return Update.de_json({"update_id": next(_update_ids), "message": _message(user_id, body)}, bot)
+
+
+def callback(bot, user_id: int, data: str) -> Update:
+    """A button press on a bot message in the user's private chat."""
+    message = _message(user_id, "")
+    message["from"] = {"id": bot.id, "is_bot": True, "first_name": "Bench"}
+    return Update.de_json({
+        "update_id": next(_update_ids),
+        "callback_query": {
+            "id": str(next(_update_ids)),
+            "from": _user(user_id),
+            "chat_instance": "bench",
+            "data": data,
+            "message": message,
+        },
+    }, bot)
+
+
+def inline_query(bot, user_id: int, query: str, offset: str = "") -> Update:
+    """An inline query ("@bot <query>") typed in some chat."""
+    return Update.de_json({
+        "update_id": next(_update_ids),
+        "inline_query": {
+            "id": str(next(_update_ids)),
+            "from": _user(user_id),
+            "query": query,
+            "offset": offset,
+        },
+    }, bot)
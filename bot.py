@@ -1,15 +1,28 @@
 """BrosKOLs Telegram Bot — bootstrap and handler registration."""
+import asyncio
 import logging
 
+from services import startup  # first: its import starts the startup clock
+
 from telegram import Update, BotCommand
-from telegram.ext import ApplicationBuilder, CommandHandler, ContextTypes
+from telegram.ext import Application, ApplicationBuilder, CommandHandler, ContextTypes
 
 from config import TELEGRAM_BOT_TOKEN, ADMIN_TELEGRAM_IDS, ANNOUNCEMENT_CHANNEL_ID
+from db.instrumentation import handler_scope
 from db.migrations import run_migrations
-from handlers import registration, campaign_create, campaign_browse, campaign_submit, campaign_dashboard, admin, pricing, kol_list
+from handlers import (
+    registration, campaign_create, campaign_browse, campaign_search, campaign_submit, campaign_dashboard, admin,
+    pricing, kol_list, inline_campaigns, alerts,
+)
 from handlers.common import is_admin, notify_admins
-from services.campaign_service import expire_campaigns
+from db.campaign_repo import get_live_campaigns, reconcile_campaign_counters
+from db.tier_repo import get_all_tiers
+from services import (
+    assets, campaign_alerts, deadline_scheduler, kol_search, leader, live_campaigns, loop_watchdog, metrics,
+    sessions, x_api,
+)
 from services.integrity_service import run_integrity_check
+from services.rate_limit import BotRateLimiter
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -18,6 +31,28 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class BotApplication(Application):
+    """Application that attributes each update's DB queries to its command or callback.
+
+    Updates do not share a transaction: writes commit in the repo call or the
+    @transactional service that made them, before the handler goes on to talk
+    to Telegram, so no lock is held across network I/O.
+    """
+
+    async def process_update(self, update: object) -> None:
+        with handler_scope(metrics.update_label(update)):
+            try:
+                await super().process_update(update)
+            finally:
+                # Updates stopped before the finishing middleware still get recorded
+                metrics.record_current()
+
+
+async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE):
+    """Log handler errors."""
+    logger.error("Error while handling update %s", update, exc_info=context.error)
+
+
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Role-based help."""
     user = update.effective_user
@@ -26,7 +61,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "/start — Register as KOL or Customer",
         "/help — Show this message",
         "/myid — Show your Telegram ID",
-        "/kols — Browse KOL roster",
+        "/kols — Browse KOL roster (/kols <name> to search)",
         "/cancel — Cancel current operation",
     ]
 
@@ -41,16 +76,27 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if get_kol(user.id):
         lines.append("\nKOL commands:")
         lines.append("/campaigns — Browse available campaigns")
+        lines.append("/findcampaign <words> — Search live campaigns")
+        lines.append(f"@{context.bot.username} retweet >$20 — Find open campaigns from any chat")
         lines.append("/mywork — View your accepted work")
         lines.append("/submit — Submit proof of work")
+        lines.append("/alerts — Get a DM when a new campaign goes live")
 
     if is_admin(user):
         lines.append("\nAdmin commands:")
         lines.append("/admin — Admin panel")
         lines.append("/pricing — Manage service pricing")
+        lines.append("/findcampaign <words> — Search all campaigns")
         lines.append("/bulkverify — Verify all KOLs via X API")
         lines.append("/integrity — Check for deleted proof-of-work tweets")
-        lines.append("/export — Export data as CSV")
+        lines.append("/export — Export data as CSV (/export delta for new rows only)")
+        lines.append("/markpaid — Bulk mark payouts paid from a CSV")
+        lines.append("/batchpaid — Mark a payout batch paid")
+        lines.append("/jobs — Scheduled job status")
+        lines.append("/dbstats — Query latency statistics")
+        lines.append("/blocking — Where the event loop was blocked")
+        lines.append("/profile <seconds> — Sampling profile of the live bot")
+        lines.append("/sessions — In-memory session usage")
 
     await update.message.reply_text("\n".join(lines))
 
@@ -65,35 +111,78 @@ async def myid_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 
+# Menu button commands
+BOT_COMMANDS = [
+    BotCommand("start", "Register as KOL or Customer"),
+    BotCommand("help", "Show available commands"),
+    BotCommand("myid", "Show your Telegram ID"),
+    BotCommand("newcampaign", "Create a campaign (Customer)"),
+    BotCommand("mycampaigns", "View your campaigns (Customer)"),
+    BotCommand("campaigns", "Browse campaigns (KOL)"),
+    BotCommand("findcampaign", "Search campaigns"),
+    BotCommand("mywork", "View accepted work (KOL)"),
+    BotCommand("submit", "Submit proof of work (KOL)"),
+    BotCommand("alerts", "New campaign alerts (KOL)"),
+    BotCommand("admin", "Admin panel"),
+    BotCommand("kols", "Browse KOL roster"),
+    BotCommand("pricing", "Manage pricing (Admin)"),
+    BotCommand("bulkverify", "Verify all KOLs via X (Admin)"),
+    BotCommand("integrity", "Check for deleted tweets (Admin)"),
+    BotCommand("export", "Export data (Admin)"),
+    BotCommand("markpaid", "Bulk mark payouts paid (Admin)"),
+    BotCommand("batchpaid", "Mark a payout batch paid (Admin)"),
+    BotCommand("jobs", "Scheduled job status (Admin)"),
+    BotCommand("dbstats", "Query latency statistics (Admin)"),
+    BotCommand("blocking", "Event loop blocking report (Admin)"),
+    BotCommand("profile", "Sampling profile of the bot (Admin)"),
+    BotCommand("sessions", "In-memory session usage (Admin)"),
+    BotCommand("cancel", "Cancel current operation"),
+]
+
+
 async def post_init(application):
-    """Set bot commands for the menu button."""
-    commands = [
-        BotCommand("start", "Register as KOL or Customer"),
-        BotCommand("help", "Show available commands"),
-        BotCommand("myid", "Show your Telegram ID"),
-        BotCommand("newcampaign", "Create a campaign (Customer)"),
-        BotCommand("mycampaigns", "View your campaigns (Customer)"),
-        BotCommand("campaigns", "Browse campaigns (KOL)"),
-        BotCommand("mywork", "View accepted work (KOL)"),
-        BotCommand("submit", "Submit proof of work (KOL)"),
-        BotCommand("admin", "Admin panel"),
-        BotCommand("kols", "Browse KOL roster"),
-        BotCommand("pricing", "Manage pricing (Admin)"),
-        BotCommand("bulkverify", "Verify all KOLs via X (Admin)"),
-        BotCommand("integrity", "Check for deleted tweets (Admin)"),
-        BotCommand("export", "Export data (Admin)"),
-        BotCommand("cancel", "Cancel current operation"),
-    ]
-    await application.bot.set_my_commands(commands)
+    """Finish startup before polling begins.
+
+    Migrations started in main() run in a thread while the Application was
+    being built. Menu commands are set while we wait for them. Once the
+    schema is ready, caches are warmed, the KOL search and live campaign
+    indexes are built, Telegram asset file_ids are loaded and the deadline
+    heap is loaded.
+    """
+    loop_watchdog.start()
+    await asyncio.gather(
+        startup.wait("migrations"),
+        startup.timed("set_my_commands", application.bot.set_my_commands(BOT_COMMANDS)),
+    )
+    await asyncio.gather(
+        startup.timed("warm_caches", asyncio.to_thread(_warm_caches)),
+        startup.timed("kol_search_index", asyncio.to_thread(kol_search.build)),
+        startup.timed("live_campaign_index", live_campaigns.get_campaigns()),
+        startup.timed("telegram_assets", assets.warm(application.bot)),
+    )
+    with startup.phase("deadline_scheduler"):
+        if application.job_queue:
+            deadline_scheduler.rebuild(application.job_queue)
+    if x_api.is_configured():
+        # Probe X read access now instead of on the first submission
+        application.create_task(x_api.is_read_available())
+    startup.report()
+
+
+def _warm_caches():
+    """Open the DB and touch the data the first updates will need."""
+    get_all_tiers()
+    get_live_campaigns()
 
 
-def expire_campaigns_job(context: ContextTypes.DEFAULT_TYPE):
-    """Hourly job to expire campaigns past their deadline."""
-    count = expire_campaigns()
-    if count:
-        logger.info("Expired %d campaign(s)", count)
+async def post_shutdown(application):
+    """Save alert broadcast progress and hand scheduler leadership to a standby replica right away."""
+    loop_watchdog.stop()
+    await campaign_alerts.stop()
+    leader.release()
 
 
+@leader.leader_only("integrity_check")
 async def integrity_check_job(context: ContextTypes.DEFAULT_TYPE):
     """Daily job to check verified tweets for deletions."""
     logger.info("Running daily tweet integrity check...")
@@ -117,28 +206,36 @@ async def integrity_check_job(context: ContextTypes.DEFAULT_TYPE):
         await notify_admins(context.bot, text)
 
 
-def main():
-    if not TELEGRAM_BOT_TOKEN:
-        raise RuntimeError(
-            "TELEGRAM_BOT_TOKEN not set. "
-            "Create a .env file with your bot token (see .env.example)."
-        )
+@leader.leader_only("reconcile_counters")
+def reconcile_counters_job(context: ContextTypes.DEFAULT_TYPE):
+    """Daily job to correct any drift in per-campaign acceptance counters."""
+    fixed = reconcile_campaign_counters()
+    if fixed:
+        logger.warning("Reconciled acceptance counters on %d campaign(s)", fixed)
 
-    # Startup warnings for missing config
-    if not ADMIN_TELEGRAM_IDS:
-        logger.warning(
-            "ADMIN_TELEGRAM_IDS not set! Admin DMs will fall back to @username. "
-            "Use /myid in the bot to get your numeric ID, then add it to .env."
-        )
-    if not ANNOUNCEMENT_CHANNEL_ID:
-        logger.warning(
-            "ANNOUNCEMENT_CHANNEL_ID not set! Campaign announcements will be skipped. "
-            "Add the channel's numeric ID to .env (e.g. -1001234567890)."
-        )
 
-    run_migrations()
+def build_application(token: str = TELEGRAM_BOT_TOKEN, request=None) -> Application:
+    """Build the Application with every handler registered (no jobs, no polling).
+
+    *request* overrides the Bot API transport; the load-test harness in bench/
+    passes a fake one.
+    """
+    app = (
+        ApplicationBuilder()
+        .application_class(BotApplication)
+        .token(token)
+        .request(request or metrics.CountingHTTPXRequest(connection_pool_size=256))
+        .rate_limiter(BotRateLimiter())
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
 
-    app = ApplicationBuilder().token(TELEGRAM_BOT_TOKEN).post_init(post_init).build()
+    # --- Per-update timing middleware (runs around every other handler group) ---
+    for handler, group in metrics.get_handlers():
+        app.add_handler(handler, group=group)
+    for handler, group in sessions.get_handlers():
+        app.add_handler(handler, group=group)
 
     # --- Conversation handlers (order matters: first match wins) ---
     app.add_handler(registration.get_conversation_handler())
@@ -149,8 +246,14 @@ def main():
     # --- Standalone command handlers ---
     for handler in campaign_browse.get_handlers():
         app.add_handler(handler)
+    for handler in campaign_search.get_handlers():
+        app.add_handler(handler)
+    for handler in inline_campaigns.get_handlers():
+        app.add_handler(handler)
     for handler in campaign_dashboard.get_handlers():
         app.add_handler(handler)
+    for handler in alerts.get_handlers():
+        app.add_handler(handler)
     for handler in admin.get_handlers():
         app.add_handler(handler)
     for handler in kol_list.get_handlers():
@@ -158,14 +261,70 @@ def main():
 
     app.add_handler(CommandHandler("help", help_command))
     app.add_handler(CommandHandler("myid", myid_command))
+    app.add_error_handler(error_handler)
+    metrics.register_commands(app)
+    return app
+
 
-    # --- Scheduled jobs ---
+def schedule_jobs(app: Application):
+    """Register the recurring jobs on the application's job queue."""
     job_queue = app.job_queue
-    if job_queue:
-        job_queue.run_repeating(expire_campaigns_job, interval=3600, first=60)
-        logger.info("Scheduled hourly campaign expiration check")
-        job_queue.run_repeating(integrity_check_job, interval=86400, first=300)
-        logger.info("Scheduled daily tweet integrity check")
+    if not job_queue:
+        return
+    leader.start(job_queue)
+    # The deadline heap itself is loaded in post_init, once migrations are done
+    job_queue.run_repeating(
+        deadline_scheduler.resync_job,
+        interval=deadline_scheduler.RESYNC_INTERVAL,
+        first=deadline_scheduler.RESYNC_INTERVAL,
+    )
+    logger.info("Scheduled per-campaign deadline expiry")
+    job_queue.run_repeating(integrity_check_job, interval=86400, first=300, name="integrity_check")
+    logger.info("Scheduled daily tweet integrity check")
+    job_queue.run_repeating(reconcile_counters_job, interval=86400, first=600, name="reconcile_counters")
+    # Session memory is per process, so every replica evicts its own
+    job_queue.run_repeating(
+        sessions.evict_job, interval=sessions.EVICT_INTERVAL, first=sessions.EVICT_INTERVAL,
+        name="session_evict",
+    )
+    # Picks up KOL writes made by other replicas; local writes update the index directly
+    job_queue.run_repeating(
+        kol_search.rebuild_job, interval=kol_search.REBUILD_INTERVAL, first=kol_search.REBUILD_INTERVAL,
+        name="kol_search_rebuild",
+    )
+    # New-campaign alerts start on activation; this resumes interrupted ones
+    job_queue.run_repeating(
+        campaign_alerts.resume_job, interval=campaign_alerts.RESUME_INTERVAL, first=campaign_alerts.RESUME_INTERVAL,
+        name="campaign_alerts",
+    )
+
+
+def main():
+    if not TELEGRAM_BOT_TOKEN:
+        raise RuntimeError(
+            "TELEGRAM_BOT_TOKEN not set. "
+            "Create a .env file with your bot token (see .env.example)."
+        )
+
+    # Startup warnings for missing config
+    if not ADMIN_TELEGRAM_IDS:
+        logger.warning(
+            "ADMIN_TELEGRAM_IDS not set! Admin DMs will fall back to @username. "
+            "Use /myid in the bot to get your numeric ID, then add it to .env."
+        )
+    if not ANNOUNCEMENT_CHANNEL_ID:
+        logger.warning(
+            "ANNOUNCEMENT_CHANNEL_ID not set! Campaign announcements will be skipped. "
+            "Add the channel's numeric ID to .env (e.g. -1001234567890)."
+        )
+
+    startup.mark("imports")
+    startup.run_in_background("migrations", run_migrations)
+
+    with startup.phase("build_application"):
+        app = build_application()
+        schedule_jobs(app)
+    metrics.start_server()
 
     logger.info("Bot started. Press Ctrl+C to stop.")
     app.run_polling()
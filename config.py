@@ -15,9 +15,33 @@ ADMIN_TELEGRAM_IDS = [
     if x.strip().isdigit()
 ]
 ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "Game4Charity")
+# Chat the bot may upload static images to at startup (e.g. a private channel), so the
+# first /start already reuses a Telegram file_id; unset, the first send uploads them
+_asset_chat_raw = os.getenv("ASSET_UPLOAD_CHAT_ID", "")
+ASSET_UPLOAD_CHAT_ID = int(_asset_chat_raw) if _asset_chat_raw.lstrip("-").isdigit() else _asset_chat_raw
+# New-campaign DMs per second across all broadcasts (services.rate_limit); Telegram
+# allows a bot ~30 messages/second in total, so this leaves room for replies to users
+ALERT_SEND_RATE = float(os.getenv("ALERT_SEND_RATE", "20"))
 
 # --- Database ---
-DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = os.getenv("DATABASE_URL") or None
+# SQLite database file, used when DATABASE_URL is not set
+SQLITE_PATH = os.getenv("SQLITE_PATH", "kols.db")
+# Queries slower than this are logged with the originating handler
+SLOW_QUERY_MS = int(os.getenv("SLOW_QUERY_MS", "200"))
+
+# --- Metrics ---
+# Prometheus endpoint for per-update latency histograms; 0 disables it
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+# Event-loop stalls longer than this are logged with the blocking call site; 0 disables
+LOOP_LAG_THRESHOLD_MS = int(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
+
+# --- Sessions ---
+# Per-user in-memory state is dropped after this long without an update...
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "21600"))
+# ...or, least recently seen first, once more users than this are held
+SESSION_MAX_USERS = int(os.getenv("SESSION_MAX_USERS", "20000"))
 
 # --- X API (via Virtuals GAME) ---
 GAME_TWITTER_ACCESS_TOKEN = os.getenv("GAME_TWITTER_ACCESS_TOKEN", "")
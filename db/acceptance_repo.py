@@ -1,4 +1,41 @@
-from db.connection import get_conn, is_postgres, ph, dict_cursor
+from db.connection import get_conn, is_postgres, ph, begin_write
+from db.rows import (
+    Acceptance,
+    AcceptanceForKol,
+    AcceptanceForReview,
+    AcceptanceWithKol,
+    UnpaidAcceptance,
+    VerifiedTweet,
+    columns,
+    fetch_all,
+    fetch_one,
+)
+
+# Keep IN (...) lists well under SQLite's bound-parameter limit
+_IN_CHUNK = 500
+
+# Acceptance statuses mirrored as per-campaign counters on campaigns
+_STATUS_COUNTERS = {
+    "submitted": "submitted_count",
+    "verified": "verified_count",
+    "rejected": "rejected_count",
+}
+
+
+def _shift_status_counters(cur, campaign_id: int, old_status: str | None, new_status: str, n: int = 1):
+    """Move *n* acceptances from old_status's counter to new_status's, in the caller's transaction."""
+    if old_status == new_status or n == 0:
+        return
+    p = ph()
+    sets = []
+    if old_status in _STATUS_COUNTERS:
+        col = _STATUS_COUNTERS[old_status]
+        sets.append(f"{col} = {col} - {n}")
+    if new_status in _STATUS_COUNTERS:
+        col = _STATUS_COUNTERS[new_status]
+        sets.append(f"{col} = {col} + {n}")
+    if sets:
+        cur.execute(f"UPDATE campaigns SET {', '.join(sets)} WHERE id = {p}", (campaign_id,))
 
 
 def create_acceptance(campaign_id: int, kol_telegram_id: int) -> int | None:
@@ -28,39 +65,39 @@ def create_acceptance(campaign_id: int, kol_telegram_id: int) -> int | None:
         conn.close()
 
 
-def get_acceptance(campaign_id: int, kol_telegram_id: int):
+def get_acceptance(campaign_id: int, kol_telegram_id: int) -> Acceptance | None:
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     p = ph()
     cur.execute(
         f"""
-        SELECT * FROM campaign_acceptances
+        SELECT {columns(Acceptance)} FROM campaign_acceptances
         WHERE campaign_id = {p} AND kol_telegram_id = {p}
         """,
         (campaign_id, kol_telegram_id),
     )
-    row = cur.fetchone()
+    row = fetch_one(cur, Acceptance)
     conn.close()
-    return dict(row) if row else None
+    return row
 
 
-def get_acceptance_by_id(acceptance_id: int):
+def get_acceptance_by_id(acceptance_id: int) -> Acceptance | None:
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     p = ph()
-    cur.execute(f"SELECT * FROM campaign_acceptances WHERE id = {p}", (acceptance_id,))
-    row = cur.fetchone()
+    cur.execute(f"SELECT {columns(Acceptance)} FROM campaign_acceptances WHERE id = {p}", (acceptance_id,))
+    row = fetch_one(cur, Acceptance)
     conn.close()
-    return dict(row) if row else None
+    return row
 
 
-def get_acceptances_for_campaign(campaign_id: int):
+def get_acceptances_for_campaign(campaign_id: int) -> list[AcceptanceWithKol]:
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     p = ph()
     cur.execute(
         f"""
-        SELECT ca.*, k.name as kol_name, k.x_account
+        SELECT {columns(Acceptance, "ca")}, k.name as kol_name, k.x_account
         FROM campaign_acceptances ca
         JOIN kols k ON k.telegram_id = ca.kol_telegram_id
         WHERE ca.campaign_id = {p}
@@ -68,19 +105,20 @@ def get_acceptances_for_campaign(campaign_id: int):
         """,
         (campaign_id,),
     )
-    rows = cur.fetchall()
+    rows = fetch_all(cur, AcceptanceWithKol)
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
-def get_acceptances_for_kol(kol_telegram_id: int):
+def get_acceptances_for_kol(kol_telegram_id: int) -> list[AcceptanceForKol]:
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     p = ph()
     cur.execute(
         f"""
-        SELECT ca.*, c.project_name, c.service_type, c.deadline, c.status as campaign_status,
-               c.target_url, c.talking_points, c.hashtags, c.mentions, c.media_file_id
+        SELECT {columns(Acceptance, "ca")},
+               c.project_name, c.service_type, c.deadline, c.status as campaign_status,
+               c.target_url, c.talking_points, c.hashtags, c.mentions, c.media_file_id, c.media_kind
         FROM campaign_acceptances ca
         JOIN campaigns c ON c.id = ca.campaign_id
         WHERE ca.kol_telegram_id = {p}
@@ -88,12 +126,13 @@ def get_acceptances_for_kol(kol_telegram_id: int):
         """,
         (kol_telegram_id,),
     )
-    rows = cur.fetchall()
+    rows = fetch_all(cur, AcceptanceForKol)
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
 def update_acceptance_status(acceptance_id: int, status: str, extra_fields: dict = None):
+    """Update an acceptance's status and keep the campaign's status counters in step."""
     conn = get_conn()
     cur = conn.cursor()
     p = ph()
@@ -107,38 +146,51 @@ def update_acceptance_status(acceptance_id: int, status: str, extra_fields: dict
             vals.append(v)
 
     vals.append(acceptance_id)
-    cur.execute(
-        f"UPDATE campaign_acceptances SET {', '.join(sets)} WHERE id = {p}",
-        tuple(vals),
-    )
-    conn.commit()
-    conn.close()
+    try:
+        begin_write(conn, cur)
+        cur.execute(
+            f"SELECT campaign_id, status FROM campaign_acceptances WHERE id = {p}",
+            (acceptance_id,),
+        )
+        row = cur.fetchone()
+        cur.execute(
+            f"UPDATE campaign_acceptances SET {', '.join(sets)} WHERE id = {p}",
+            tuple(vals),
+        )
+        if row:
+            _shift_status_counters(cur, row[0], row[1], status)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
 
 
-def get_accepted_submission(kol_telegram_id: int, campaign_id: int):
+def get_accepted_submission(kol_telegram_id: int, campaign_id: int) -> Acceptance | None:
     """Get an acceptance that is in 'accepted' status (ready to submit)."""
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     p = ph()
     cur.execute(
         f"""
-        SELECT * FROM campaign_acceptances
+        SELECT {columns(Acceptance)} FROM campaign_acceptances
         WHERE kol_telegram_id = {p} AND campaign_id = {p} AND status = 'accepted'
         """,
         (kol_telegram_id, campaign_id),
     )
-    row = cur.fetchone()
+    row = fetch_one(cur, Acceptance)
     conn.close()
-    return dict(row) if row else None
+    return row
 
 
-def get_pending_verifications():
+def get_pending_verifications() -> list[AcceptanceForReview]:
     """Return submissions awaiting manual review."""
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     cur.execute(
-        """
-        SELECT ca.*, k.name as kol_name, k.x_account, c.project_name, c.service_type
+        f"""
+        SELECT {columns(Acceptance, "ca")}, k.name as kol_name, k.x_account, c.project_name, c.service_type
         FROM campaign_acceptances ca
         JOIN kols k ON k.telegram_id = ca.kol_telegram_id
         JOIN campaigns c ON c.id = ca.campaign_id
@@ -146,32 +198,54 @@ def get_pending_verifications():
         ORDER BY ca.submitted_at
         """
     )
-    rows = cur.fetchall()
+    rows = fetch_all(cur, AcceptanceForReview)
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
+
 
+def get_pending_verifications_page(campaign_id: int | None = None, after_id: int | None = None,
+                                   limit: int = 5) -> list[AcceptanceForReview]:
+    """Return a page of submissions awaiting manual review, oldest first.
 
-def count_verified_for_campaign(campaign_id: int) -> int:
+    Keyset-paginated on acceptance id; optionally restricted to one campaign.
+    """
     conn = get_conn()
     cur = conn.cursor()
     p = ph()
+    where = ["ca.status = 'submitted'"]
+    vals = []
+    if campaign_id:
+        where.append(f"ca.campaign_id = {p}")
+        vals.append(campaign_id)
+    if after_id:
+        where.append(f"ca.id > {p}")
+        vals.append(after_id)
+    vals.append(limit)
     cur.execute(
-        f"SELECT COUNT(*) FROM campaign_acceptances WHERE campaign_id = {p} AND status = 'verified'",
-        (campaign_id,),
+        f"""
+        SELECT {columns(Acceptance, "ca")}, k.name as kol_name, k.x_account, c.project_name, c.service_type
+        FROM campaign_acceptances ca
+        JOIN kols k ON k.telegram_id = ca.kol_telegram_id
+        JOIN campaigns c ON c.id = ca.campaign_id
+        WHERE {' AND '.join(where)}
+        ORDER BY ca.id
+        LIMIT {p}
+        """,
+        tuple(vals),
     )
-    count = cur.fetchone()[0]
+    rows = fetch_all(cur, AcceptanceForReview)
     conn.close()
-    return count
+    return rows
 
 
-def get_unpaid_verified():
+def get_unpaid_verified() -> list[UnpaidAcceptance]:
     """Return verified acceptances that haven't been paid yet."""
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     cur.execute(
-        """
-        SELECT ca.*, k.name as kol_name, k.x_account, k.wallet_address as kol_wallet,
-               c.project_name, c.service_type, c.per_kol_rate
+        f"""
+        SELECT {columns(Acceptance, "ca")}, k.name as kol_name, k.x_account,
+               c.project_name, c.service_type, k.wallet_address as kol_wallet, c.per_kol_rate
         FROM campaign_acceptances ca
         JOIN kols k ON k.telegram_id = ca.kol_telegram_id
         JOIN campaigns c ON c.id = ca.campaign_id
@@ -179,19 +253,55 @@ def get_unpaid_verified():
         ORDER BY ca.verified_at
         """
     )
-    rows = cur.fetchall()
+    rows = fetch_all(cur, UnpaidAcceptance)
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
-def get_recent_verified_with_tweets():
+def get_unpaid_verified_page(campaign_id: int | None = None, after_id: int | None = None,
+                             limit: int = 5) -> list[UnpaidAcceptance]:
+    """Return a page of verified, unpaid acceptances, oldest first.
+
+    Keyset-paginated on acceptance id; optionally restricted to one campaign.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    where = ["ca.status = 'verified'", "(ca.payout_status IS NULL OR ca.payout_status = 'unpaid')"]
+    vals = []
+    if campaign_id:
+        where.append(f"ca.campaign_id = {p}")
+        vals.append(campaign_id)
+    if after_id:
+        where.append(f"ca.id > {p}")
+        vals.append(after_id)
+    vals.append(limit)
+    cur.execute(
+        f"""
+        SELECT {columns(Acceptance, "ca")}, k.name as kol_name, k.x_account,
+               c.project_name, c.service_type, k.wallet_address as kol_wallet, c.per_kol_rate
+        FROM campaign_acceptances ca
+        JOIN kols k ON k.telegram_id = ca.kol_telegram_id
+        JOIN campaigns c ON c.id = ca.campaign_id
+        WHERE {' AND '.join(where)}
+        ORDER BY ca.id
+        LIMIT {p}
+        """,
+        tuple(vals),
+    )
+    rows = fetch_all(cur, UnpaidAcceptance)
+    conn.close()
+    return rows
+
+
+def get_recent_verified_with_tweets() -> list[VerifiedTweet]:
     """Return verified acceptances from the last 10 days that have a tweet URL.
 
     Only includes active (non-banned) KOLs. Joins KOL name/x_account and
     campaign project_name for reporting.
     """
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     if is_postgres():
         date_filter = "ca.verified_at >= NOW() - INTERVAL '10 days'"
     else:
@@ -213,20 +323,203 @@ def get_recent_verified_with_tweets():
         ORDER BY ca.verified_at
         """
     )
-    rows = cur.fetchall()
+    rows = fetch_all(cur, VerifiedTweet)
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
 def mark_paid(acceptance_id: int):
-    """Mark an acceptance as paid."""
+    """Mark an acceptance as paid (no-op if it already is)."""
     conn = get_conn()
     cur = conn.cursor()
     p = ph()
     from datetime import datetime
     cur.execute(
-        f"UPDATE campaign_acceptances SET payout_status = 'paid', paid_at = {p} WHERE id = {p}",
+        f"UPDATE campaign_acceptances SET payout_status = 'paid', paid_at = {p} "
+        f"WHERE id = {p} AND (payout_status IS NULL OR payout_status = 'unpaid')",
         (datetime.utcnow().isoformat(), acceptance_id),
     )
+    if cur.rowcount:
+        cur.execute(
+            f"UPDATE campaigns SET paid_count = paid_count + 1 "
+            f"WHERE id = (SELECT campaign_id FROM campaign_acceptances WHERE id = {p})",
+            (acceptance_id,),
+        )
     conn.commit()
     conn.close()
+
+
+def _chunks(ids, size=_IN_CHUNK):
+    ids = list(ids)
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+
+def bulk_update_submission_status(campaign_id: int, status: str, extra_fields: dict = None) -> list[dict]:
+    """Move every 'submitted' acceptance of a campaign to *status* in one transaction.
+
+    Returns the affected rows (id, kol_telegram_id).
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    lock = " FOR UPDATE" if is_postgres() else ""
+    try:
+        begin_write(conn, cur)
+        cur.execute(
+            f"SELECT id, kol_telegram_id FROM campaign_acceptances "
+            f"WHERE campaign_id = {p} AND status = 'submitted' ORDER BY id{lock}",
+            (campaign_id,),
+        )
+        rows = [{"id": r[0], "kol_telegram_id": r[1]} for r in cur.fetchall()]
+
+        sets = [f"status = {p}"]
+        vals = [status]
+        if extra_fields:
+            for k, v in extra_fields.items():
+                sets.append(f"{k} = {p}")
+                vals.append(v)
+        # The rows are locked, so the status re-check only guards the counters
+        updated = 0
+        for chunk in _chunks(r["id"] for r in rows):
+            cur.execute(
+                f"UPDATE campaign_acceptances SET {', '.join(sets)} "
+                f"WHERE id IN ({', '.join([p] * len(chunk))}) AND status = 'submitted'",
+                tuple(vals + chunk),
+            )
+            updated += cur.rowcount
+        _shift_status_counters(cur, campaign_id, "submitted", status, updated)
+        conn.commit()
+        return rows
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def mark_paid_in_transaction(cur, where: str, vals: tuple, tx_hashes: dict | None, tx_hash: str = None) -> list[dict]:
+    """Select eligible unpaid rows matching *where* and mark them paid.
+
+    The caller owns the transaction (see ``begin_write``) and commits.
+    Rows are grouped by tx hash so each distinct hash is one
+    ``UPDATE ... WHERE id IN (...)``. Returns the paid rows with the
+    campaign/KOL details needed for notifications.
+    """
+    from datetime import datetime
+    p = ph()
+    lock = " FOR UPDATE OF ca" if is_postgres() else ""
+    cur.execute(
+        f"""
+        SELECT ca.id, ca.campaign_id, ca.kol_telegram_id, k.wallet_address as kol_wallet,
+               c.project_name, c.per_kol_rate
+        FROM campaign_acceptances ca
+        JOIN kols k ON k.telegram_id = ca.kol_telegram_id
+        JOIN campaigns c ON c.id = ca.campaign_id
+        WHERE ca.status = 'verified' AND (ca.payout_status IS NULL OR ca.payout_status = 'unpaid')
+          AND {where}
+        ORDER BY ca.id{lock}
+        """,
+        vals,
+    )
+    names = [d[0] for d in cur.description]
+    rows = [dict(zip(names, r)) for r in cur.fetchall()]
+
+    by_hash = {}
+    for r in rows:
+        r["tx_hash"] = (tx_hashes or {}).get(r["id"], tx_hash)
+        by_hash.setdefault(r["tx_hash"], []).append(r["id"])
+
+    paid_at = datetime.utcnow().isoformat()
+    for row_hash, ids in by_hash.items():
+        for chunk in _chunks(ids):
+            cur.execute(
+                f"UPDATE campaign_acceptances "
+                f"SET payout_status = 'paid', paid_at = {p}, payout_tx_hash = {p} "
+                f"WHERE id IN ({', '.join([p] * len(chunk))})",
+                (paid_at, row_hash, *chunk),
+            )
+
+    per_campaign = {}
+    for r in rows:
+        per_campaign[r["campaign_id"]] = per_campaign.get(r["campaign_id"], 0) + 1
+    for campaign_id, n in per_campaign.items():
+        cur.execute(
+            f"UPDATE campaigns SET paid_count = paid_count + {p} WHERE id = {p}",
+            (n, campaign_id),
+        )
+    return rows
+
+
+def get_batched_unpaid_ids(acceptance_ids) -> list[int]:
+    """Those of *acceptance_ids* still unpaid in a payout batch, which only /batchpaid pays."""
+    ids = sorted(set(acceptance_ids))
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    batched = []
+    for chunk in _chunks(ids):
+        cur.execute(
+            f"SELECT id FROM campaign_acceptances "
+            f"WHERE id IN ({', '.join([p] * len(chunk))}) AND payout_batch_id IS NOT NULL "
+            f"AND (payout_status IS NULL OR payout_status = 'unpaid') ORDER BY id",
+            tuple(chunk),
+        )
+        batched.extend(r[0] for r in cur.fetchall())
+    conn.close()
+    return batched
+
+
+def mark_paid_bulk(acceptance_ids, tx_hashes: dict = None) -> list[dict]:
+    """Mark many acceptances paid in one transaction.
+
+    Args:
+        acceptance_ids: candidate ids; ones that are not verified+unpaid, or are
+            in a payout batch (paid with the batch), are skipped.
+        tx_hashes: optional {acceptance_id: tx_hash} recorded on each row.
+
+    Returns the rows actually marked paid.
+    """
+    ids = sorted(set(acceptance_ids))
+    if not ids:
+        return []
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    try:
+        begin_write(conn, cur)
+        rows = []
+        for chunk in _chunks(ids):
+            rows.extend(mark_paid_in_transaction(
+                cur, f"ca.id IN ({', '.join([p] * len(chunk))}) AND ca.payout_batch_id IS NULL",
+                tuple(chunk), tx_hashes,
+            ))
+        conn.commit()
+        return rows
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def mark_paid_for_wallet(wallet_address: str, tx_hash: str = None) -> list[dict]:
+    """Mark every unpaid verified acceptance paying into *wallet_address* as paid.
+
+    Rows already in a payout batch are left for the batch (/batchpaid).
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    try:
+        begin_write(conn, cur)
+        rows = mark_paid_in_transaction(
+            cur, f"k.wallet_address = {p} AND ca.payout_batch_id IS NULL", (wallet_address,), None, tx_hash,
+        )
+        conn.commit()
+        return rows
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
@@ -0,0 +1,105 @@
+"""KOL alert preferences and new-campaign broadcast progress (see services.campaign_alerts)."""
+from db.connection import get_conn, ph
+from db.rows import CampaignBroadcast, columns, fetch_all, fetch_one
+
+
+def get_alert_services(kol_telegram_id: int) -> set[str]:
+    """Service types *kol_telegram_id* wants new-campaign alerts for."""
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(f"SELECT service_type FROM kol_alert_prefs WHERE kol_telegram_id = {ph()}", (kol_telegram_id,))
+    services = {r[0] for r in cur.fetchall()}
+    conn.close()
+    return services
+
+
+def set_alert_services(kol_telegram_id: int, service_types):
+    """Replace a KOL's alert subscriptions; an empty *service_types* opts them out."""
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    cur.execute(f"DELETE FROM kol_alert_prefs WHERE kol_telegram_id = {p}", (kol_telegram_id,))
+    cur.executemany(
+        f"INSERT INTO kol_alert_prefs (service_type, kol_telegram_id) VALUES ({p}, {p})",
+        [(service_type, kol_telegram_id) for service_type in sorted(service_types)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def get_alert_recipients(service_type: str, after: int = 0, limit: int = 50) -> list[int]:
+    """Active KOLs subscribed to *service_type* with telegram_id above *after*, in id order."""
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    cur.execute(
+        f"""
+        SELECT a.kol_telegram_id
+        FROM kol_alert_prefs a
+        JOIN kols k ON k.telegram_id = a.kol_telegram_id
+        WHERE a.service_type = {p} AND a.kol_telegram_id > {p} AND k.is_active = TRUE
+        ORDER BY a.kol_telegram_id
+        LIMIT {p}
+        """,
+        (service_type, after, limit),
+    )
+    ids = [r[0] for r in cur.fetchall()]
+    conn.close()
+    return ids
+
+
+def create_broadcast(campaign_id: int, service_type: str):
+    """Queue the alert fan-out for a campaign that just went live (once per campaign)."""
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    cur.execute(
+        f"INSERT INTO campaign_broadcasts (campaign_id, service_type) VALUES ({p}, {p}) "
+        f"ON CONFLICT (campaign_id) DO NOTHING",
+        (campaign_id, service_type),
+    )
+    conn.commit()
+    conn.close()
+
+
+def get_broadcast(campaign_id: int) -> CampaignBroadcast | None:
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT {columns(CampaignBroadcast)} FROM campaign_broadcasts WHERE campaign_id = {ph()}",
+        (campaign_id,),
+    )
+    row = fetch_one(cur, CampaignBroadcast)
+    conn.close()
+    return row
+
+
+def get_running_broadcasts() -> list[CampaignBroadcast]:
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        f"SELECT {columns(CampaignBroadcast)} FROM campaign_broadcasts "
+        f"WHERE status = 'running' ORDER BY campaign_id"
+    )
+    rows = fetch_all(cur, CampaignBroadcast)
+    conn.close()
+    return rows
+
+
+def save_broadcast_progress(campaign_id: int, last_kol_telegram_id: int, sent_count: int,
+                            failed_count: int, status: str = "running"):
+    """Record how far a broadcast got; any status but 'running' finishes it."""
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    finished = "" if status == "running" else ", finished_at = CURRENT_TIMESTAMP"
+    cur.execute(
+        f"""
+        UPDATE campaign_broadcasts
+        SET last_kol_telegram_id = {p}, sent_count = {p}, failed_count = {p}, status = {p}{finished}
+        WHERE campaign_id = {p} AND status = 'running'
+        """,
+        (last_kol_telegram_id, sent_count, failed_count, status, campaign_id),
+    )
+    conn.commit()
+    conn.close()
@@ -0,0 +1,35 @@
+"""Telegram file_ids of uploaded static assets (see services.assets)."""
+from db.connection import get_conn, is_postgres, ph
+from db.rows import TelegramAsset, columns, fetch_all
+
+
+def get_all_assets() -> list[TelegramAsset]:
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(f"SELECT {columns(TelegramAsset)} FROM telegram_assets")
+    rows = fetch_all(cur, TelegramAsset)
+    conn.close()
+    return rows
+
+
+def save_asset(name: str, file_id: str, content_hash: str, bot_id: int):
+    """Record the file_id Telegram returned for *name*'s current content."""
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    excluded = "EXCLUDED" if is_postgres() else "excluded"
+    cur.execute(
+        f"""
+        INSERT INTO telegram_assets (name, file_id, content_hash, bot_id, uploaded_at)
+        VALUES ({p}, {p}, {p}, {p}, CURRENT_TIMESTAMP)
+        ON CONFLICT(name) DO UPDATE SET
+            file_id = {excluded}.file_id,
+            content_hash = {excluded}.content_hash,
+            bot_id = {excluded}.bot_id,
+            uploaded_at = CURRENT_TIMESTAMP
+        """,
+        (name, file_id, content_hash, bot_id),
+    )
+    conn.commit()
+    conn.close()
+
@@ -1,4 +1,39 @@
-from db.connection import get_conn, ph, dict_cursor
+import logging
+import re
+
+from db.connection import get_conn, is_postgres, on_commit, ph
+from db.rows import Campaign, CampaignSummary, columns, fetch_all, fetch_one
+
+logger = logging.getLogger(__name__)
+
+# Full-text search over the campaign brief: an FTS5 table (campaigns_fts) on
+# SQLite, a tsvector column with a GIN index on Postgres. Both are written by
+# create_campaign; rebuild_search_index() re-derives them after bulk loads.
+SEARCH_COLUMNS = ("project_name", "talking_points", "hashtags", "mentions")
+_PG_SEARCH_VECTOR = f"to_tsvector('simple', concat_ws(' ', {', '.join(SEARCH_COLUMNS)}))"
+_fts5 = None  # SQLite: whether campaigns_fts exists (FTS5 compiled in), checked once
+
+# Called with the campaign id once a status or accepted_count change in this process has committed
+_listeners = []
+
+
+def add_listener(callback):
+    """Register *callback(campaign_id)* to run after each committed campaign status or slot change."""
+    _listeners.append(callback)
+
+
+def notify_changed(campaign_id: int):
+    """Run the listeners once the current transaction has committed.
+
+    Outside a unit of work that is right away. Also used by writers outside
+    this module (e.g. acceptance_service).
+    """
+    on_commit(lambda: _notify(campaign_id))
+
+
+def _notify(campaign_id: int):
+    for callback in _listeners:
+        callback(campaign_id)
 
 
 def create_campaign(data: dict) -> int:
@@ -11,11 +46,11 @@ def create_campaign(data: dict) -> int:
         INSERT INTO campaigns (
             customer_telegram_id, project_name, service_type,
             target_url, talking_points, hashtags, mentions,
-            reference_tweet_url, media_file_id,
+            reference_tweet_url, media_file_id, media_kind,
             kol_count, per_kol_rate, platform_fee, total_cost,
             deadline, status
         ) VALUES (
-            {p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p}
+            {p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p},{p}
         )
         """,
         (
@@ -28,6 +63,7 @@ def create_campaign(data: dict) -> int:
             data.get("mentions"),
             data.get("reference_tweet_url"),
             data.get("media_file_id"),
+            data.get("media_kind"),
             data["kol_count"],
             data["per_kol_rate"],
             data["platform_fee"],
@@ -38,64 +74,66 @@ def create_campaign(data: dict) -> int:
     )
 
     # Get the inserted id
-    from db.connection import is_postgres
     if is_postgres():
         cur.execute("SELECT lastval()")
         campaign_id = cur.fetchone()[0]
     else:
         campaign_id = cur.lastrowid
 
+    _index_campaign(cur, campaign_id)
     conn.commit()
     conn.close()
     return campaign_id
 
 
-def get_campaign(campaign_id: int):
+def get_campaign(campaign_id: int) -> Campaign | None:
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     p = ph()
-    cur.execute(f"SELECT * FROM campaigns WHERE id = {p}", (campaign_id,))
-    row = cur.fetchone()
+    cur.execute(f"SELECT {columns(Campaign)} FROM campaigns WHERE id = {p}", (campaign_id,))
+    row = fetch_one(cur, Campaign)
     conn.close()
-    return dict(row) if row else None
+    return row
 
 
-def get_campaigns_by_status(status: str):
+def get_campaigns_by_status(status: str) -> list[CampaignSummary]:
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     p = ph()
     cur.execute(
-        f"SELECT * FROM campaigns WHERE status = {p} ORDER BY created_at DESC",
+        f"SELECT {columns(CampaignSummary)} FROM campaigns WHERE status = {p} ORDER BY created_at DESC",
         (status,),
     )
-    rows = cur.fetchall()
+    rows = fetch_all(cur, CampaignSummary)
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
-def get_campaigns_by_customer(telegram_id: int):
+def get_campaigns_by_customer(telegram_id: int) -> list[CampaignSummary]:
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     p = ph()
     cur.execute(
-        f"SELECT * FROM campaigns WHERE customer_telegram_id = {p} ORDER BY created_at DESC",
+        f"SELECT {columns(CampaignSummary)} FROM campaigns "
+        f"WHERE customer_telegram_id = {p} ORDER BY created_at DESC",
         (telegram_id,),
     )
-    rows = cur.fetchall()
+    rows = fetch_all(cur, CampaignSummary)
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
-def get_live_campaigns():
-    """Return campaigns that are live and not yet filled."""
+def get_live_campaigns() -> list[Campaign]:
+    """Return campaigns that are live and not yet filled, with their briefs."""
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     cur.execute(
-        "SELECT * FROM campaigns WHERE status IN ('live', 'filled') ORDER BY created_at DESC"
+        f"SELECT {columns(Campaign)} FROM campaigns "
+        f"WHERE status IN ('live', 'filled') ORDER BY created_at DESC"
     )
-    rows = cur.fetchall()
+    rows = fetch_all(cur, Campaign)
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
 
 
 def update_campaign_status(campaign_id: int, status: str, extra_fields: dict = None):
@@ -118,6 +156,7 @@ def update_campaign_status(campaign_id: int, status: str, extra_fields: dict = N
     )
     conn.commit()
     conn.close()
+    notify_changed(campaign_id)
 
 
 def increment_accepted_count(campaign_id: int) -> int:
@@ -133,6 +172,7 @@ def increment_accepted_count(campaign_id: int) -> int:
     row = cur.fetchone()
     conn.commit()
     conn.close()
+    notify_changed(campaign_id)
     return row[0], row[1]  # accepted_count, kol_count
 
 
@@ -148,24 +188,202 @@ def set_announcement_message_id(campaign_id: int, message_id: str):
     conn.close()
 
 
-def get_expired_campaigns(now_ts: str):
-    """Return live/filled campaigns past their deadline."""
+def get_upcoming_deadlines():
+    """Return (id, deadline) for every live/filled campaign, earliest deadline first."""
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT id, deadline FROM campaigns WHERE status IN ('live', 'filled') ORDER BY deadline"
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return [(r[0], r[1]) for r in rows]
+
+
+def expire_due_campaigns(now_ts: str) -> list[Campaign]:
+    """Expire every live/filled campaign whose deadline has passed, in one statement.
+
+    Returns the expired campaigns.
+    """
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     p = ph()
     cur.execute(
-        f"SELECT * FROM campaigns WHERE status IN ('live', 'filled') AND deadline < {p}",
+        f"""
+        UPDATE campaigns SET status = 'expired'
+        WHERE status IN ('live', 'filled') AND deadline <= {p}
+        RETURNING {columns(Campaign)}
+        """,
         (now_ts,),
     )
-    rows = cur.fetchall()
+    rows = fetch_all(cur, Campaign)
+    conn.commit()
     conn.close()
-    return [dict(r) for r in rows]
+    for c in rows:
+        notify_changed(c.id)
+    return rows
 
 
-def get_all_campaigns():
+def get_campaigns_page(status: str | None = None, before_id: int | None = None,
+                       limit: int = 10) -> list[CampaignSummary]:
+    """Return up to *limit* campaigns, newest first, optionally filtered by status.
+
+    Keyset-paginated on id: pass the id of the last campaign of the previous
+    page as *before_id* to get the next page.
+    """
     conn = get_conn()
-    cur = dict_cursor(conn)
-    cur.execute("SELECT * FROM campaigns ORDER BY created_at DESC")
-    rows = cur.fetchall()
+    cur = conn.cursor()
+    p = ph()
+    where = []
+    vals = []
+    if status:
+        where.append(f"status = {p}")
+        vals.append(status)
+    if before_id:
+        where.append(f"id < {p}")
+        vals.append(before_id)
+    sql = f"SELECT {columns(CampaignSummary)} FROM campaigns"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY id DESC LIMIT {p}"
+    vals.append(limit)
+    cur.execute(sql, tuple(vals))
+    rows = fetch_all(cur, CampaignSummary)
+    conn.close()
+    return rows
+
+
+def get_all_campaigns() -> list[CampaignSummary]:
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(f"SELECT {columns(CampaignSummary)} FROM campaigns ORDER BY created_at DESC")
+    rows = fetch_all(cur, CampaignSummary)
+    conn.close()
+    return rows
+
+
+def reconcile_campaign_counters() -> int:
+    """Recompute per-campaign acceptance counters from an aggregate and fix drift.
+
+    Returns the number of campaigns whose counters were corrected.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    cur.execute(
+        """
+        SELECT c.id, c.submitted_count, c.verified_count, c.rejected_count, c.paid_count,
+               COALESCE(a.submitted, 0), COALESCE(a.verified, 0),
+               COALESCE(a.rejected, 0), COALESCE(a.paid, 0)
+        FROM campaigns c
+        LEFT JOIN (
+            SELECT campaign_id,
+                   SUM(CASE WHEN status = 'submitted' THEN 1 ELSE 0 END) AS submitted,
+                   SUM(CASE WHEN status = 'verified' THEN 1 ELSE 0 END) AS verified,
+                   SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) AS rejected,
+                   SUM(CASE WHEN payout_status = 'paid' THEN 1 ELSE 0 END) AS paid
+            FROM campaign_acceptances
+            GROUP BY campaign_id
+        ) a ON a.campaign_id = c.id
+        """
+    )
+    fixed = 0
+    for row in cur.fetchall():
+        stored, actual = tuple(row[1:5]), tuple(row[5:9])
+        if stored != actual:
+            cur.execute(
+                f"UPDATE campaigns SET submitted_count = {p}, verified_count = {p}, "
+                f"rejected_count = {p}, paid_count = {p} WHERE id = {p}",
+                (*actual, row[0]),
+            )
+            fixed += 1
+    conn.commit()
+    conn.close()
+    return fixed
+
+
+# ---------------------------------------------------------------------------
+# Full-text search
+# ---------------------------------------------------------------------------
+
+def _has_fts5(cur) -> bool:
+    global _fts5
+    if _fts5 is None:
+        cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'campaigns_fts'")
+        _fts5 = cur.fetchone() is not None
+        if not _fts5:
+            logger.warning("campaigns_fts is missing (no FTS5?); campaign search falls back to LIKE")
+    return _fts5
+
+
+def _index_campaign(cur, campaign_id: int):
+    """Add one new campaign to the search index."""
+    p = ph()
+    if is_postgres():
+        cur.execute(f"UPDATE campaigns SET search_vector = {_PG_SEARCH_VECTOR} WHERE id = {p}", (campaign_id,))
+    elif _has_fts5(cur):
+        cols = ", ".join(SEARCH_COLUMNS)
+        cur.execute(
+            f"INSERT INTO campaigns_fts (rowid, {cols}) SELECT id, {cols} FROM campaigns WHERE id = {p}",
+            (campaign_id,),
+        )
+
+
+def rebuild_search_index():
+    """Re-derive the whole search index from the campaigns table."""
+    global _fts5
+    conn = get_conn()
+    cur = conn.cursor()
+    if is_postgres():
+        cur.execute(f"UPDATE campaigns SET search_vector = {_PG_SEARCH_VECTOR}")
+    else:
+        _fts5 = None
+        if _has_fts5(cur):
+            cur.execute("INSERT INTO campaigns_fts (campaigns_fts) VALUES ('rebuild')")
+    conn.commit()
+    conn.close()
+
+
+def search_campaigns(query: str, status: str | None = None, before_id: int | None = None,
+                     limit: int = 10) -> list[CampaignSummary]:
+    """Campaigns whose brief contains every word of *query* (as a word prefix), newest first.
+
+    Keyset-paginated on id like get_campaigns_page; *status* narrows the results.
+    """
+    words = re.findall(r"\w+", query.casefold())
+    if not words:
+        return []
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    where = []
+    vals = []
+    key = "c.id"
+    if is_postgres():
+        source = "campaigns c"
+        where.append(f"c.search_vector @@ to_tsquery('simple', {p})")
+        vals.append(" & ".join(f"{w}:*" for w in words))
+    elif _has_fts5(cur):
+        source = "campaigns_fts f JOIN campaigns c ON c.id = f.rowid"
+        key = "f.rowid"  # FTS5 walks matches in rowid order, so LIMIT stops early
+        where.append(f"campaigns_fts MATCH {p}")
+        vals.append(" ".join(f'"{w}"*' for w in words))
+    else:
+        source = "campaigns c"
+        for w in words:
+            where.append("(" + " OR ".join(f"c.{col} LIKE {p}" for col in SEARCH_COLUMNS) + ")")
+            vals.extend([f"%{w}%"] * len(SEARCH_COLUMNS))
+    if status:
+        where.append(f"c.status = {p}")
+        vals.append(status)
+    if before_id:
+        where.append(f"{key} < {p}")
+        vals.append(before_id)
+    cur.execute(
+        f"SELECT {columns(CampaignSummary, 'c')} FROM {source} "
+        f"WHERE {' AND '.join(where)} ORDER BY {key} DESC LIMIT {p}",
+        (*vals, limit),
+    )
+    rows = fetch_all(cur, CampaignSummary)
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
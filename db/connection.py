@@ -1,16 +1,48 @@
+import asyncio
+import contextvars
+import inspect
+import logging
 import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import wraps
 
-import psycopg2
-import psycopg2.extras
+from config import DATABASE_URL, SQLITE_PATH
+from db.instrumentation import instrument
 
-from config import DATABASE_URL
+logger = logging.getLogger(__name__)
 
 
-def get_conn():
-    """Return a database connection (PostgreSQL if DATABASE_URL is set, else SQLite)."""
+def _psycopg2():
+    """Import the Postgres driver on first use, so SQLite deployments never load it."""
+    import psycopg2
+    import psycopg2.extensions
+    import psycopg2.extras
+    return psycopg2
+
+
+def connect():
+    """Open a new database connection (PostgreSQL if DATABASE_URL is set, else SQLite).
+
+    Bypasses any active unit of work; use for long-lived or out-of-band connections.
+    """
     if DATABASE_URL:
-        return psycopg2.connect(DATABASE_URL)
-    return sqlite3.connect("kols.db")
+        return _psycopg2().connect(DATABASE_URL)
+    return sqlite3.connect(SQLITE_PATH, timeout=30)
+
+
+def get_conn():
+    """Return a database connection.
+
+    Inside a unit of work this is the unit's shared connection, whose
+    commit()/close() are deferred to the end of the unit; otherwise a new
+    connection the caller commits and closes as usual. Either way its
+    cursors are instrumented (see db.instrumentation).
+    """
+    unit = _current_unit.get()
+    if unit is not None and unit.owns_current_context():
+        return instrument(unit.connection())
+    return instrument(connect())
 
 
 def is_postgres():
@@ -25,6 +57,170 @@ def ph():
 def dict_cursor(conn):
     """Return a cursor that yields dict-like rows."""
     if is_postgres():
-        return conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+        return conn.cursor(cursor_factory=_psycopg2().extras.RealDictCursor)
     conn.row_factory = sqlite3.Row
     return conn.cursor()
+
+
+def begin_write(conn, cur):
+    """Start a write transaction that holds its locks until commit.
+
+    Postgres takes row locks as statements run; SQLite needs BEGIN IMMEDIATE
+    to grab the write lock up front so select-then-update stays consistent.
+    Inside a unit of work that already has a transaction open this is a no-op.
+    """
+    if is_postgres():
+        if conn.get_transaction_status() == _psycopg2().extensions.TRANSACTION_STATUS_IDLE:
+            cur.execute("BEGIN")
+    elif not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+
+
+# ---------------------------------------------------------------------------
+# Unit of work: one connection + one transaction per service call
+# ---------------------------------------------------------------------------
+
+_current_unit = contextvars.ContextVar("db_unit_of_work", default=None)
+
+
+def _current_task():
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+class _UnitConnection:
+    """Connection proxy handed to repo code inside a unit of work.
+
+    commit() and close() are deferred to the unit. rollback() rolls back
+    immediately (so Postgres can keep executing) and marks the unit
+    rollback-only, so nothing written in it is committed.
+    """
+
+    def __init__(self, unit, raw):
+        object.__setattr__(self, "_unit", unit)
+        object.__setattr__(self, "_raw", raw)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._raw, name, value)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+    def rollback(self):
+        self._raw.rollback()
+        self._unit.rollback_only = True
+
+
+class UnitOfWork:
+    """A lazily opened connection shared by every repo call in one unit.
+
+    The unit belongs to the thread and asyncio task that opened it: tasks
+    spawned from it (``create_task``, ``asyncio.to_thread``) inherit the
+    context variable but get their own connections.
+    """
+
+    def __init__(self):
+        self._raw = None
+        self.rollback_only = False
+        self.after_commit = []  # callables run once the unit has committed
+        self._thread = threading.get_ident()
+        self._task = _current_task()
+
+    def owns_current_context(self) -> bool:
+        return threading.get_ident() == self._thread and _current_task() is self._task
+
+    def connection(self):
+        if self._raw is None:
+            self._raw = connect()
+        return _UnitConnection(self, self._raw)
+
+    def finish(self, success: bool):
+        committed = success and not self.rollback_only
+        callbacks, self.after_commit = self.after_commit, []
+        if self._raw is not None:
+            try:
+                if committed:
+                    self._raw.commit()
+                else:
+                    if self.rollback_only:
+                        logger.debug("Unit of work marked rollback-only; discarding its writes")
+                    self._raw.rollback()
+            finally:
+                self._raw.close()
+                self._raw = None
+        if committed:
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error("after-commit callback %r failed: %s", callback, e)
+
+
+@contextmanager
+def unit_of_work():
+    """Run the block with one shared connection, committed once at the end.
+
+    Every repo function called inside joins the unit automatically via
+    get_conn(). The transaction is rolled back if the block raises or any
+    repo code rolled back. Nested blocks join the outer unit.
+    """
+    current = _current_unit.get()
+    if current is not None and current.owns_current_context():
+        yield current
+        return
+
+    unit = UnitOfWork()
+    token = _current_unit.set(unit)
+    try:
+        yield unit
+    except BaseException:
+        unit.finish(False)
+        raise
+    else:
+        unit.finish(True)
+    finally:
+        _current_unit.reset(token)
+
+
+def mark_rollback_only():
+    """Discard the current unit of work's writes (e.g. a dry run in bench/)."""
+    unit = _current_unit.get()
+    if unit is not None and unit.owns_current_context():
+        unit.rollback_only = True
+
+
+def on_commit(callback):
+    """Run *callback()* once the current unit of work has committed.
+
+    Outside a unit of work it runs right away. It is dropped if the unit
+    rolls back.
+    """
+    unit = _current_unit.get()
+    if unit is not None and unit.owns_current_context():
+        unit.after_commit.append(callback)
+    else:
+        callback()
+
+
+def transactional(func):
+    """Decorator: run a service function (sync or async) inside a unit of work."""
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with unit_of_work():
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with unit_of_work():
+            return func(*args, **kwargs)
+    return wrapper
@@ -1,4 +1,5 @@
-from db.connection import get_conn, is_postgres, ph, dict_cursor
+from db.connection import get_conn, is_postgres, ph
+from db.rows import Customer, columns, fetch_all, fetch_one
 
 
 def save_customer(telegram_id, telegram_handle, name, project_x_account):
@@ -37,20 +38,20 @@ def save_customer(telegram_id, telegram_handle, name, project_x_account):
     conn.close()
 
 
-def get_customer(telegram_id):
+def get_customer(telegram_id) -> Customer | None:
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     p = ph()
-    cur.execute(f"SELECT * FROM customers WHERE telegram_id = {p}", (telegram_id,))
-    row = cur.fetchone()
+    cur.execute(f"SELECT {columns(Customer)} FROM customers WHERE telegram_id = {p}", (telegram_id,))
+    row = fetch_one(cur, Customer)
     conn.close()
-    return dict(row) if row else None
+    return row
 
 
-def get_all_customers():
+def get_all_customers() -> list[Customer]:
     conn = get_conn()
-    cur = dict_cursor(conn)
-    cur.execute("SELECT * FROM customers ORDER BY registered_at DESC")
-    rows = cur.fetchall()
+    cur = conn.cursor()
+    cur.execute(f"SELECT {columns(Customer)} FROM customers ORDER BY registered_at DESC")
+    rows = fetch_all(cur, Customer)
     conn.close()
-    return [dict(r) for r in rows]
+    return rows
@@ -0,0 +1,32 @@
+"""Export bookkeeping — per-table high-water marks for incremental exports."""
+from db.connection import get_conn, is_postgres, ph
+
+
+def get_export_marker(table: str) -> int | None:
+    """Return the highest row id included in the last export of *table*."""
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    cur.execute(f"SELECT last_id FROM export_state WHERE table_name = {p}", (table,))
+    row = cur.fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
+def set_export_marker(table: str, last_id: int):
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    excluded = "EXCLUDED" if is_postgres() else "excluded"
+    cur.execute(
+        f"""
+        INSERT INTO export_state (table_name, last_id, exported_at)
+        VALUES ({p}, {p}, CURRENT_TIMESTAMP)
+        ON CONFLICT(table_name) DO UPDATE SET
+            last_id = {excluded}.last_id,
+            exported_at = CURRENT_TIMESTAMP
+        """,
+        (table, last_id),
+    )
+    conn.commit()
+    conn.close()
@@ -0,0 +1,107 @@
+"""Registry of hot repo queries and the indexes their plans are expected to use.
+
+bench/plan_guard.py calls each entry, EXPLAINs every statement it issues and
+fails if one of LARGE_TABLES is read by a sequential (or full index) scan,
+or if an expected index is missing from the plans. Each ``indexes`` item is
+an index name or a tuple of acceptable alternatives.
+
+``call`` receives a fixtures dict with representative ids (see
+bench.repo_bench.fixtures). Full-table reads such as get_all_kols and the
+daily counter reconciliation are deliberately not registered.
+"""
+import time
+
+from db import acceptance_repo, alert_repo, campaign_repo, kol_repo, payout_repo
+
+LARGE_TABLES = ("kols", "campaigns", "campaign_acceptances", "kol_alert_prefs")
+
+_CAMPAIGN_STATUS = ("idx_campaigns_status_id", "idx_campaigns_status_deadline")
+_PUBLIC_ROSTER = ("idx_kols_public_followers", "idx_kols_public_reputation", "idx_kols_public_newest")
+_ACCEPTANCE_STATUS = ("idx_acceptances_status_id", "idx_acceptances_status_verified_at")
+
+
+def _now():
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+
+
+HOT_QUERIES = [
+    # --- KOL-facing ---
+    {"name": "kol_repo.get_kol", "call": lambda fx: kol_repo.get_kol(fx["busy_kol"]), "indexes": []},
+    {"name": "kol_repo.get_roster_page",
+     "call": lambda fx: kol_repo.get_roster_page("followers", True, (1000, fx["mid_kol_id"])),
+     "indexes": ["idx_kols_public_followers"]},
+    {"name": "kol_repo.get_roster_page (reputation)",
+     "call": lambda fx: kol_repo.get_roster_page("reputation", True, (100.0, fx["mid_kol_id"])),
+     "indexes": ["idx_kols_public_reputation"]},
+    {"name": "kol_repo.get_roster_page (newest)",
+     "call": lambda fx: kol_repo.get_roster_page("newest", True, (fx["mid_kol_id"],)),
+     "indexes": [("idx_kols_public_newest", "sqlite_autoindex_kols_1")]},
+    {"name": "kol_repo.count_roster",
+     "call": lambda fx: (kol_repo._counts.clear(), kol_repo.count_roster(True)), "indexes": [_PUBLIC_ROSTER]},
+    {"name": "campaign_repo.get_live_campaigns", "call": lambda fx: campaign_repo.get_live_campaigns(),
+     "indexes": [_CAMPAIGN_STATUS]},
+    {"name": "campaign_repo.get_campaign", "call": lambda fx: campaign_repo.get_campaign(fx["campaign"]), "indexes": []},
+    {"name": "acceptance_repo.get_acceptance",
+     "call": lambda fx: acceptance_repo.get_acceptance(fx["campaign"], fx["busy_kol"]), "indexes": []},
+    {"name": "acceptance_repo.create_acceptance",
+     "call": lambda fx: acceptance_repo.create_acceptance(fx["live_campaign"], fx["busy_kol"]), "indexes": []},
+    {"name": "campaign_repo.increment_accepted_count",
+     "call": lambda fx: campaign_repo.increment_accepted_count(fx["live_campaign"]), "indexes": []},
+    {"name": "campaign_repo.search_campaigns",
+     "call": lambda fx: campaign_repo.search_campaigns("project", "live", before_id=fx["mid_campaign_id"]),
+     "indexes": []},
+    {"name": "acceptance_repo.get_acceptances_for_kol",
+     "call": lambda fx: acceptance_repo.get_acceptances_for_kol(fx["busy_kol"]), "indexes": ["idx_acceptances_kol"]},
+    {"name": "acceptance_repo.get_accepted_submission",
+     "call": lambda fx: acceptance_repo.get_accepted_submission(fx["busy_kol"], fx["campaign"]), "indexes": []},
+    {"name": "acceptance_repo.update_acceptance_status",
+     "call": lambda fx: acceptance_repo.update_acceptance_status(fx["acceptance"], "submitted"), "indexes": []},
+
+    # --- customer-facing ---
+    {"name": "campaign_repo.get_campaigns_by_customer",
+     "call": lambda fx: campaign_repo.get_campaigns_by_customer(fx["customer"]), "indexes": ["idx_campaigns_customer"]},
+    {"name": "acceptance_repo.get_acceptances_for_campaign",
+     "call": lambda fx: acceptance_repo.get_acceptances_for_campaign(fx["campaign"]), "indexes": []},
+
+    # --- admin queues ---
+    {"name": "kol_repo.get_roster_page (admin)",
+     "call": lambda fx: kol_repo.get_roster_page("followers", False, (1000, fx["mid_kol_id"])),
+     "indexes": ["idx_kols_followers"]},
+    {"name": "campaign_repo.get_campaigns_by_status",
+     "call": lambda fx: campaign_repo.get_campaigns_by_status("live"), "indexes": [_CAMPAIGN_STATUS]},
+    {"name": "campaign_repo.get_campaigns_page",
+     "call": lambda fx: campaign_repo.get_campaigns_page("completed", fx["mid_campaign_id"]),
+     "indexes": ["idx_campaigns_status_id"]},
+    {"name": "acceptance_repo.get_pending_verifications",
+     "call": lambda fx: acceptance_repo.get_pending_verifications(), "indexes": [_ACCEPTANCE_STATUS]},
+    {"name": "acceptance_repo.get_pending_verifications_page",
+     "call": lambda fx: acceptance_repo.get_pending_verifications_page(None, fx["acceptance"]),
+     "indexes": ["idx_acceptances_status_id"]},
+    {"name": "acceptance_repo.get_unpaid_verified",
+     "call": lambda fx: acceptance_repo.get_unpaid_verified(), "indexes": [_ACCEPTANCE_STATUS]},
+    {"name": "acceptance_repo.get_unpaid_verified_page",
+     "call": lambda fx: acceptance_repo.get_unpaid_verified_page(fx["campaign"]), "indexes": []},
+    {"name": "acceptance_repo.bulk_update_submission_status",
+     "call": lambda fx: acceptance_repo.bulk_update_submission_status(fx["submitted_campaign"], "verified"),
+     "indexes": ["idx_acceptances_campaign_status"]},
+
+    # --- payouts ---
+    {"name": "acceptance_repo.mark_paid_bulk",
+     "call": lambda fx: acceptance_repo.mark_paid_bulk(fx["unpaid_ids"]), "indexes": []},
+    {"name": "acceptance_repo.mark_paid_for_wallet",
+     "call": lambda fx: acceptance_repo.mark_paid_for_wallet(fx["wallet"]), "indexes": []},
+    {"name": "payout_repo.create_payout_batch",
+     "call": lambda fx: payout_repo.create_payout_batch(), "indexes": [_ACCEPTANCE_STATUS, "idx_acceptances_payout_batch"]},
+
+    # --- jobs ---
+    {"name": "campaign_repo.get_upcoming_deadlines",
+     "call": lambda fx: campaign_repo.get_upcoming_deadlines(), "indexes": [_CAMPAIGN_STATUS]},
+    {"name": "campaign_repo.expire_due_campaigns",
+     "call": lambda fx: campaign_repo.expire_due_campaigns(_now()), "indexes": [_CAMPAIGN_STATUS]},
+    {"name": "acceptance_repo.get_recent_verified_with_tweets",
+     "call": lambda fx: acceptance_repo.get_recent_verified_with_tweets(),
+     "indexes": ["idx_acceptances_status_verified_at"]},
+    {"name": "alert_repo.get_alert_recipients",
+     "call": lambda fx: alert_repo.get_alert_recipients("retweet", fx["busy_kol"]),
+     "indexes": [("sqlite_autoindex_kol_alert_prefs_1", "kol_alert_prefs_pkey")]},
+]
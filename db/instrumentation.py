@@ -0,0 +1,215 @@
+"""Query-level instrumentation: per-template latency histograms and a slow-query log.
+
+Every connection handed out by ``db.connection.get_conn`` is wrapped so its
+cursors time each statement. Stats are keyed by the normalised SQL text
+(repo queries are already templates with placeholders) and attributed to the
+handler or job currently running, set via ``handler_scope``.
+"""
+import contextvars
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+from config import SLOW_QUERY_MS
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds (last bucket is +Inf)
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+current_handler = contextvars.ContextVar("db_current_handler", default="-")
+# When set to a list, executed statements are appended as (sql, params) (see capture_statements)
+_captured = contextvars.ContextVar("db_captured_statements", default=None)
+
+_lock = threading.Lock()
+_query_stats = {}  # template -> stats dict
+_handler_stats = {}  # handler label -> {"queries", "total_ms", "templates": {template: calls}}
+_query_listeners = []  # callables(template, elapsed_ms), e.g. per-update counters
+
+
+def add_query_listener(callback):
+    """Call ``callback(template, elapsed_ms)`` after every instrumented query."""
+    _query_listeners.append(callback)
+
+
+@contextmanager
+def handler_scope(label: str):
+    """Attribute queries run inside the block to *label*."""
+    token = current_handler.set(label)
+    try:
+        yield
+    finally:
+        current_handler.reset(token)
+
+
+@contextmanager
+def capture_statements():
+    """Collect the raw (sql, params) of every statement executed inside the block."""
+    statements = []
+    token = _captured.set(statements)
+    try:
+        yield statements
+    finally:
+        _captured.reset(token)
+
+
+@lru_cache(maxsize=1024)
+def normalize(sql: str) -> str:
+    """Collapse whitespace, numeric literals and placeholder lists so equivalent
+    statements share a template."""
+    sql = " ".join(sql.split())
+    sql = re.sub(r"(?<![\w.])\d+(?![\w.])", "N", sql)
+    return re.sub(r"\((?:\s*(?:\?|%s)\s*,)+\s*(?:\?|%s)\s*\)", "(...)", sql)
+
+
+def _record(template: str, elapsed_ms: float, rows: int):
+    handler = current_handler.get()
+    with _lock:
+        s = _query_stats.get(template)
+        if s is None:
+            s = _query_stats[template] = {
+                "calls": 0, "rows": 0, "total_ms": 0.0, "max_ms": 0.0,
+                "buckets": [0] * (len(BUCKETS_MS) + 1),
+            }
+        s["calls"] += 1
+        s["rows"] += rows
+        s["total_ms"] += elapsed_ms
+        s["max_ms"] = max(s["max_ms"], elapsed_ms)
+        for i, bound in enumerate(BUCKETS_MS):
+            if elapsed_ms <= bound:
+                s["buckets"][i] += 1
+                break
+        else:
+            s["buckets"][-1] += 1
+
+        h = _handler_stats.setdefault(handler, {"queries": 0, "total_ms": 0.0, "templates": {}})
+        h["queries"] += 1
+        h["total_ms"] += elapsed_ms
+        h["templates"][template] = h["templates"].get(template, 0) + 1
+
+    for callback in _query_listeners:
+        callback(template, elapsed_ms)
+
+    if elapsed_ms >= SLOW_QUERY_MS:
+        logger.warning("Slow query (%.0f ms, %d rows, handler=%s): %s", elapsed_ms, rows, handler, template)
+
+
+def _add_rows(template: str, rows: int):
+    if rows:
+        with _lock:
+            if template in _query_stats:
+                _query_stats[template]["rows"] += rows
+
+
+class InstrumentedCursor:
+    """Cursor proxy that times execute() calls and counts fetched/affected rows."""
+
+    def __init__(self, cursor):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_template", None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    def __iter__(self):
+        for row in self._cursor:
+            _add_rows(self._template, 1)
+            yield row
+
+    def _timed(self, method, sql, *args):
+        captured = _captured.get()
+        if captured is not None:
+            captured.append((sql, args[0] if args else None))
+        template = normalize(sql)
+        object.__setattr__(self, "_template", template)
+        started = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            # DML reports affected rows; SELECT rows are counted as they are fetched
+            affected = self._cursor.rowcount if self._cursor.description is None else 0
+            _record(template, elapsed_ms, max(affected or 0, 0))
+
+    def execute(self, sql, *args):
+        return self._timed(self._cursor.execute, sql, *args)
+
+    def executemany(self, sql, *args):
+        return self._timed(self._cursor.executemany, sql, *args)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            _add_rows(self._template, 1)
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._cursor.fetchmany(*args)
+        _add_rows(self._template, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        _add_rows(self._template, len(rows))
+        return rows
+
+
+class InstrumentedConnection:
+    """Connection proxy whose cursors (and sqlite's conn.execute) are instrumented."""
+
+    def __init__(self, conn):
+        object.__setattr__(self, "_conn", conn)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs))
+
+    def execute(self, sql, *args):
+        cur = InstrumentedCursor(self._conn.cursor())
+        cur.execute(sql, *args)
+        return cur
+
+
+def instrument(conn):
+    return InstrumentedConnection(conn)
+
+
+def get_query_stats() -> dict:
+    with _lock:
+        return {t: dict(s, buckets=list(s["buckets"])) for t, s in _query_stats.items()}
+
+
+def get_handler_stats() -> dict:
+    with _lock:
+        return {h: dict(s, templates=dict(s["templates"])) for h, s in _handler_stats.items()}
+
+
+def reset_stats():
+    with _lock:
+        _query_stats.clear()
+        _handler_stats.clear()
+
+
+def percentile_ms(buckets: list[int], q: float) -> float:
+    """Upper bucket bound containing the q-th quantile (approximate)."""
+    total = sum(buckets)
+    if not total:
+        return 0.0
+    target = q * total
+    seen = 0
+    for i, n in enumerate(buckets):
+        seen += n
+        if seen >= target:
+            return float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else float("inf")
+    return float("inf")
@@ -1,4 +1,35 @@
-from db.connection import get_conn, is_postgres, ph, dict_cursor
+import time
+
+from db.connection import get_conn, is_postgres, ph
+from db.rows import Kol, KolListing, columns, fetch_all, fetch_one
+
+# Roster sort modes: name -> sort column (descending, ties broken by id descending).
+# Keyset cursors are (sort value, id) of the last row shown; "newest" sorts on id alone.
+ROSTER_SORTS = {
+    "followers": "follower_count",
+    "reputation": "reputation_score",
+    "newest": None,
+}
+# Public roster: only active, verified KOLs
+_PUBLIC = "is_active = TRUE AND is_verified = TRUE"
+
+# Roster size per visibility, refreshed after COUNT_TTL seconds or on any KOL write
+COUNT_TTL = 60
+_counts = {}  # public: bool -> (count, expires_at)
+
+# Called with the telegram_id after every KOL write in this process (see services.kol_search)
+_listeners = []
+
+
+def add_listener(callback):
+    """Register *callback(telegram_id)* to run after each KOL insert or update."""
+    _listeners.append(callback)
+
+
+def _changed(telegram_id):
+    _counts.clear()
+    for callback in _listeners:
+        callback(telegram_id)
 
 
 def save_kol(telegram_id, telegram_handle, name, x_account, wallet_address):
@@ -37,16 +68,17 @@ def save_kol(telegram_id, telegram_handle, name, x_account, wallet_address):
 
     conn.commit()
     conn.close()
+    _changed(telegram_id)
 
 
-def get_kol(telegram_id):
+def get_kol(telegram_id) -> Kol | None:
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     p = ph()
-    cur.execute(f"SELECT * FROM kols WHERE telegram_id = {p}", (telegram_id,))
-    row = cur.fetchone()
+    cur.execute(f"SELECT {columns(Kol)} FROM kols WHERE telegram_id = {p}", (telegram_id,))
+    row = fetch_one(cur, Kol)
     conn.close()
-    return dict(row) if row else None
+    return row
 
 
 def update_kol_verification(telegram_id, x_user_id, follower_count, is_verified):
@@ -59,10 +91,11 @@ def update_kol_verification(telegram_id, x_user_id, follower_count, is_verified)
         SET x_user_id = {p}, follower_count = {p}, is_verified = {p}
         WHERE telegram_id = {p}
         """,
-        (x_user_id, follower_count, is_verified, telegram_id),
+        (x_user_id, follower_count or 0, is_verified, telegram_id),
     )
     conn.commit()
     conn.close()
+    _changed(telegram_id)
 
 
 def ban_kol(telegram_id):
@@ -76,12 +109,88 @@ def ban_kol(telegram_id):
     )
     conn.commit()
     conn.close()
+    _changed(telegram_id)
 
 
-def get_all_kols():
+def toggle_kol_active(telegram_id: int):
+    """Flip a KOL's is_active flag. Returns the new value, or None if no such KOL."""
     conn = get_conn()
-    cur = dict_cursor(conn)
-    cur.execute("SELECT * FROM kols ORDER BY registered_at DESC")
-    rows = cur.fetchall()
+    cur = conn.cursor()
+    p = ph()
+    cur.execute(f"SELECT is_active FROM kols WHERE telegram_id = {p}", (telegram_id,))
+    row = cur.fetchone()
+    if not row:
+        conn.close()
+        return None
+    new_val = not row[0]
+    cur.execute(
+        f"UPDATE kols SET is_active = {p} WHERE telegram_id = {p}",
+        (new_val, telegram_id),
+    )
+    conn.commit()
+    conn.close()
+    _changed(telegram_id)
+    return new_val
+
+
+def get_all_kols() -> list[Kol]:
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(f"SELECT {columns(Kol)} FROM kols ORDER BY registered_at DESC")
+    rows = fetch_all(cur, Kol)
+    conn.close()
+    return rows
+
+
+def get_roster_page(sort: str, public: bool, after: tuple | None = None, limit: int = 5) -> list[KolListing]:
+    """One page of the KOL roster, keyset-paginated.
+
+    *sort* is a ROSTER_SORTS key; *after* is roster_cursor() of the last row
+    of the previous page. *public* restricts to active, verified KOLs.
+    """
+    column = ROSTER_SORTS[sort]
+    p = ph()
+    where = [_PUBLIC] if public else []
+    vals = []
+    if column:
+        order = f"{column} DESC, id DESC"
+        if after:
+            where.append(f"({column}, id) < ({p}, {p})")
+            vals.extend(after)
+    else:
+        order = "id DESC"
+        if after:
+            where.append(f"id < {p}")
+            vals.append(after[-1])
+    sql = f"SELECT {columns(KolListing)} FROM kols"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {order} LIMIT {p}"
+    vals.append(limit)
+
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute(sql, tuple(vals))
+    rows = fetch_all(cur, KolListing)
+    conn.close()
+    return rows
+
+
+def roster_cursor(sort: str, kol: KolListing) -> tuple:
+    """Keyset cursor that continues a *sort* page after *kol*."""
+    column = ROSTER_SORTS[sort]
+    return (kol[column], kol.id) if column else (kol.id,)
+
+
+def count_roster(public: bool) -> int:
+    """Number of KOLs on the roster, cached for COUNT_TTL seconds."""
+    cached = _counts.get(public)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("SELECT COUNT(*) FROM kols" + (f" WHERE {_PUBLIC}" if public else ""))
+    count = cur.fetchone()[0]
     conn.close()
-    return [dict(r) for r in rows]
+    _counts[public] = (count, time.monotonic() + COUNT_TTL)
+    return count
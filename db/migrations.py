@@ -3,15 +3,18 @@
 Call run_migrations() at startup to ensure all tables exist and
 new columns are added to legacy tables.
 """
+import base64
+import binascii
 import logging
+import sqlite3
 
 from db.connection import get_conn, is_postgres
 
 logger = logging.getLogger(__name__)
 
 
-def _add_column_if_missing(cursor, table, column, col_type, pg=True):
-    """Add a column to *table* if it does not already exist."""
+def _add_column_if_missing(cursor, table, column, col_type, pg=True) -> bool:
+    """Add a column to *table* if it does not already exist. Returns True if added."""
     if pg:
         cursor.execute(
             f"SELECT 1 FROM information_schema.columns "
@@ -21,12 +24,31 @@ def _add_column_if_missing(cursor, table, column, col_type, pg=True):
         if not cursor.fetchone():
             cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
             logger.info("Added column %s.%s", table, column)
+            return True
     else:
         cursor.execute(f"PRAGMA table_info({table})")
         cols = [row[1] for row in cursor.fetchall()]
         if column not in cols:
             cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
             logger.info("Added column %s.%s", table, column)
+            return True
+    return False
+
+
+# Telegram file_id type byte -> campaigns.media_kind (animations are sent as documents)
+_FILE_ID_KINDS = {2: "photo", 4: "video", 5: "document", 10: "document"}
+
+
+def _media_kind_from_file_id(file_id: str) -> str | None:
+    """Media kind encoded in a Bot API file_id, or None if it cannot be read.
+
+    A file_id is URL-safe base64 whose first byte is Telegram's file type.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(file_id + "=" * (-len(file_id) % 4))
+    except (ValueError, binascii.Error):
+        return None
+    return _FILE_ID_KINDS.get(raw[0]) if raw else None
 
 
 def run_migrations():
@@ -88,6 +110,12 @@ def run_migrations():
     _add_column_if_missing(cur, "kols", "reputation_score", "REAL DEFAULT 100.0", pg)
     _add_column_if_missing(cur, "customers", "wallet_address", "TEXT", pg)
 
+    # ---- roster sort/filter columns must be non-NULL for keyset pagination ----
+    cur.execute("UPDATE kols SET follower_count = 0 WHERE follower_count IS NULL")
+    cur.execute("UPDATE kols SET reputation_score = 100.0 WHERE reputation_score IS NULL")
+    cur.execute("UPDATE kols SET is_verified = FALSE WHERE is_verified IS NULL")
+    cur.execute("UPDATE kols SET is_active = TRUE WHERE is_active IS NULL")
+
     # ---- campaigns table ----
     if pg:
         cur.execute("""
@@ -142,6 +170,20 @@ def run_migrations():
             )
         """)
 
+    # ---- per-campaign acceptance counters (maintained on every status change) ----
+    counters_added = False
+    for col in ("submitted_count", "verified_count", "rejected_count", "paid_count"):
+        counters_added |= _add_column_if_missing(cur, "campaigns", col, "INTEGER DEFAULT 0", pg)
+
+    # ---- media kind, so media is sent with the right method (see handlers.common.send_campaign_media) ----
+    _add_column_if_missing(cur, "campaigns", "media_kind", "TEXT", pg)
+    cur.execute("SELECT id, media_file_id FROM campaigns WHERE media_file_id IS NOT NULL AND media_kind IS NULL")
+    kinds = [(kind, cid) for cid, file_id in cur.fetchall() if (kind := _media_kind_from_file_id(file_id))]
+    if kinds:
+        p = "%s" if pg else "?"
+        cur.executemany(f"UPDATE campaigns SET media_kind = {p} WHERE id = {p}", kinds)
+        logger.info("Backfilled media_kind for %d campaign(s)", len(kinds))
+
     # ---- campaign_acceptances table ----
     if pg:
         cur.execute("""
@@ -177,6 +219,149 @@ def run_migrations():
     # ---- new columns on campaign_acceptances ----
     _add_column_if_missing(cur, "campaign_acceptances", "payout_status", "TEXT DEFAULT 'unpaid'", pg)
     _add_column_if_missing(cur, "campaign_acceptances", "paid_at", "TIMESTAMP", pg)
+    _add_column_if_missing(cur, "campaign_acceptances", "payout_tx_hash", "TEXT", pg)
+    _add_column_if_missing(cur, "campaign_acceptances", "payout_batch_id", "INTEGER", pg)
+
+    # ---- payout_batches table (wallet-grouped multisend payouts) ----
+    if pg:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS payout_batches (
+                id SERIAL PRIMARY KEY,
+                status TEXT NOT NULL DEFAULT 'open',
+                acceptance_count INTEGER NOT NULL DEFAULT 0,
+                wallet_count INTEGER NOT NULL DEFAULT 0,
+                total_cents INTEGER NOT NULL DEFAULT 0,
+                tx_hash TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                paid_at TIMESTAMP
+            )
+        """)
+    else:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS payout_batches (
+                id INTEGER PRIMARY KEY,
+                status TEXT NOT NULL DEFAULT 'open',
+                acceptance_count INTEGER NOT NULL DEFAULT 0,
+                wallet_count INTEGER NOT NULL DEFAULT 0,
+                total_cents INTEGER NOT NULL DEFAULT 0,
+                tx_hash TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                paid_at TIMESTAMP
+            )
+        """)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_acceptances_payout_batch "
+        "ON campaign_acceptances (payout_batch_id)"
+    )
+
+    # ---- indexes for paginated admin queues ----
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_campaigns_status_id ON campaigns (status, id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_campaigns_status_deadline ON campaigns (status, deadline)")
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_acceptances_status_id "
+        "ON campaign_acceptances (status, id)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_acceptances_campaign_status "
+        "ON campaign_acceptances (campaign_id, status)"
+    )
+
+    # ---- indexes for hot queries (see db/hot_queries.py) ----
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_acceptances_kol "
+        "ON campaign_acceptances (kol_telegram_id, accepted_at)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_acceptances_status_verified_at "
+        "ON campaign_acceptances (status, verified_at)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_campaigns_customer "
+        "ON campaigns (customer_telegram_id, created_at)"
+    )
+
+    # ---- indexes for the /kols roster (see kol_repo.get_roster_page) ----
+    for name, cols in (
+        ("idx_kols_public_followers", "is_active, is_verified, follower_count, id"),
+        ("idx_kols_public_reputation", "is_active, is_verified, reputation_score, id"),
+        ("idx_kols_public_newest", "is_active, is_verified, id"),
+        ("idx_kols_followers", "follower_count, id"),
+        ("idx_kols_reputation", "reputation_score, id"),
+    ):
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON kols ({cols})")
+
+    # ---- full-text search over the campaign brief (see campaign_repo.search_campaigns) ----
+    search_added = False
+    if pg:
+        search_added = _add_column_if_missing(cur, "campaigns", "search_vector", "tsvector", pg)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_campaigns_search ON campaigns USING GIN (search_vector)")
+    else:
+        cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'campaigns_fts'")
+        if not cur.fetchone():
+            try:
+                cur.execute(
+                    "CREATE VIRTUAL TABLE campaigns_fts USING fts5("
+                    "project_name, talking_points, hashtags, mentions, "
+                    "content='campaigns', content_rowid='id')"
+                )
+                search_added = True
+            except sqlite3.OperationalError as e:
+                logger.warning("SQLite FTS5 unavailable (%s); campaign search will use LIKE", e)
+
+    # ---- export_state table (incremental CSV export markers) ----
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS export_state (
+            table_name TEXT PRIMARY KEY,
+            last_id INTEGER NOT NULL,
+            exported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # ---- leader_lease table (scheduler leader election on SQLite) ----
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS leader_lease (
+            name TEXT PRIMARY KEY,
+            holder TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+    """)
+
+    # ---- telegram_assets table (file_ids of uploaded static images, see services/assets.py) ----
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS telegram_assets (
+            name TEXT PRIMARY KEY,
+            file_id TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            bot_id BIGINT NOT NULL,
+            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # ---- new-campaign DM alerts (see services/campaign_alerts.py) ----
+    # One row per KOL and service type they want alerts for; the key serves
+    # the keyset walk over a service type's subscribers.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS kol_alert_prefs (
+            service_type TEXT NOT NULL,
+            kol_telegram_id BIGINT NOT NULL,
+            PRIMARY KEY (service_type, kol_telegram_id)
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_kol_alert_prefs_kol ON kol_alert_prefs (kol_telegram_id)")
+    # Progress of each campaign's alert fan-out, so a restart resumes it
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS campaign_broadcasts (
+            campaign_id INTEGER PRIMARY KEY,
+            service_type TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'running',
+            last_kol_telegram_id BIGINT NOT NULL DEFAULT 0,
+            sent_count INTEGER NOT NULL DEFAULT 0,
+            failed_count INTEGER NOT NULL DEFAULT 0,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_campaign_broadcasts_status ON campaign_broadcasts (status)")
 
     # ---- service_tiers table (admin-editable pricing) ----
     cur.execute("""
@@ -209,4 +394,13 @@ def run_migrations():
 
     conn.commit()
     conn.close()
+
+    if counters_added:
+        from db.campaign_repo import reconcile_campaign_counters
+        logger.info("Backfilled counters for %d campaign(s)", reconcile_campaign_counters())
+    if search_added:
+        from db.campaign_repo import rebuild_search_index
+        rebuild_search_index()
+        logger.info("Built the campaign search index")
+
     logger.info("Database migrations complete.")
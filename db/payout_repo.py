@@ -0,0 +1,134 @@
+"""Payout batches — unpaid verified work aggregated per KOL wallet for multisend."""
+from datetime import datetime
+
+from db.connection import get_conn, is_postgres, ph, begin_write
+from db.acceptance_repo import mark_paid_in_transaction
+from db.rows import PayoutBatch, columns, fetch_one
+
+
+def _batch_entries(cur, batch_id: int) -> list[dict]:
+    p = ph()
+    cur.execute(
+        f"""
+        SELECT k.wallet_address, COUNT(*) AS acceptance_count, SUM(c.per_kol_rate) AS amount_cents
+        FROM campaign_acceptances ca
+        JOIN kols k ON k.telegram_id = ca.kol_telegram_id
+        JOIN campaigns c ON c.id = ca.campaign_id
+        WHERE ca.payout_batch_id = {p}
+        GROUP BY k.wallet_address
+        ORDER BY k.wallet_address
+        """,
+        (batch_id,),
+    )
+    return [
+        {"wallet_address": r[0], "acceptance_count": r[1], "amount_cents": r[2]}
+        for r in cur.fetchall()
+    ]
+
+
+def create_payout_batch() -> dict | None:
+    """Claim every unbatched, unpaid verified acceptance into a new batch.
+
+    Acceptances whose KOL has no wallet on file are left out. Returns
+    ``{"id", "entries", "acceptance_count", "total_cents"}`` where entries are
+    per-wallet totals, or None if there was nothing to batch.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    try:
+        begin_write(conn, cur)
+        if is_postgres():
+            cur.execute("INSERT INTO payout_batches (status) VALUES ('open') RETURNING id")
+            batch_id = cur.fetchone()[0]
+        else:
+            cur.execute("INSERT INTO payout_batches (status) VALUES ('open')")
+            batch_id = cur.lastrowid
+
+        cur.execute(
+            f"""
+            UPDATE campaign_acceptances SET payout_batch_id = {p}
+            WHERE status = 'verified'
+              AND (payout_status IS NULL OR payout_status = 'unpaid')
+              AND payout_batch_id IS NULL
+              AND EXISTS (
+                  SELECT 1 FROM kols k
+                  WHERE k.telegram_id = campaign_acceptances.kol_telegram_id
+                    AND k.wallet_address IS NOT NULL AND k.wallet_address != ''
+              )
+            """,
+            (batch_id,),
+        )
+        if cur.rowcount == 0:
+            conn.rollback()
+            return None
+
+        entries = _batch_entries(cur, batch_id)
+        acceptance_count = sum(e["acceptance_count"] for e in entries)
+        total_cents = sum(e["amount_cents"] for e in entries)
+        cur.execute(
+            f"UPDATE payout_batches SET acceptance_count = {p}, wallet_count = {p}, total_cents = {p} "
+            f"WHERE id = {p}",
+            (acceptance_count, len(entries), total_cents, batch_id),
+        )
+        conn.commit()
+        return {
+            "id": batch_id,
+            "entries": entries,
+            "acceptance_count": acceptance_count,
+            "total_cents": total_cents,
+        }
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def get_payout_batch(batch_id: int) -> PayoutBatch | None:
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    cur.execute(f"SELECT {columns(PayoutBatch)} FROM payout_batches WHERE id = {p}", (batch_id,))
+    row = fetch_one(cur, PayoutBatch)
+    conn.close()
+    return row
+
+
+def get_payout_batch_entries(batch_id: int) -> list[dict]:
+    """Per-wallet totals for a batch."""
+    conn = get_conn()
+    cur = conn.cursor()
+    entries = _batch_entries(cur, batch_id)
+    conn.close()
+    return entries
+
+
+def mark_batch_paid(batch_id: int, tx_hash: str = None) -> list[dict] | None:
+    """Mark a batch and all of its still-unpaid acceptances paid in one transaction.
+
+    Returns the acceptance rows that were paid, or None if the batch does
+    not exist or is not open.
+    """
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    try:
+        begin_write(conn, cur)
+        cur.execute(f"SELECT status FROM payout_batches WHERE id = {p}", (batch_id,))
+        row = cur.fetchone()
+        if not row or row[0] != "open":
+            conn.rollback()
+            return None
+        rows = mark_paid_in_transaction(cur, f"ca.payout_batch_id = {p}", (batch_id,), None, tx_hash)
+        cur.execute(
+            f"UPDATE payout_batches SET status = 'paid', paid_at = {p}, tx_hash = {p} WHERE id = {p}",
+            (datetime.utcnow().isoformat(), tx_hash, batch_id),
+        )
+        conn.commit()
+        return rows
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
@@ -0,0 +1,273 @@
+"""Compact row objects returned by the repos.
+
+Each class is a slotted dataclass whose fields are exactly the columns its
+queries select, in order, so a fetched tuple becomes a row with ``cls(*r)``
+and no per-row dict. Rows support attribute access (``kol.name``) and,
+for the existing callers, the read side of a mapping: ``row["name"]``,
+``row.get("name", default)``, ``"name" in row`` and ``dict(row)``. Unlike a
+dict, ``get`` of a name that is not one of the row's columns raises
+KeyError, so a projection missing a column a caller reads fails loudly
+instead of reading as the default.
+Select a class's columns with ``columns(cls, alias)`` and build rows with
+``fetch_one`` / ``fetch_all``.
+"""
+from dataclasses import dataclass, fields
+from datetime import datetime
+from itertools import starmap
+
+# SQLite hands timestamps back as ISO strings, Postgres as datetimes
+Timestamp = datetime | str
+
+
+class Row:
+    """Read-only mapping protocol over a dataclass's fields."""
+
+    __slots__ = ()
+    COLUMNS: tuple = ()
+    _FIELDS: frozenset = frozenset()
+
+    def __getitem__(self, key):
+        if key not in self._FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        """Like dict.get, except that *default* never applies: every column is set."""
+        if key not in self._FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self._FIELDS
+
+    def keys(self):
+        return self.COLUMNS
+
+    def __iter__(self):
+        return iter(self.COLUMNS)
+
+    def __len__(self):
+        return len(self.COLUMNS)
+
+
+def row(cls):
+    """Class decorator: slotted dataclass with its column list recorded."""
+    cls = dataclass(slots=True)(cls)
+    cls.COLUMNS = tuple(f.name for f in fields(cls))
+    cls._FIELDS = frozenset(cls.COLUMNS)
+    return cls
+
+
+def columns(cls, alias: str | None = None) -> str:
+    """SELECT list for *cls*, optionally qualified with a table alias."""
+    if alias:
+        return ", ".join(f"{alias}.{c}" for c in cls.COLUMNS)
+    return ", ".join(cls.COLUMNS)
+
+
+def fetch_one(cur, cls):
+    r = cur.fetchone()
+    return cls(*r) if r else None
+
+
+def fetch_all(cur, cls) -> list:
+    return list(starmap(cls, cur.fetchall()))
+
+
+# ---------------------------------------------------------------------------
+# kols / customers
+# ---------------------------------------------------------------------------
+
+@row
+class Kol(Row):
+    id: int
+    telegram_id: int
+    telegram_handle: str | None
+    name: str | None
+    x_account: str | None
+    wallet_address: str | None
+    registered_at: Timestamp | None
+    x_user_id: str | None
+    follower_count: int | None
+    is_verified: bool | None
+    is_active: bool | None
+    reputation_score: float | None
+
+
+@row
+class KolListing(Row):
+    """What the /kols roster pages show, plus the keys they are sorted on."""
+    id: int
+    telegram_id: int
+    name: str | None
+    x_account: str | None
+    follower_count: int | None
+    reputation_score: float | None
+    is_verified: bool | None
+    is_active: bool | None
+
+
+@row
+class Customer(Row):
+    id: int
+    telegram_id: int
+    telegram_handle: str | None
+    name: str | None
+    project_x_account: str | None
+    registered_at: Timestamp | None
+    wallet_address: str | None
+
+
+# ---------------------------------------------------------------------------
+# campaigns
+# ---------------------------------------------------------------------------
+
+@row
+class CampaignSummary(Row):
+    """Campaign without its brief (talking points, hashtags, media...)."""
+    id: int
+    customer_telegram_id: int | None
+    project_name: str
+    service_type: str
+    target_url: str | None
+    kol_count: int
+    per_kol_rate: int
+    platform_fee: int
+    total_cost: int
+    deadline: Timestamp
+    status: str
+    accepted_count: int | None
+    submitted_count: int | None
+    verified_count: int | None
+    rejected_count: int | None
+    paid_count: int | None
+    created_at: Timestamp | None
+
+
+@row
+class Campaign(CampaignSummary):
+    talking_points: str | None
+    hashtags: str | None
+    mentions: str | None
+    reference_tweet_url: str | None
+    media_file_id: str | None
+    media_kind: str | None
+    announcement_message_id: str | None
+    activated_at: Timestamp | None
+    completed_at: Timestamp | None
+
+
+# ---------------------------------------------------------------------------
+# campaign_acceptances
+# ---------------------------------------------------------------------------
+
+@row
+class Acceptance(Row):
+    id: int
+    campaign_id: int
+    kol_telegram_id: int
+    status: str
+    submission_tweet_url: str | None
+    verification_result: str | None
+    accepted_at: Timestamp | None
+    submitted_at: Timestamp | None
+    verified_at: Timestamp | None
+    payout_status: str | None
+    paid_at: Timestamp | None
+    payout_tx_hash: str | None
+    payout_batch_id: int | None
+
+
+@row
+class AcceptanceWithKol(Acceptance):
+    kol_name: str | None
+    x_account: str | None
+
+
+@row
+class AcceptanceForReview(AcceptanceWithKol):
+    project_name: str
+    service_type: str
+
+
+@row
+class UnpaidAcceptance(AcceptanceForReview):
+    kol_wallet: str | None
+    per_kol_rate: int
+
+
+@row
+class AcceptanceForKol(Acceptance):
+    """A KOL's acceptance with the campaign brief they work from."""
+    project_name: str
+    service_type: str
+    deadline: Timestamp
+    campaign_status: str
+    target_url: str | None
+    talking_points: str | None
+    hashtags: str | None
+    mentions: str | None
+    media_file_id: str | None
+    media_kind: str | None
+
+
+@row
+class VerifiedTweet(Row):
+    """A verified submission as the integrity sweep re-checks it."""
+    id: int
+    campaign_id: int
+    kol_telegram_id: int
+    status: str
+    submission_tweet_url: str
+    payout_status: str | None
+    verified_at: Timestamp | None
+    kol_name: str | None
+    x_account: str | None
+    project_name: str
+
+
+# ---------------------------------------------------------------------------
+# service_tiers / payout_batches / telegram_assets / campaign_broadcasts
+# ---------------------------------------------------------------------------
+
+@row
+class ServiceTier(Row):
+    key: str
+    display_name: str
+    per_kol_rate: int
+    min_kols: int
+    max_kols: int
+    is_active: bool | None
+
+
+@row
+class PayoutBatch(Row):
+    id: int
+    status: str
+    acceptance_count: int
+    wallet_count: int
+    total_cents: int
+    tx_hash: str | None
+    created_at: Timestamp | None
+    paid_at: Timestamp | None
+
+
+@row
+class TelegramAsset(Row):
+    name: str
+    file_id: str
+    content_hash: str
+    bot_id: int
+    uploaded_at: Timestamp | None
+
+
+@row
+class CampaignBroadcast(Row):
+    campaign_id: int
+    service_type: str
+    status: str
+    last_kol_telegram_id: int
+    sent_count: int
+    failed_count: int
+    started_at: Timestamp | None
+    finished_at: Timestamp | None
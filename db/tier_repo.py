@@ -1,5 +1,6 @@
 """Service tier CRUD — pricing stored in DB, editable by admins at runtime."""
-from db.connection import get_conn, ph, dict_cursor, is_postgres
+from db.connection import get_conn, ph, is_postgres
+from db.rows import ServiceTier, columns, fetch_one
 
 
 def get_all_tiers() -> dict:
@@ -8,26 +9,25 @@ def get_all_tiers() -> dict:
     Returns: {key: (display_name, per_kol_rate, min_kols, max_kols), ...}
     """
     conn = get_conn()
-    cur = dict_cursor(conn)
-    cur.execute("SELECT * FROM service_tiers WHERE is_active = TRUE ORDER BY per_kol_rate")
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT key, display_name, per_kol_rate, min_kols, max_kols "
+        "FROM service_tiers WHERE is_active = TRUE ORDER BY per_kol_rate"
+    )
     rows = cur.fetchall()
     conn.close()
-    result = {}
-    for r in rows:
-        d = dict(r)
-        result[d["key"]] = (d["display_name"], d["per_kol_rate"], d["min_kols"], d["max_kols"])
-    return result
+    return {r[0]: (r[1], r[2], r[3], r[4]) for r in rows}
 
 
-def get_tier(key: str):
-    """Return a single tier as a raw dict, or None."""
+def get_tier(key: str) -> ServiceTier | None:
+    """Return a single tier row, or None."""
     conn = get_conn()
-    cur = dict_cursor(conn)
+    cur = conn.cursor()
     p = ph()
-    cur.execute(f"SELECT * FROM service_tiers WHERE key = {p}", (key,))
-    row = cur.fetchone()
+    cur.execute(f"SELECT {columns(ServiceTier)} FROM service_tiers WHERE key = {p}", (key,))
+    row = fetch_one(cur, ServiceTier)
     conn.close()
-    return dict(row) if row else None
+    return row
 
 
 def update_tier(key: str, per_kol_rate: int = None, min_kols: int = None, max_kols: int = None):
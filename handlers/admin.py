@@ -1,45 +1,90 @@
-"""Admin panel — /admin, payment confirmation, manual verification, /export, /bulkverify."""
+"""Admin panel — /admin, payment confirmation, manual verification, /export, /bulkverify, /markpaid."""
 import asyncio
+import csv
 import io
 import logging
+import os
+import time
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
-from telegram.ext import CallbackQueryHandler, CommandHandler, ContextTypes
+from telegram.error import BadRequest
+from telegram.ext import CallbackQueryHandler, CommandHandler, ContextTypes, MessageHandler, filters
 
-from db.campaign_repo import get_campaign, get_campaigns_by_status, get_all_campaigns
-from db.acceptance_repo import get_pending_verifications, get_acceptances_for_campaign, get_unpaid_verified, mark_paid, get_acceptance_by_id
-from db.kol_repo import get_all_kols, update_kol_verification
+from config import (
+    CAMPAIGN_STATUSES, LOOP_LAG_THRESHOLD_MS, SESSION_MAX_USERS, SESSION_TTL_SECONDS, SLOW_QUERY_MS,
+)
+from db.campaign_repo import get_campaign, get_campaigns_page
+from db.acceptance_repo import (
+    get_pending_verifications_page,
+    get_unpaid_verified_page,
+    mark_paid,
+    get_batched_unpaid_ids,
+    mark_paid_bulk,
+    mark_paid_for_wallet,
+    get_acceptance_by_id,
+)
+from db.kol_repo import get_all_kols, get_kol, update_kol_verification
+from db.payout_repo import create_payout_batch, get_payout_batch, mark_batch_paid
+from db.export_repo import get_export_marker, set_export_marker
+from db import instrumentation
 from handlers.common import (
     is_admin,
     require_admin,
     format_cents,
     format_service_type,
     format_campaign_summary,
-    export_csv_data,
 )
 from services.campaign_service import activate_campaign, cancel_campaign
 from services.announcement_service import announce_campaign
-from services.verification_service import manually_verify, manually_reject
+from services import campaign_alerts, deadline_scheduler, leader, loop_watchdog, profiler, sessions
+from services.verification_service import (
+    manually_verify,
+    manually_reject,
+    manually_verify_campaign,
+    manually_reject_campaign,
+)
+from services.payout_service import notify_kols_paid, build_batch_file
 from services.integrity_service import run_integrity_check
+from services.export_service import EXPORT_TABLES, export_table
 from services import x_api
 
 logger = logging.getLogger(__name__)
 
+QUEUE_PAGE_SIZE = 5
+OVERVIEW_PAGE_SIZE = 8
+
+# Old panel buttons (still present in chat history) → new view tokens
+_LEGACY_VIEWS = {
+    "adm:pending": ["pq", "0"],
+    "adm:payouts": ["po", "0", "0"],
+    "adm:overview": ["ov", "all", "0"],
+    "adm:verify": ["vq", "0", "0"],
+}
+
+
+def _panel_keyboard():
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("Pending Payments", callback_data="adm:pq:0")],
+        [InlineKeyboardButton("Pending Payouts", callback_data="adm:po:0:0")],
+        [InlineKeyboardButton("Campaign Overview", callback_data="adm:ov:all:0")],
+        [InlineKeyboardButton("Manual Verifications", callback_data="adm:vq:0:0")],
+    ])
+
 
 @require_admin
 async def admin_panel(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show admin panel with action buttons."""
-    keyboard = InlineKeyboardMarkup([
-        [InlineKeyboardButton("Pending Payments", callback_data="adm:pending")],
-        [InlineKeyboardButton("Pending Payouts", callback_data="adm:payouts")],
-        [InlineKeyboardButton("Campaign Overview", callback_data="adm:overview")],
-        [InlineKeyboardButton("Manual Verifications", callback_data="adm:verify")],
-    ])
-    await update.message.reply_text("Admin Panel", reply_markup=keyboard)
+    await update.message.reply_text("Admin Panel", reply_markup=_panel_keyboard())
 
 
 async def admin_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle admin panel button presses."""
+    """Handle admin panel button presses.
+
+    Queue views are rendered into the panel message itself and re-rendered
+    in place after every action, so each click costs one page query and one
+    Bot API edit regardless of backlog size. Action buttons carry the view
+    they were pressed from as a trailing suffix (e.g. ``adm:v_approve:7:vq:0:0``).
+    """
     query = update.callback_query
     user = query.from_user
     if not is_admin(user):
@@ -48,48 +93,76 @@ async def admin_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.answer()
 
     action = query.data
+    if action in _LEGACY_VIEWS:
+        await _render_view(query, _LEGACY_VIEWS[action])
+        return
 
-    if action == "adm:pending":
-        await _show_pending_payments(query, context)
+    parts = action.split(":")
+    kind = parts[1]
 
-    elif action == "adm:payouts":
-        await _show_pending_payouts(query, context)
+    if kind in ("panel", "pq", "ov", "vq", "po"):
+        await _render_view(query, parts[1:])
 
-    elif action == "adm:overview":
-        await _show_overview(query)
+    elif kind == "pay":
+        await _confirm_payment(query, context, int(parts[2]), parts[3:])
 
-    elif action == "adm:verify":
-        await _show_pending_verifications(query, context)
+    elif kind == "mark_paid":
+        await _mark_kol_paid(query, context, int(parts[2]), parts[3:])
 
-    elif action.startswith("adm:pay:"):
-        campaign_id = int(action.split(":")[2])
-        await _confirm_payment(query, context, campaign_id)
+    elif kind == "v_approve":
+        await _approve_verification(query, context, int(parts[2]), parts[3:])
 
-    elif action.startswith("adm:mark_paid:"):
-        acceptance_id = int(action.split(":")[2])
-        await _mark_kol_paid(query, context, acceptance_id)
+    elif kind == "v_reject":
+        await _reject_verification(query, context, int(parts[2]), parts[3:])
 
-    elif action.startswith("adm:v_approve:"):
-        acceptance_id = int(action.split(":")[2])
-        await _approve_verification(query, context, acceptance_id)
+    elif kind == "cancel":
+        await _cancel_campaign(query, context, int(parts[2]), parts[3:])
 
-    elif action.startswith("adm:v_reject:"):
-        acceptance_id = int(action.split(":")[2])
-        await _reject_verification(query, context, acceptance_id)
+    elif kind == "batch_new":
+        await _create_batch(query, context)
 
-    elif action.startswith("adm:cancel:"):
-        campaign_id = int(action.split(":")[2])
-        await _cancel_campaign(query, context, campaign_id)
+    elif kind == "batch_paid":
+        await _pay_batch(query, context, int(parts[2]))
 
+    elif kind == "bulk":
+        await _confirm_bulk(query, parts[2], int(parts[3]), parts[4:])
 
-async def _show_pending_payments(query, context):
-    campaigns = get_campaigns_by_status("pending_payment")
-    if not campaigns:
-        await query.edit_message_text("No campaigns pending payment.")
-        return
+    elif kind == "bulk_ok":
+        await _run_bulk(query, context, parts[2], int(parts[3]), parts[4:])
+
+
+# ---------------------------------------------------------------------------
+# Paginated views
+# ---------------------------------------------------------------------------
 
-    for c in campaigns:
-        text = (
+def _take_page(rows, size):
+    """Split a LIMIT size+1 result into (page, has_more)."""
+    return rows[:size], len(rows) > size
+
+
+def _nav_row(prefix: str, cursor: int, next_cursor: int | None):
+    row = []
+    if cursor:
+        row.append(InlineKeyboardButton("« First", callback_data=f"{prefix}:0"))
+    if next_cursor:
+        row.append(InlineKeyboardButton("Next »", callback_data=f"{prefix}:{next_cursor}"))
+    return row
+
+
+def _pending_payments_view(cursor: int):
+    rows, has_more = _take_page(
+        get_campaigns_page("pending_payment", before_id=cursor, limit=QUEUE_PAGE_SIZE + 1),
+        QUEUE_PAGE_SIZE,
+    )
+    view = f"pq:{cursor}"
+    if not rows:
+        lines = ["No campaigns pending payment."]
+    else:
+        lines = ["Pending Payments\n─────────────────"]
+    buttons = []
+    for c in rows:
+        lines.append("")
+        lines.append(
             f"Campaign #{c['id']}: {c['project_name']}\n"
             f"Service: {format_service_type(c['service_type'])}\n"
             f"KOLs: {c['kol_count']}\n"
@@ -97,90 +170,196 @@ async def _show_pending_payments(query, context):
             f"Created: {str(c['created_at'])[:16]}\n"
             f"Customer ID: {c['customer_telegram_id']}"
         )
-        keyboard = InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton("Confirm Payment", callback_data=f"adm:pay:{c['id']}"),
-                InlineKeyboardButton("Cancel", callback_data=f"adm:cancel:{c['id']}"),
-            ]
+        buttons.append([
+            InlineKeyboardButton(f"Confirm #{c['id']}", callback_data=f"adm:pay:{c['id']}:{view}"),
+            InlineKeyboardButton(f"Cancel #{c['id']}", callback_data=f"adm:cancel:{c['id']}:{view}"),
         ])
-        await query.message.reply_text(text, reply_markup=keyboard)
-
-    await query.edit_message_text(f"Found {len(campaigns)} campaign(s) pending payment (shown above).")
+    nav = _nav_row("adm:pq", cursor, rows[-1]["id"] if has_more else None)
+    if nav:
+        buttons.append(nav)
+    return "\n".join(lines), buttons
 
 
-async def _show_overview(query):
-    campaigns = get_all_campaigns()
-    if not campaigns:
-        await query.edit_message_text("No campaigns yet.")
-        return
-
-    lines = [f"All Campaigns ({len(campaigns)} total)\n─────────────────"]
-    for c in campaigns:
+def _overview_view(status: str, cursor: int):
+    rows, has_more = _take_page(
+        get_campaigns_page(None if status == "all" else status, before_id=cursor, limit=OVERVIEW_PAGE_SIZE + 1),
+        OVERVIEW_PAGE_SIZE,
+    )
+    label = "All Campaigns" if status == "all" else f"Campaigns — {status}"
+    lines = [f"{label}\n─────────────────"]
+    if not rows:
+        lines.append("\nNo campaigns.")
+    for c in rows:
         lines.append("")
         lines.append(format_campaign_summary(c))
 
-    text = "\n".join(lines)
-    if len(text) > 4000:
-        text = text[:3950] + "\n\n... (truncated)"
-    await query.edit_message_text(text)
-
+    status_filters = ["all"] + CAMPAIGN_STATUSES
+    filter_buttons = [
+        InlineKeyboardButton(
+            f"• {f}" if f == status else f,
+            callback_data=f"adm:ov:{f}:0",
+        )
+        for f in status_filters
+    ]
+    buttons = [filter_buttons[i:i + 3] for i in range(0, len(filter_buttons), 3)]
+    nav = _nav_row(f"adm:ov:{status}", cursor, rows[-1]["id"] if has_more else None)
+    if nav:
+        buttons.append(nav)
+    return "\n".join(lines), buttons
+
+
+def _campaign_filter_row(prefix: str, campaign_id: int, rows):
+    """Buttons to narrow a queue to one of the campaigns on this page, or widen back to all."""
+    if campaign_id:
+        return [InlineKeyboardButton("All campaigns", callback_data=f"{prefix}:0:0")]
+    seen = []
+    for r in rows:
+        if r["campaign_id"] not in seen:
+            seen.append(r["campaign_id"])
+    return [
+        InlineKeyboardButton(f"Only #{cid}", callback_data=f"{prefix}:{cid}:0")
+        for cid in seen[:4]
+    ]
 
-async def _show_pending_verifications(query, context):
-    subs = get_pending_verifications()
-    if not subs:
-        await query.edit_message_text("No submissions pending manual review.")
-        return
 
-    for s in subs:
-        text = (
+def _verifications_view(campaign_id: int, cursor: int):
+    rows, has_more = _take_page(
+        get_pending_verifications_page(campaign_id, after_id=cursor, limit=QUEUE_PAGE_SIZE + 1),
+        QUEUE_PAGE_SIZE,
+    )
+    view = f"vq:{campaign_id}:{cursor}"
+    scope = f" — Campaign #{campaign_id}" if campaign_id else ""
+    if not rows:
+        lines = [f"No submissions pending manual review{scope}."]
+    else:
+        lines = [f"Manual Verifications{scope}\n─────────────────"]
+    buttons = []
+    for s in rows:
+        lines.append("")
+        lines.append(
             f"Submission #{s['id']}\n"
             f"Campaign #{s['campaign_id']}: {s['project_name']}\n"
             f"KOL: {s['kol_name']} (@{s['x_account']})\n"
             f"Service: {format_service_type(s['service_type'])}\n"
-            f"Tweet: {s.get('submission_tweet_url', 'N/A')}\n"
-            f"Submitted: {str(s.get('submitted_at', ''))[:16]}"
+            f"Tweet: {s.get('submission_tweet_url') or 'N/A'}\n"
+            f"Submitted: {str(s.get('submitted_at') or '')[:16]}"
         )
-        keyboard = InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton("Approve", callback_data=f"adm:v_approve:{s['id']}"),
-                InlineKeyboardButton("Reject", callback_data=f"adm:v_reject:{s['id']}"),
-            ]
+        buttons.append([
+            InlineKeyboardButton(f"Approve #{s['id']}", callback_data=f"adm:v_approve:{s['id']}:{view}"),
+            InlineKeyboardButton(f"Reject #{s['id']}", callback_data=f"adm:v_reject:{s['id']}:{view}"),
         ])
-        await query.message.reply_text(text, reply_markup=keyboard)
-
-    await query.edit_message_text(f"Found {len(subs)} submission(s) pending review (shown above).")
-
-
-async def _show_pending_payouts(query, context):
-    unpaid = get_unpaid_verified()
-    if not unpaid:
-        await query.edit_message_text("No pending KOL payouts.")
-        return
-
-    for a in unpaid:
-        text = (
+    if campaign_id and rows:
+        buttons.append([
+            InlineKeyboardButton(f"Approve all #{campaign_id}", callback_data=f"adm:bulk:approve:{campaign_id}:{view}"),
+            InlineKeyboardButton(f"Reject all #{campaign_id}", callback_data=f"adm:bulk:reject:{campaign_id}:{view}"),
+        ])
+    filter_row = _campaign_filter_row("adm:vq", campaign_id, rows)
+    if filter_row:
+        buttons.append(filter_row)
+    nav = _nav_row(f"adm:vq:{campaign_id}", cursor, rows[-1]["id"] if has_more else None)
+    if nav:
+        buttons.append(nav)
+    return "\n".join(lines), buttons
+
+
+def _payouts_view(campaign_id: int, cursor: int):
+    rows, has_more = _take_page(
+        get_unpaid_verified_page(campaign_id, after_id=cursor, limit=QUEUE_PAGE_SIZE + 1),
+        QUEUE_PAGE_SIZE,
+    )
+    view = f"po:{campaign_id}:{cursor}"
+    scope = f" — Campaign #{campaign_id}" if campaign_id else ""
+    if not rows:
+        lines = [f"No pending KOL payouts{scope}."]
+    else:
+        lines = [f"Pending Payouts{scope}\n─────────────────"]
+    buttons = []
+    for a in rows:
+        lines.append("")
+        lines.append(
             f"Payout — Submission #{a['id']}\n"
             f"Campaign #{a['campaign_id']}: {a['project_name']}\n"
             f"KOL: {a['kol_name']} (@{a['x_account']})\n"
             f"Service: {format_service_type(a['service_type'])}\n"
             f"Amount: {format_cents(a['per_kol_rate'])} USDC\n"
-            f"Wallet: `{a['kol_wallet']}`"
+            f"Wallet: {a['kol_wallet']}"
+            + (f"\nIn payout batch #{a['payout_batch_id']} — paid with /batchpaid" if a.get("payout_batch_id") else "")
         )
-        keyboard = InlineKeyboardMarkup([
-            [InlineKeyboardButton("Mark Paid", callback_data=f"adm:mark_paid:{a['id']}")]
-        ])
-        try:
-            await query.message.reply_text(text, reply_markup=keyboard, parse_mode="Markdown")
-        except Exception:
-            await query.message.reply_text(text, reply_markup=keyboard)
+        if a.get("payout_batch_id"):
+            continue  # read-only: the batch is paid as a whole
+        row = [InlineKeyboardButton(f"Mark Paid #{a['id']}", callback_data=f"adm:mark_paid:{a['id']}:{view}")]
+        if a["kol_wallet"]:
+            row.append(InlineKeyboardButton(
+                "Pay all to wallet",
+                callback_data=f"adm:bulk:wallet:{a['kol_telegram_id']}:{view}",
+            ))
+        buttons.append(row)
+    if rows:
+        buttons.append([InlineKeyboardButton("Create payout batch", callback_data="adm:batch_new")])
+    filter_row = _campaign_filter_row("adm:po", campaign_id, rows)
+    if filter_row:
+        buttons.append(filter_row)
+    nav = _nav_row(f"adm:po:{campaign_id}", cursor, rows[-1]["id"] if has_more else None)
+    if nav:
+        buttons.append(nav)
+    return "\n".join(lines), buttons
+
+
+async def _render_view(query, view, notice: str | None = None):
+    """Render a paginated admin view into the callback's message.
+
+    *view* is the split view token, e.g. ``["vq", "12", "0"]``.
+    """
+    kind = view[0]
+    if kind == "pq":
+        text, buttons = _pending_payments_view(int(view[1]))
+    elif kind == "ov":
+        text, buttons = _overview_view(view[1], int(view[2]))
+    elif kind == "vq":
+        text, buttons = _verifications_view(int(view[1]), int(view[2]))
+    elif kind == "po":
+        text, buttons = _payouts_view(int(view[1]), int(view[2]))
+    else:
+        text, buttons = "Admin Panel", []
+
+    if kind == "panel":
+        keyboard = _panel_keyboard()
+    else:
+        buttons.append([InlineKeyboardButton("« Panel", callback_data="adm:panel")])
+        keyboard = InlineKeyboardMarkup(buttons)
+
+    if notice:
+        text = f"{notice}\n\n{text}"
+    if len(text) > 4000:
+        text = text[:3950] + "\n\n... (truncated)"
+    try:
+        await query.edit_message_text(text, reply_markup=keyboard)
+    except BadRequest as e:
+        # "not modified" is a same-page refresh with no new data; the action has run either way
+        if "Message is not modified" not in e.message:
+            logger.warning("Could not render admin view %s: %s", ":".join(view), e)
+
+
+async def _reply(query, notice: str, view):
+    """Show the outcome of an action: re-render the originating view, or just the notice."""
+    if view:
+        await _render_view(query, view, notice)
+    else:
+        await query.edit_message_text(notice)
 
-    await query.edit_message_text(f"Found {len(unpaid)} pending payout(s) (shown above).")
 
+# ---------------------------------------------------------------------------
+# Actions
+# ---------------------------------------------------------------------------
 
-async def _mark_kol_paid(query, context, acceptance_id):
+async def _mark_kol_paid(query, context, acceptance_id, view=None):
     acceptance = get_acceptance_by_id(acceptance_id)
     if not acceptance:
-        await query.edit_message_text(f"Acceptance #{acceptance_id} not found.")
+        await _reply(query, f"Acceptance #{acceptance_id} not found.", view)
+        return
+    if acceptance["payout_batch_id"]:
+        await _reply(query, f"Submission #{acceptance_id} is in payout batch #{acceptance['payout_batch_id']}; "
+                            f"mark the batch paid with /batchpaid.", view)
         return
 
     mark_paid(acceptance_id)
@@ -188,9 +367,11 @@ async def _mark_kol_paid(query, context, acceptance_id):
     project_name = campaign["project_name"] if campaign else "Unknown"
     per_kol_rate = campaign["per_kol_rate"] if campaign else 0
 
-    await query.edit_message_text(
+    await _reply(
+        query,
         f"Submission #{acceptance_id} marked as PAID!\n"
-        f"({format_cents(per_kol_rate)} USDC to KOL {acceptance['kol_telegram_id']})"
+        f"({format_cents(per_kol_rate)} USDC to KOL {acceptance['kol_telegram_id']})",
+        view,
     )
 
     # Notify KOL
@@ -209,28 +390,34 @@ async def _mark_kol_paid(query, context, acceptance_id):
         logger.warning("Could not notify KOL %s about payment: %s", acceptance["kol_telegram_id"], e)
 
 
-async def _confirm_payment(query, context, campaign_id):
+async def _confirm_payment(query, context, campaign_id, view=None):
     campaign = activate_campaign(campaign_id)
     if not campaign:
-        await query.edit_message_text(
-            f"Could not activate campaign #{campaign_id}. It may already be active or not in pending_payment status."
+        await _reply(
+            query,
+            f"Could not activate campaign #{campaign_id}. It may already be active or not in pending_payment status.",
+            view,
         )
         return
+    deadline_scheduler.schedule(context.application.job_queue, campaign)
+    campaign_alerts.kick(context.application.job_queue)
 
     # Post to announcement channel
     channel_error = await announce_campaign(context.bot, campaign)
 
     if channel_error:
-        await query.edit_message_text(
+        notice = (
             f"Campaign #{campaign_id} is now LIVE!\n\n"
             f"Channel post failed: {channel_error}\n"
-            "Make sure the bot is an admin of the channel."
+            "Make sure the bot is an admin of the channel.\n"
+            "Opted-in KOLs are being alerted by DM."
         )
     else:
-        await query.edit_message_text(
+        notice = (
             f"Campaign #{campaign_id} is now LIVE!\n"
-            "Announced in channel."
+            "Announced in channel; opted-in KOLs are being alerted by DM."
         )
+    await _reply(query, notice, view)
 
     # Notify the customer
     try:
@@ -246,39 +433,227 @@ async def _confirm_payment(query, context, campaign_id):
         logger.warning("Could not notify customer: %s", e)
 
 
-async def _approve_verification(query, context, acceptance_id):
+async def _approve_verification(query, context, acceptance_id, view=None):
     if manually_verify(acceptance_id):
-        await query.edit_message_text(f"Submission #{acceptance_id} verified!")
+        await _reply(query, f"Submission #{acceptance_id} verified!", view)
     else:
-        await query.edit_message_text(f"Could not verify submission #{acceptance_id}.")
+        await _reply(query, f"Could not verify submission #{acceptance_id}.", view)
 
 
-async def _reject_verification(query, context, acceptance_id):
+async def _reject_verification(query, context, acceptance_id, view=None):
     if manually_reject(acceptance_id):
-        await query.edit_message_text(f"Submission #{acceptance_id} rejected.")
+        await _reply(query, f"Submission #{acceptance_id} rejected.", view)
     else:
-        await query.edit_message_text(f"Could not reject submission #{acceptance_id}.")
+        await _reply(query, f"Could not reject submission #{acceptance_id}.", view)
 
 
-async def _cancel_campaign(query, context, campaign_id):
+async def _cancel_campaign(query, context, campaign_id, view=None):
     if cancel_campaign(campaign_id):
-        await query.edit_message_text(f"Campaign #{campaign_id} cancelled.")
+        await _reply(query, f"Campaign #{campaign_id} cancelled.", view)
     else:
-        await query.edit_message_text(f"Could not cancel campaign #{campaign_id}.")
+        await _reply(query, f"Could not cancel campaign #{campaign_id}.", view)
+
+
+_BULK_PROMPTS = {
+    "approve": "Approve ALL pending submissions for campaign #{target}?",
+    "reject": "Reject ALL pending submissions for campaign #{target}?",
+    "wallet": "Mark ALL unbatched unpaid payouts to this KOL's wallet as paid?",
+}
+
+
+async def _confirm_bulk(query, op: str, target: int, view):
+    """Ask for confirmation before a bulk action."""
+    prompt = _BULK_PROMPTS.get(op)
+    if not prompt:
+        return
+    text = prompt.format(target=target)
+    if op == "wallet":
+        kol = get_kol(target)
+        text += f"\n\nKOL: {kol['name'] if kol else target}\nWallet: {kol['wallet_address'] if kol else 'N/A'}"
+    suffix = f":{':'.join(view)}" if view else ""
+    back = f"adm:{':'.join(view)}" if view else "adm:panel"
+    keyboard = InlineKeyboardMarkup([[
+        InlineKeyboardButton("Yes", callback_data=f"adm:bulk_ok:{op}:{target}{suffix}"),
+        InlineKeyboardButton("No", callback_data=back),
+    ]])
+    await query.edit_message_text(text, reply_markup=keyboard)
+
+
+async def _run_bulk(query, context, op: str, target: int, view):
+    """Execute a confirmed bulk action as a single transaction."""
+    if op == "approve":
+        count = manually_verify_campaign(target)
+        await _reply(query, f"Verified {count} submission(s) for campaign #{target}.", view)
+
+    elif op == "reject":
+        count = manually_reject_campaign(target)
+        await _reply(query, f"Rejected {count} submission(s) for campaign #{target}.", view)
+
+    elif op == "wallet":
+        kol = get_kol(target)
+        if not kol or not kol.get("wallet_address"):
+            await _reply(query, "KOL has no wallet on file.", view)
+            return
+        rows = mark_paid_for_wallet(kol["wallet_address"])
+        total = sum(r["per_kol_rate"] for r in rows)
+        await _reply(
+            query,
+            f"Marked {len(rows)} payout(s) as PAID ({format_cents(total)} USDC to {kol['wallet_address']}).",
+            view,
+        )
+        await notify_kols_paid(context.bot, rows)
+
+
+async def _create_batch(query, context):
+    """Aggregate all unbatched payouts per wallet and send the multisend file."""
+    batch = create_payout_batch()
+    if not batch:
+        await query.message.reply_text("Nothing to batch: no unbatched payouts with a wallet on file.")
+        return
+
+    doc = build_batch_file(batch["entries"])
+    doc.name = f"payout_batch_{batch['id']}.csv"
+    keyboard = InlineKeyboardMarkup([
+        [InlineKeyboardButton(f"Mark batch #{batch['id']} paid", callback_data=f"adm:batch_paid:{batch['id']}")]
+    ])
+    await query.message.reply_document(
+        document=doc,
+        caption=(
+            f"Payout batch #{batch['id']}\n"
+            f"Wallets: {len(batch['entries'])} | Submissions: {batch['acceptance_count']}\n"
+            f"Total: {format_cents(batch['total_cents'])} USDC\n\n"
+            f"After sending, tap below or use /batchpaid {batch['id']} <tx_hash>."
+        ),
+        reply_markup=keyboard,
+    )
+
+
+async def _pay_batch(query, context, batch_id: int, tx_hash: str = None):
+    rows = mark_batch_paid(batch_id, tx_hash)
+    if rows is None:
+        await query.edit_message_caption(f"Payout batch #{batch_id} is not open (already paid?).")
+        return
+    batch = get_payout_batch(batch_id)
+    await query.edit_message_caption(
+        f"Payout batch #{batch_id} marked PAID.\n"
+        f"{len(rows)} submission(s), {format_cents(batch['total_cents'])} USDC."
+    )
+    await notify_kols_paid(context.bot, rows)
+
+
+@require_admin
+async def batchpaid_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/batchpaid <batch_id> [tx_hash] — mark a payout batch paid and record the tx."""
+    if not context.args or not context.args[0].isdigit():
+        await update.message.reply_text("Usage: /batchpaid <batch_id> [tx_hash]")
+        return
+    batch_id = int(context.args[0])
+    tx_hash = context.args[1] if len(context.args) > 1 else None
+    rows = mark_batch_paid(batch_id, tx_hash)
+    if rows is None:
+        await update.message.reply_text(f"Payout batch #{batch_id} not found or already paid.")
+        return
+    batch = get_payout_batch(batch_id)
+    await update.message.reply_text(
+        f"Payout batch #{batch_id} marked PAID.\n"
+        f"{len(rows)} submission(s), {format_cents(batch['total_cents'])} USDC."
+    )
+    await notify_kols_paid(context.bot, rows)
+
+
+@require_admin
+async def markpaid_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Explain how to bulk mark payouts paid from a CSV."""
+    await update.message.reply_text(
+        "Upload a CSV file with the caption /markpaid.\n\n"
+        "Columns: acceptance_id, tx_hash (header row optional).\n"
+        "All listed verified, unpaid submissions are marked paid in one go "
+        "and each KOL gets a single payment summary."
+    )
+
+
+@require_admin
+async def markpaid_csv(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Mark payouts paid from an uploaded CSV of (acceptance_id, tx_hash) rows."""
+    tg_file = await update.message.document.get_file()
+    data = await tg_file.download_as_bytearray()
+
+    try:
+        content = bytes(data).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        await update.message.reply_text("Could not read the CSV: save it as UTF-8 and upload it again.")
+        return
+
+    tx_hashes = {}
+    for row in csv.reader(io.StringIO(content)):
+        if not row or not row[0].strip().isdigit():
+            continue  # header or blank line
+        acceptance_id = int(row[0].strip())
+        tx_hash = row[1].strip() if len(row) > 1 and row[1].strip() else None
+        tx_hashes[acceptance_id] = tx_hash
+
+    if not tx_hashes:
+        await update.message.reply_text("No acceptance ids found in the CSV.")
+        return
+
+    batched = get_batched_unpaid_ids(tx_hashes.keys())
+    rows = mark_paid_bulk(tx_hashes.keys(), tx_hashes)
+    total = sum(r["per_kol_rate"] for r in rows)
+    ignored = len(tx_hashes) - len(rows) - len(batched)
+    text = f"Marked {len(rows)} payout(s) as PAID ({format_cents(total)} USDC)."
+    if batched:
+        shown = ", ".join(f"#{i}" for i in batched[:20]) + (" ..." if len(batched) > 20 else "")
+        text += f"\n{len(batched)} id(s) skipped, in a payout batch (pay with /batchpaid): {shown}"
+    if ignored > 0:
+        text += f"\n{ignored} id(s) ignored (not verified, already paid, or unknown)."
+    await update.message.reply_text(text)
+    await notify_kols_paid(context.bot, rows)
 
 
 @require_admin
 async def export(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Export KOL and Customer data as CSV."""
-    csv_kols = export_csv_data("kols")
-    buf_kols = io.BytesIO(csv_kols.encode("utf-8"))
-    buf_kols.name = "kols_export.csv"
-    await update.message.reply_document(document=buf_kols, caption="KOLs registration export")
+    """Export all tables as gzipped CSV. `/export delta` sends only rows added since the last export."""
+    delta = bool(context.args) and context.args[0].lower() in ("delta", "since")
+    await update.message.reply_text(
+        "Preparing incremental export..." if delta else "Preparing full export..."
+    )
+    context.application.create_task(
+        _run_export(context.bot, update.effective_chat.id, delta),
+        update=update,
+    )
 
-    csv_customers = export_csv_data("customers")
-    buf_cust = io.BytesIO(csv_customers.encode("utf-8"))
-    buf_cust.name = "customers_export.csv"
-    await update.message.reply_document(document=buf_cust, caption="Customers registration export")
+
+async def _run_export(bot, chat_id, delta: bool):
+    """Background task: stream each table to a temp file off the event loop, then upload it once."""
+    for table in EXPORT_TABLES:
+        since_id = get_export_marker(table) if delta else None
+        try:
+            result = await asyncio.to_thread(export_table, table, since_id)
+        except Exception as e:
+            logger.error("Export of %s failed: %s", table, e)
+            await bot.send_message(chat_id=chat_id, text=f"Export of {table} failed: {e}")
+            continue
+
+        try:
+            if result["rows"] == 0 and delta:
+                await bot.send_message(chat_id=chat_id, text=f"{table}: no new rows since last export.")
+                continue
+            caption = f"{table}: {result['rows']} row(s)"
+            if since_id:
+                caption += f" after id {since_id}"
+            with open(result["path"], "rb") as f:
+                await bot.send_document(
+                    chat_id=chat_id,
+                    document=f,
+                    filename=f"{table}_export.csv.gz",
+                    caption=caption,
+                )
+            if result["last_id"]:
+                set_export_marker(table, result["last_id"])
+        except Exception as e:
+            logger.error("Upload of %s export failed: %s", table, e)
+        finally:
+            os.remove(result["path"])
 
 
 @require_admin
@@ -423,11 +798,167 @@ async def _run_integrity_check(bot, chat_id, progress_msg):
     await bot.send_message(chat_id=chat_id, text=text)
 
 
+@require_admin
+async def jobs_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show scheduler leadership and per-job run statistics."""
+    role = "LEADER" if leader.is_leader() else "standby"
+    lines = [f"Scheduler — {leader.INSTANCE_ID} ({role})\n─────────────────"]
+    stats = leader.get_job_stats()
+    if not stats:
+        lines.append("\nNo scheduled job has fired yet.")
+    for name, s in sorted(stats.items()):
+        avg = s["total_duration"] / s["runs"] if s["runs"] else 0.0
+        last = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(s["last_run_at"])) if s["last_run_at"] else "never"
+        lines.append(
+            f"\n{name}{' (running)' if s['running'] else ''}\n"
+            f"  runs: {s['runs']} | failures: {s['failures']} | missed: {s['missed']} | skipped: {s['skipped']}\n"
+            f"  last: {last} UTC, {s['last_duration']:.2f}s | avg: {avg:.2f}s"
+        )
+    await update.message.reply_text("\n".join(lines))
+
+
+@require_admin
+async def db_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show the slowest query templates and the handlers issuing the most queries.
+
+    /dbstats reset clears the counters.
+    """
+    if context.args and context.args[0].lower() == "reset":
+        instrumentation.reset_stats()
+        await update.message.reply_text("Query statistics reset.")
+        return
+
+    stats = instrumentation.get_query_stats()
+    if not stats:
+        await update.message.reply_text("No queries recorded yet.")
+        return
+
+    lines = [f"DB queries (slow log >= {SLOW_QUERY_MS} ms)\n─────────────────"]
+    top = sorted(stats.items(), key=lambda item: item[1]["total_ms"], reverse=True)[:10]
+    for template, s in top:
+        avg = s["total_ms"] / s["calls"]
+        p95 = instrumentation.percentile_ms(s["buckets"], 0.95)
+        sql = template if len(template) <= 120 else template[:117] + "..."
+        lines.append(
+            f"\n{sql}\n"
+            f"  calls: {s['calls']} | rows: {s['rows']} | total: {s['total_ms']:.0f}ms\n"
+            f"  avg: {avg:.1f}ms | p95 <= {p95:.0f}ms | max: {s['max_ms']:.0f}ms"
+        )
+
+    handlers = sorted(
+        instrumentation.get_handler_stats().items(), key=lambda item: item[1]["queries"], reverse=True
+    )[:10]
+    lines.append("\nBy handler:")
+    for label, h in handlers:
+        lines.append(f"  {label}: {h['queries']} queries, {h['total_ms']:.0f}ms, {len(h['templates'])} templates")
+
+    text = "\n".join(lines)
+    if len(text) > 4000:
+        text = text[:3950] + "\n\n... (truncated)"
+    await update.message.reply_text(text)
+
+
+@require_admin
+async def blocking_report(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show where the event loop spent time blocked. /blocking reset clears it."""
+    if context.args and context.args[0].lower() == "reset":
+        loop_watchdog.reset_stats()
+        await update.message.reply_text("Blocking statistics reset.")
+        return
+
+    summary, sites = loop_watchdog.get_blocking_stats()
+    since = time.strftime("%Y-%m-%d %H:%M", time.gmtime(summary["since"]))
+    lines = [
+        f"Event-loop blocking since {since} UTC\n─────────────────",
+        f"Stalls over {LOOP_LAG_THRESHOLD_MS} ms: {summary['events']} | "
+        f"total: {summary['blocked_s']:.1f}s | worst: {summary['max_lag_s'] * 1000:.0f}ms",
+    ]
+    if not sites:
+        lines.append("\nNo blocking recorded.")
+    for offender, origin, s in sites[:15]:
+        lines.append(
+            f"\n{offender}\n  from {origin}\n"
+            f"  {s['blocked_s'] * 1000:.0f}ms over {s['events']} stalls, max {s['max_s'] * 1000:.0f}ms"
+        )
+    await update.message.reply_text("\n".join(lines))
+
+
+@require_admin
+async def sessions_report(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show how many users' sessions are held in memory and what they hold."""
+    stats = sessions.get_session_stats(context.application)
+    lines = [
+        "Sessions\n─────────────────",
+        f"Users in memory: {stats['users']} ({stats['empty']} empty) | tracked: {stats['tracked']}",
+        f"Limits: {SESSION_MAX_USERS} users, {SESSION_TTL_SECONDS // 60} min idle",
+        f"Evicted: {stats['evicted_ttl']} idle, {stats['evicted_lru']} over limit",
+    ]
+    categories = sorted(stats["categories"].items(), key=lambda kv: -kv[1]["bytes"])
+    if categories:
+        lines.append("")
+    for key, c in categories:
+        lines.append(
+            f"{key}: {c['users']} user(s), {c['bytes'] / 1024:.1f} KiB "
+            f"(avg {c['bytes'] // c['users']} B)"
+        )
+    await update.message.reply_text("\n".join(lines))
+
+
+@require_admin
+async def profile_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/profile <seconds> — sample the live process and send a collapsed-stack file."""
+    try:
+        seconds = int(context.args[0]) if context.args else 30
+        if not 1 <= seconds <= profiler.MAX_SECONDS:
+            raise ValueError
+    except ValueError:
+        await update.message.reply_text(f"Usage: /profile <seconds> (1-{profiler.MAX_SECONDS})")
+        return
+    await update.message.reply_text(f"Profiling for {seconds}s...")
+    context.application.create_task(
+        _run_profile(context.bot, update.effective_chat.id, seconds),
+        update=update,
+    )
+
+
+async def _run_profile(bot, chat_id, seconds: int):
+    """Background task: sample off the event loop, then upload the result."""
+    try:
+        result = await asyncio.to_thread(profiler.sample, seconds)
+    except profiler.ProfilerBusy:
+        await bot.send_message(chat_id=chat_id, text="A profile is already running.")
+        return
+
+    lines = [f"Profile: {result['samples']} samples over {result['seconds']:.1f}s", "Top project functions (self time):"]
+    for name, share in profiler.top_functions(result):
+        lines.append(f"  {share:6.1%}  {name}")
+    caption = "\n".join(lines)
+    if len(caption) > 1000:
+        caption = caption[:990] + "\n..."
+    await bot.send_document(
+        chat_id=chat_id,
+        document=io.BytesIO(profiler.collapsed(result)),
+        filename=f"profile_{time.strftime('%Y%m%d_%H%M%S', time.gmtime())}.folded",
+        caption=caption,
+    )
+
+
 def get_handlers():
     return [
         CommandHandler("admin", admin_panel),
         CommandHandler("export", export),
         CommandHandler("bulkverify", bulk_verify),
         CommandHandler("integrity", integrity_check),
+        CommandHandler("markpaid", markpaid_command),
+        CommandHandler("batchpaid", batchpaid_command),
+        CommandHandler("jobs", jobs_status),
+        CommandHandler("dbstats", db_stats),
+        CommandHandler("blocking", blocking_report),
+        CommandHandler("profile", profile_command),
+        CommandHandler("sessions", sessions_report),
+        MessageHandler(
+            filters.Document.FileExtension("csv") & filters.CaptionRegex(r"^/markpaid\b"),
+            markpaid_csv,
+        ),
         CallbackQueryHandler(admin_callback, pattern=r"^adm:"),
     ]
@@ -0,0 +1,88 @@
+"""New-campaign alerts — /alerts lets a KOL pick the service types they get a DM for.
+
+Alerts are opt-in: a KOL with no service types selected gets none. The DMs
+themselves are sent by services.campaign_alerts when a campaign goes live.
+"""
+import logging
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.error import BadRequest
+from telegram.ext import CallbackQueryHandler, CommandHandler, ContextTypes
+
+from db.alert_repo import get_alert_services, set_alert_services
+from db.kol_repo import get_kol
+from db.tier_repo import get_all_tiers
+from handlers.common import format_cents
+
+logger = logging.getLogger(__name__)
+
+
+def _alerts_view(kol_telegram_id: int):
+    """Build message text + keyboard showing the KOL's alert subscriptions."""
+    tiers = get_all_tiers()
+    selected = get_alert_services(kol_telegram_id) & set(tiers)
+    if selected:
+        text = "New campaign alerts: ON\n\nYou get a DM as soon as a campaign goes live for:"
+    else:
+        text = "New campaign alerts: OFF\n\nPick the services you want a DM about when a campaign goes live."
+    buttons = [
+        [InlineKeyboardButton(
+            f"{'✅' if key in selected else '▫️'} {name} ({format_cents(rate)})",
+            callback_data=f"alerts:{key}",
+        )]
+        for key, (name, rate, *_) in tiers.items()
+    ]
+    buttons.append([
+        InlineKeyboardButton("All", callback_data="alerts:*all"),
+        InlineKeyboardButton("None", callback_data="alerts:*none"),
+    ])
+    return text, InlineKeyboardMarkup(buttons)
+
+
+async def alerts_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/alerts — choose which new campaigns to be alerted about."""
+    user = update.effective_user
+    kol = get_kol(user.id)
+    if not kol:
+        await update.message.reply_text("You need to register as a KOL first. Use /start to register.")
+        return
+    if not kol.get("is_active", True):
+        await update.message.reply_text("Your account has been suspended.")
+        return
+    text, keyboard = _alerts_view(user.id)
+    await update.message.reply_text(text, reply_markup=keyboard)
+
+
+async def alerts_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle alerts:<service_type> toggles and the alerts:*all / alerts:*none buttons."""
+    query = update.callback_query
+    user = query.from_user
+    if not get_kol(user.id):
+        await query.answer("You need to register as a KOL first.", show_alert=True)
+        return
+    await query.answer()
+
+    choice = query.data.split(":", 1)[1]
+    tiers = get_all_tiers()
+    if choice == "*all":
+        selected = set(tiers)
+    elif choice == "*none":
+        selected = set()
+    else:
+        selected = get_alert_services(user.id) & set(tiers)
+        selected ^= {choice} & set(tiers)
+    set_alert_services(user.id, selected)
+
+    text, keyboard = _alerts_view(user.id)
+    try:
+        await query.edit_message_text(text, reply_markup=keyboard)
+    except BadRequest as e:
+        if "Message is not modified" not in e.message:
+            logger.warning("Could not update alerts view for %s: %s", user.id, e)
+
+
+def get_handlers():
+    return [
+        CommandHandler("alerts", alerts_command),
+        CallbackQueryHandler(alerts_callback, pattern=r"^alerts:"),
+    ]
@@ -61,7 +61,7 @@ async def browse_campaigns(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if c.get("media_file_id"):
             await send_campaign_media(
                 context.bot, update.effective_chat.id, c["media_file_id"],
-                caption="Campaign media:"
+                caption="Campaign media:", media_kind=c["media_kind"],
             )
 
         await update.message.reply_text(text, reply_markup=keyboard)
@@ -134,7 +134,7 @@ async def accept_campaign_callback(update: Update, context: ContextTypes.DEFAULT
         if campaign.get("media_file_id"):
             await send_campaign_media(
                 context.bot, user.id, campaign["media_file_id"],
-                caption=f"Media for Campaign #{campaign_id}"
+                caption=f"Media for Campaign #{campaign_id}", media_kind=campaign["media_kind"],
             )
     except Exception as e:
         logger.warning("Could not DM KOL %s: %s", user.id, e)
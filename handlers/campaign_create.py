@@ -24,6 +24,7 @@ from config import (
 )
 from db.tier_repo import get_all_tiers
 from handlers.common import require_customer, format_cents, format_service_type, notify_admins
+from services import sessions
 from services.campaign_service import create_campaign, calculate_pricing
 
 logger = logging.getLogger(__name__)
@@ -41,12 +42,12 @@ logger = logging.getLogger(__name__)
     DEADLINE,
     CONFIRM,
 ) = range(11)
+SESSION = "campaign"
 
 
 @require_customer
 async def newcampaign(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Entry point: show service type selector."""
-    context.user_data["campaign"] = {}
     tiers = get_all_tiers()
     buttons = []
     for key, (name, rate, _min, _max) in tiers.items():
@@ -66,7 +67,7 @@ async def service_selected(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     query = update.callback_query
     await query.answer()
     service_type = query.data.split(":")[1]
-    context.user_data["campaign"]["service_type"] = service_type
+    sessions.scope(context, SESSION)["service_type"] = service_type
 
     tiers = get_all_tiers()
     tier = tiers[service_type]
@@ -78,8 +79,9 @@ async def service_selected(update: Update, context: ContextTypes.DEFAULT_TYPE) -
 
 
 async def project_name_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["campaign"]["project_name"] = update.message.text.strip()
-    service_type = context.user_data["campaign"]["service_type"]
+    session = sessions.scope(context, SESSION)
+    session["project_name"] = update.message.text.strip()
+    service_type = session["service_type"]
 
     if service_type in SERVICES_REQUIRING_TARGET:
         await update.message.reply_text(
@@ -88,7 +90,7 @@ async def project_name_received(update: Update, context: ContextTypes.DEFAULT_TY
         return TARGET_URL
     else:
         # For original content, target_url is optional
-        context.user_data["campaign"]["target_url"] = None
+        session["target_url"] = None
         await update.message.reply_text(
             "What key talking points should KOLs cover in their posts?\n"
             "(Write them out, or send /skip)"
@@ -98,8 +100,9 @@ async def project_name_received(update: Update, context: ContextTypes.DEFAULT_TY
 
 async def target_url_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     url = update.message.text.strip()
-    context.user_data["campaign"]["target_url"] = url
-    service_type = context.user_data["campaign"]["service_type"]
+    session = sessions.scope(context, SESSION)
+    session["target_url"] = url
+    service_type = session["service_type"]
 
     if service_type in SERVICES_REQUIRING_TALKING_POINTS:
         await update.message.reply_text(
@@ -109,7 +112,7 @@ async def target_url_received(update: Update, context: ContextTypes.DEFAULT_TYPE
         return TALKING_POINTS
     else:
         # Retweet / Like+RT don't need talking points
-        context.user_data["campaign"]["talking_points"] = None
+        session["talking_points"] = None
         await update.message.reply_text(
             "Any hashtags to include? (comma-separated, or /skip)"
         )
@@ -117,7 +120,7 @@ async def target_url_received(update: Update, context: ContextTypes.DEFAULT_TYPE
 
 
 async def talking_points_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["campaign"]["talking_points"] = update.message.text.strip()
+    sessions.scope(context, SESSION)["talking_points"] = update.message.text.strip()
     await update.message.reply_text(
         "Any hashtags to include? (comma-separated, or /skip)"
     )
@@ -125,7 +128,7 @@ async def talking_points_received(update: Update, context: ContextTypes.DEFAULT_
 
 
 async def skip_talking_points(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["campaign"]["talking_points"] = None
+    sessions.scope(context, SESSION)["talking_points"] = None
     await update.message.reply_text(
         "Any hashtags to include? (comma-separated, or /skip)"
     )
@@ -133,7 +136,7 @@ async def skip_talking_points(update: Update, context: ContextTypes.DEFAULT_TYPE
 
 
 async def hashtags_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["campaign"]["hashtags"] = update.message.text.strip()
+    sessions.scope(context, SESSION)["hashtags"] = update.message.text.strip()
     await update.message.reply_text(
         "Any @mentions to include? (comma-separated, or /skip)"
     )
@@ -141,7 +144,7 @@ async def hashtags_received(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 
 async def skip_hashtags(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["campaign"]["hashtags"] = None
+    sessions.scope(context, SESSION)["hashtags"] = None
     await update.message.reply_text(
         "Any @mentions to include? (comma-separated, or /skip)"
     )
@@ -149,7 +152,7 @@ async def skip_hashtags(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
 
 
 async def mentions_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["campaign"]["mentions"] = update.message.text.strip()
+    sessions.scope(context, SESSION)["mentions"] = update.message.text.strip()
     await update.message.reply_text(
         "Any reference tweet URL for KOLs to look at? (or /skip)"
     )
@@ -157,7 +160,7 @@ async def mentions_received(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 
 async def skip_mentions(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["campaign"]["mentions"] = None
+    sessions.scope(context, SESSION)["mentions"] = None
     await update.message.reply_text(
         "Any reference tweet URL for KOLs to look at? (or /skip)"
     )
@@ -165,7 +168,7 @@ async def skip_mentions(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
 
 
 async def reference_url_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["campaign"]["reference_tweet_url"] = update.message.text.strip()
+    sessions.scope(context, SESSION)["reference_tweet_url"] = update.message.text.strip()
     await update.message.reply_text(
         "Upload an image or video for KOLs to use (or /skip)"
     )
@@ -173,7 +176,7 @@ async def reference_url_received(update: Update, context: ContextTypes.DEFAULT_T
 
 
 async def skip_reference_url(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["campaign"]["reference_tweet_url"] = None
+    sessions.scope(context, SESSION)["reference_tweet_url"] = None
     await update.message.reply_text(
         "Upload an image or video for KOLs to use (or /skip)"
     )
@@ -182,16 +185,18 @@ async def skip_reference_url(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 async def media_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     if update.message.photo:
-        file_id = update.message.photo[-1].file_id
+        file_id, kind = update.message.photo[-1].file_id, "photo"
     elif update.message.video:
-        file_id = update.message.video.file_id
+        file_id, kind = update.message.video.file_id, "video"
     elif update.message.document:
-        file_id = update.message.document.file_id
+        file_id, kind = update.message.document.file_id, "document"
     else:
-        file_id = None
-    context.user_data["campaign"]["media_file_id"] = file_id
+        file_id, kind = None, None
+    session = sessions.scope(context, SESSION)
+    session["media_file_id"] = file_id
+    session["media_kind"] = kind
 
-    service_type = context.user_data["campaign"]["service_type"]
+    service_type = session["service_type"]
     tiers = get_all_tiers()
     tier = tiers[service_type]
     await update.message.reply_text(
@@ -201,8 +206,10 @@ async def media_received(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
 
 async def skip_media(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["campaign"]["media_file_id"] = None
-    service_type = context.user_data["campaign"]["service_type"]
+    session = sessions.scope(context, SESSION)
+    session["media_file_id"] = None
+    session["media_kind"] = None
+    service_type = session["service_type"]
     tiers = get_all_tiers()
     tier = tiers[service_type]
     await update.message.reply_text(
@@ -213,7 +220,8 @@ async def skip_media(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
 async def kol_count_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     text = update.message.text.strip()
-    service_type = context.user_data["campaign"]["service_type"]
+    session = sessions.scope(context, SESSION)
+    service_type = session["service_type"]
     tiers = get_all_tiers()
     tier = tiers[service_type]
     min_kols, max_kols = tier[2], tier[3]
@@ -228,7 +236,7 @@ async def kol_count_received(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await update.message.reply_text(f"Must be between {min_kols} and {max_kols}. Try again.")
         return KOL_COUNT
 
-    context.user_data["campaign"]["kol_count"] = count
+    session["kol_count"] = count
     await update.message.reply_text(
         "How many days until the deadline? (1-30)"
     )
@@ -248,10 +256,11 @@ async def deadline_received(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return DEADLINE
 
     deadline = datetime.utcnow() + timedelta(days=days)
-    context.user_data["campaign"]["deadline"] = deadline.isoformat()
+    session = sessions.scope(context, SESSION)
+    session["deadline"] = deadline.isoformat()
 
     # Show summary
-    c = context.user_data["campaign"]
+    c = session
     pricing = calculate_pricing(c["service_type"], c["kol_count"])
     tier_name = format_service_type(c["service_type"])
 
@@ -298,7 +307,7 @@ async def confirm_campaign(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         return ConversationHandler.END
 
     user = query.from_user
-    c = context.user_data["campaign"]
+    c = sessions.scope(context, SESSION)
     c["customer_telegram_id"] = user.id
 
     campaign_id = create_campaign(c)
@@ -361,7 +370,7 @@ async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 def get_conversation_handler() -> ConversationHandler:
     skip_cmd = CommandHandler("skip", None)  # placeholder, replaced per-state
 
-    return ConversationHandler(
+    return sessions.scoped_conversation(SESSION, ConversationHandler(
         entry_points=[CommandHandler("newcampaign", newcampaign)],
         states={
             SELECT_SERVICE: [CallbackQueryHandler(service_selected, pattern="^cc_svc:")],
@@ -393,4 +402,4 @@ def get_conversation_handler() -> ConversationHandler:
         },
         fallbacks=[CommandHandler("cancel", cancel)],
         allow_reentry=True,
-    )
+    ))
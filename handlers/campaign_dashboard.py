@@ -108,7 +108,7 @@ async def my_work(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if a.get("media_file_id") and a["status"] in ("accepted", "submitted"):
             await send_campaign_media(
                 context.bot, update.effective_chat.id, a["media_file_id"],
-                caption=f"Media for Campaign #{a['campaign_id']}"
+                caption=f"Media for Campaign #{a['campaign_id']}", media_kind=a["media_kind"],
             )
 
 
@@ -0,0 +1,124 @@
+"""Campaign search — /findcampaign <words> over project name, talking points, hashtags and mentions.
+
+Admins can search every campaign and narrow by status; KOLs search the live
+campaigns they can accept. Results are keyset-paginated newest first
+(campaign_repo.search_campaigns). The query itself is kept in the user's
+session scope, so callback data only carries the status filter and cursor.
+"""
+import html
+import logging
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.ext import CallbackQueryHandler, CommandHandler, ContextTypes
+
+from config import CAMPAIGN_STATUSES
+from db.campaign_repo import search_campaigns
+from db.kol_repo import get_kol
+from handlers.common import format_campaign_summary, is_admin
+from services import sessions
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 5
+SESSION = "findcampaign"
+
+
+def _results_view(query: str, status: str, cursor: int, admin_view: bool):
+    """Build message text + keyboard for one page of search results."""
+    rows = search_campaigns(
+        query, None if status == "all" else status, before_id=cursor, limit=PAGE_SIZE + 1,
+    )
+    page, has_more = rows[:PAGE_SIZE], len(rows) > PAGE_SIZE
+    scope = "" if status == "all" else f" — {status}"
+    lines = [f"Campaign search: “{html.escape(query)}”{scope}\n─────────────────"]
+    if not page:
+        lines.append("\nNo matching campaigns.")
+    buttons = []
+    for c in page:
+        lines.append("")
+        lines.append(html.escape(format_campaign_summary(c)))
+        if not admin_view and c["kol_count"] > (c["accepted_count"] or 0):
+            buttons.append([InlineKeyboardButton(
+                f"Accept #{c['id']}", callback_data=f"accept_campaign:{c['id']}",
+            )])
+
+    if admin_view:
+        filters = ["all"] + CAMPAIGN_STATUSES
+        filter_buttons = [
+            InlineKeyboardButton(f"• {f}" if f == status else f, callback_data=f"fc:{f}:0")
+            for f in filters
+        ]
+        buttons.extend(filter_buttons[i:i + 3] for i in range(0, len(filter_buttons), 3))
+
+    nav = []
+    if cursor:
+        nav.append(InlineKeyboardButton("« First", callback_data=f"fc:{status}:0"))
+    if has_more:
+        nav.append(InlineKeyboardButton("Next »", callback_data=f"fc:{status}:{page[-1]['id']}"))
+    if nav:
+        buttons.append(nav)
+    return "\n".join(lines), InlineKeyboardMarkup(buttons) if buttons else None
+
+
+def _searcher(update: Update):
+    """(admin_view, error message) for the user; KOLs must be registered and active."""
+    user = update.effective_user
+    if is_admin(user):
+        return True, None
+    kol = get_kol(user.id)
+    if not kol:
+        return False, "You need to register as a KOL first. Use /start to register."
+    if not kol.get("is_active", True):
+        return False, "Your account has been suspended."
+    return False, None
+
+
+async def findcampaign_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/findcampaign <words> — full-text campaign search."""
+    admin_view, error = _searcher(update)
+    if error:
+        await update.message.reply_text(error)
+        return
+    if not context.args:
+        await update.message.reply_text(
+            "Usage: /findcampaign <words>\n"
+            "Matches project name, talking points, hashtags and mentions."
+        )
+        return
+
+    query = " ".join(context.args)
+    sessions.scope(context, SESSION)["query"] = query
+    status = "all" if admin_view else "live"
+    text, keyboard = _results_view(query, status, 0, admin_view)
+    await update.message.reply_text(text, reply_markup=keyboard, parse_mode="HTML")
+
+
+async def findcampaign_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle fc:<status>:<cursor> filter and page buttons."""
+    query = update.callback_query
+    admin_view, error = _searcher(update)
+    if error:
+        await query.answer(error, show_alert=True)
+        return
+    await query.answer()
+
+    search = sessions.scope(context, SESSION).get("query")
+    if not search:
+        await query.edit_message_text("This search has expired. Send /findcampaign again.")
+        return
+
+    _, status, cursor = query.data.split(":")
+    if not admin_view:
+        status = "live"
+    text, keyboard = _results_view(search, status, int(cursor), admin_view)
+    try:
+        await query.edit_message_text(text, reply_markup=keyboard, parse_mode="HTML")
+    except Exception:
+        pass  # message unchanged
+
+
+def get_handlers():
+    return [
+        CommandHandler("findcampaign", findcampaign_command),
+        CallbackQueryHandler(findcampaign_callback, pattern=r"^fc:"),
+    ]
@@ -14,11 +14,13 @@ from telegram.ext import (
 from db.kol_repo import get_kol
 from db.acceptance_repo import get_acceptances_for_kol
 from handlers.common import format_service_type
+from services import sessions
 from services.verification_service import verify_submission
 
 logger = logging.getLogger(__name__)
 
 SELECT_CAMPAIGN, ENTER_TWEET_URL = range(2)
+SESSION = "submit"
 
 
 async def submit_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -64,8 +66,9 @@ async def campaign_picked(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     parts = query.data.split(":")
     campaign_id = int(parts[1])
     acceptance_id = int(parts[2])
-    context.user_data["submit_acceptance_id"] = acceptance_id
-    context.user_data["submit_campaign_id"] = campaign_id
+    session = sessions.scope(context, SESSION)
+    session["acceptance_id"] = acceptance_id
+    session["campaign_id"] = campaign_id
 
     await query.edit_message_text(
         f"Submitting for campaign #{campaign_id}.\n\n"
@@ -76,7 +79,7 @@ async def campaign_picked(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
 async def tweet_url_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     tweet_url = update.message.text.strip()
-    acceptance_id = context.user_data.get("submit_acceptance_id")
+    acceptance_id = sessions.scope(context, SESSION).get("acceptance_id")
 
     if not acceptance_id:
         await update.message.reply_text("Something went wrong. Please try /submit again.")
@@ -111,7 +114,7 @@ async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
 
 def get_conversation_handler() -> ConversationHandler:
-    return ConversationHandler(
+    return sessions.scoped_conversation(SESSION, ConversationHandler(
         entry_points=[CommandHandler("submit", submit_start)],
         states={
             SELECT_CAMPAIGN: [CallbackQueryHandler(campaign_picked, pattern=r"^sub_pick:")],
@@ -119,4 +122,4 @@ def get_conversation_handler() -> ConversationHandler:
         },
         fallbacks=[CommandHandler("cancel", cancel)],
         allow_reentry=True,
-    )
+    ))
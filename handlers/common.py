@@ -1,5 +1,3 @@
-import csv
-import io
 import logging
 from functools import wraps
 
@@ -46,7 +44,6 @@ def require_customer(func):
                 "You need to register as a Customer first. Use /start to register."
             )
             return
-        context.user_data["customer"] = cust
         return await func(update, context, *args, **kwargs)
     return wrapper
 
@@ -62,7 +59,6 @@ def require_kol(func):
                 "You need to register as a KOL first. Use /start to register."
             )
             return
-        context.user_data["kol"] = kol
         return await func(update, context, *args, **kwargs)
     return wrapper
 
@@ -88,24 +84,31 @@ async def notify_admins(bot, text: str, reply_markup=None):
         logger.error("No admins could be notified! Set ADMIN_TELEGRAM_IDS in .env")
 
 
-async def send_campaign_media(bot, chat_id, media_file_id, caption=None):
+async def send_campaign_media(bot, chat_id, media_file_id, caption=None, media_kind=None):
     """Send a campaign's attached media file to a chat.
 
-    Tries photo first, falls back to document (covers video/other files).
-    Returns True if sent, False if no media.
+    Uses the method for *media_kind* (photo, video or document, recorded at
+    upload). Media from before the kind was recorded tries photo first and
+    falls back to document. Returns True if sent, False if no media.
     """
     if not media_file_id:
         return False
     try:
-        await bot.send_photo(chat_id=chat_id, photo=media_file_id, caption=caption)
-        return True
-    except Exception:
-        try:
+        if media_kind == "video":
+            await bot.send_video(chat_id=chat_id, video=media_file_id, caption=caption)
+        elif media_kind == "document":
             await bot.send_document(chat_id=chat_id, document=media_file_id, caption=caption)
-            return True
-        except Exception as e:
-            logger.warning("Could not send media %s to %s: %s", media_file_id, chat_id, e)
-            return False
+        elif media_kind == "photo":
+            await bot.send_photo(chat_id=chat_id, photo=media_file_id, caption=caption)
+        else:
+            try:
+                await bot.send_photo(chat_id=chat_id, photo=media_file_id, caption=caption)
+            except Exception:
+                await bot.send_document(chat_id=chat_id, document=media_file_id, caption=caption)
+        return True
+    except Exception as e:
+        logger.warning("Could not send media %s to %s: %s", media_file_id, chat_id, e)
+        return False
 
 
 def format_cents(cents: int) -> str:
@@ -129,32 +132,11 @@ def format_campaign_summary(c: dict) -> str:
         f"Service: {tier_name}",
         f"Rate: {format_cents(c['per_kol_rate'])} per KOL",
         f"Slots: {remaining}/{c['kol_count']} remaining",
+        f"Progress: {c.get('verified_count') or 0} verified, "
+        f"{c.get('submitted_count') or 0} in review, {c.get('paid_count') or 0} paid",
         f"Status: {c['status']}",
         f"Deadline: {str(c['deadline'])[:16]}",
     ]
     if c.get("target_url"):
         lines.append(f"Target: {c['target_url']}")
     return "\n".join(lines)
-
-
-def export_csv_data(table="kols"):
-    """Generate CSV string for KOLs or Customers."""
-    from db.connection import get_conn
-    conn = get_conn()
-    cur = conn.cursor()
-
-    if table == "customers":
-        q = "SELECT name, project_x_account, telegram_handle, telegram_id, registered_at FROM customers"
-    else:
-        q = "SELECT name, x_account, wallet_address, telegram_handle, telegram_id, registered_at FROM kols"
-
-    cur.execute(q)
-    rows = cur.fetchall()
-    columns = [d[0] for d in cur.description]
-    conn.close()
-
-    buf = io.StringIO()
-    writer = csv.writer(buf)
-    writer.writerow(columns)
-    writer.writerows(rows)
-    return buf.getvalue()
@@ -0,0 +1,75 @@
+"""Inline mode — "@bot retweet", "@bot >$20" lists open live campaigns in any chat.
+
+Answers come from the in-memory services.live_campaigns index, never the
+database, and carry a short shared cache_time so Telegram serves repeated
+queries itself. Each result posts the campaign with the usual
+accept_campaign:<id> button. Inline mode must be enabled for the bot with
+@BotFather (/setinline).
+"""
+import logging
+
+from telegram import (
+    InlineKeyboardButton, InlineKeyboardMarkup, InlineQueryResultArticle, InputTextMessageContent, Update,
+)
+from telegram.ext import ContextTypes, InlineQueryHandler
+
+from handlers.common import format_cents
+from services import live_campaigns
+
+logger = logging.getLogger(__name__)
+
+# Seconds Telegram may reuse an answer for the same query text (results are the same for everyone)
+CACHE_TIME = 10
+# Telegram accepts at most 50 results per answer; more come via next_offset
+MAX_RESULTS = 50
+
+
+def _campaign_text(c) -> str:
+    remaining = c["kol_count"] - (c["accepted_count"] or 0)
+    text = (
+        f"Campaign #{c['id']}: {c['project_name']}\n"
+        f"Service: {live_campaigns.service_name(c['service_type'])}\n"
+        f"Rate: {format_cents(c['per_kol_rate'])} per KOL\n"
+        f"Spots remaining: {remaining}/{c['kol_count']}\n"
+        f"Deadline: {str(c['deadline'])[:16]}"
+    )
+    if c.get("target_url"):
+        text += f"\nTarget: {c['target_url']}"
+    if c.get("hashtags"):
+        text += f"\nHashtags: {c['hashtags']}"
+    return text
+
+
+def _result(c) -> InlineQueryResultArticle:
+    remaining = c["kol_count"] - (c["accepted_count"] or 0)
+    return InlineQueryResultArticle(
+        id=str(c["id"]),
+        title=f"#{c['id']} {c['project_name']}",
+        description=(
+            f"{live_campaigns.service_name(c['service_type'])} · {format_cents(c['per_kol_rate'])} per KOL · "
+            f"{remaining} spot(s) left · due {str(c['deadline'])[:10]}"
+        ),
+        input_message_content=InputTextMessageContent(_campaign_text(c)),
+        reply_markup=InlineKeyboardMarkup([
+            [InlineKeyboardButton("Accept", callback_data=f"accept_campaign:{c['id']}")]
+        ]),
+    )
+
+
+async def inline_query(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Answer an inline query with matching open campaigns, best first."""
+    query = update.inline_query
+    matches = await live_campaigns.search(query.query)
+    offset = int(query.offset) if query.offset.isdigit() else 0
+    page = matches[offset:offset + MAX_RESULTS]
+    more = len(matches) > offset + MAX_RESULTS
+    await query.answer(
+        [_result(c) for c in page],
+        cache_time=CACHE_TIME,
+        is_personal=False,
+        next_offset=str(offset + MAX_RESULTS) if more else "",
+    )
+
+
+def get_handlers():
+    return [InlineQueryHandler(inline_query)]
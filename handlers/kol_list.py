@@ -1,15 +1,61 @@
-"""Interactive KOL roster — /kols command with paginated list and detail views."""
+"""Interactive KOL roster — /kols command with paginated list and detail views.
+
+Pages are keyset-paginated in the database (kol_repo.get_roster_page) and can
+be sorted by followers, reputation or newest; callback data carries the
+sort, page number and cursor, so a page flip is one small indexed query.
+"""
+import html
 import logging
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import CallbackQueryHandler, CommandHandler, ContextTypes
 
-from db.kol_repo import get_all_kols, get_kol
+from db.kol_repo import count_roster, get_kol, get_roster_page, roster_cursor, toggle_kol_active
 from handlers.common import is_admin
+from services import kol_search
 
 logger = logging.getLogger(__name__)
 
 PAGE_SIZE = 5
+SEARCH_LIMIT = 10
+
+
+# Sort codes used in callback data -> kol_repo.ROSTER_SORTS keys
+SORTS = {"f": "followers", "r": "reputation", "n": "newest"}
+SORT_LABELS = {"f": "Followers", "r": "Reputation", "n": "Newest"}
+DEFAULT_SORT = "f"
+
+
+def _encode_cursor(cursor: tuple | None) -> str:
+    return ",".join(str(v) for v in cursor) if cursor else ""
+
+
+def _decode_cursor(sort: str, text: str) -> tuple | None:
+    """Inverse of _encode_cursor: (sort value, id) or (id,) for "newest"."""
+    if not text:
+        return None
+    values = text.split(",")
+    if SORTS[sort] == "reputation":
+        return float(values[0]), int(values[1])
+    return tuple(int(v) for v in values)
+
+
+def _view(sort: str, page: int, after: tuple | None) -> str:
+    """Callback-data suffix identifying one roster page: sort, page number and keyset cursor."""
+    return f"{sort}:{page}:{_encode_cursor(after)}"
+
+
+def _parse_view(view: str):
+    """Inverse of _view.
+
+    Buttons from before sorting carry a bare page number ("kols:page:3",
+    "kols:detail:123:3"); they open page 0 of the default sort.
+    """
+    parts = view.split(":", 2)
+    if len(parts) < 3 or parts[0] not in SORTS:
+        return DEFAULT_SORT, 0, None
+    sort, page, after = parts
+    return sort, int(page), _decode_cursor(sort, after)
 
 
 def _format_kol_line(kol, index: int, admin_view: bool = False) -> str:
@@ -27,40 +73,54 @@ def _format_kol_line(kol, index: int, admin_view: bool = False) -> str:
     )
 
 
-def _list_page(kols, page: int, admin_view: bool = False):
-    """Build message text + keyboard for a given page."""
-    total = len(kols)
-    total_pages = max(1, (total + PAGE_SIZE - 1) // PAGE_SIZE)
-    page = max(0, min(page, total_pages - 1))
+def _list_page(sort: str, page: int, after: tuple | None, admin_view: bool = False):
+    """Build message text + keyboard for one page, or (None, None) if the roster is empty.
 
-    start = page * PAGE_SIZE
-    end = min(start + PAGE_SIZE, total)
-    page_kols = kols[start:end]
+    The page is one indexed keyset query; the total comes from the cached count.
+    """
+    total = count_roster(public=not admin_view)
+    if not total:
+        return None, None
+    rows = get_roster_page(SORTS[sort], public=not admin_view, after=after, limit=PAGE_SIZE + 1)
+    page_kols, has_more = rows[:PAGE_SIZE], len(rows) > PAGE_SIZE
+    total_pages = max(1, (total + PAGE_SIZE - 1) // PAGE_SIZE)
+    view = _view(sort, page, after)
 
     lines = [f"KOL Roster  ({total} total)  —  page {page + 1}/{total_pages}\n"]
-    for i, kol in enumerate(page_kols, start=start + 1):
+    for i, kol in enumerate(page_kols, start=page * PAGE_SIZE + 1):
         lines.append(_format_kol_line(kol, i, admin_view))
 
     # Detail buttons for each KOL on this page
     detail_buttons = [
         [InlineKeyboardButton(
             f"{kol['name']}",
-            callback_data=f"kols:detail:{kol['telegram_id']}:{page}",
+            callback_data=f"kols:detail:{kol['telegram_id']}:{view}",
         )]
         for kol in page_kols
     ]
 
+    # Sort row
+    sort_row = [
+        InlineKeyboardButton(
+            f"• {label}" if code == sort else label,
+            callback_data=f"kols:page:{_view(code, 0, None)}",
+        )
+        for code, label in SORT_LABELS.items()
+    ]
+
     # Navigation row
     nav = []
     if page > 0:
-        nav.append(InlineKeyboardButton("<< Prev", callback_data=f"kols:page:{page - 1}"))
-    if page < total_pages - 1:
-        nav.append(InlineKeyboardButton("Next >>", callback_data=f"kols:page:{page + 1}"))
+        nav.append(InlineKeyboardButton("« First", callback_data=f"kols:page:{_view(sort, 0, None)}"))
+    if has_more:
+        next_after = roster_cursor(SORTS[sort], page_kols[-1])
+        nav.append(InlineKeyboardButton("Next »", callback_data=f"kols:page:{_view(sort, page + 1, next_after)}"))
 
     # Refresh button
-    refresh_row = [InlineKeyboardButton("Refresh", callback_data=f"kols:page:{page}")]
+    refresh_row = [InlineKeyboardButton("Refresh", callback_data=f"kols:page:{view}")]
 
     rows = detail_buttons
+    rows.append(sort_row)
     if nav:
         rows.append(nav)
     rows.append(refresh_row)
@@ -68,7 +128,7 @@ def _list_page(kols, page: int, admin_view: bool = False):
     return "\n".join(lines), InlineKeyboardMarkup(rows)
 
 
-def _detail_view(kol, back_page: int, admin_view: bool = False):
+def _detail_view(kol, back_view: str, admin_view: bool = False):
     """Build detail text + keyboard for a single KOL."""
     verified = "Yes" if kol.get("is_verified") else "No"
     followers = kol.get("follower_count") or 0
@@ -98,56 +158,48 @@ def _detail_view(kol, back_page: int, admin_view: bool = False):
         toggle_label = "Deactivate" if kol.get("is_active", True) else "Activate"
         buttons.append([InlineKeyboardButton(
             toggle_label,
-            callback_data=f"kols:toggle:{kol['telegram_id']}:{back_page}",
+            callback_data=f"kols:toggle:{kol['telegram_id']}:{back_view}",
         )])
     buttons.append([InlineKeyboardButton(
         "<< Back to list",
-        callback_data=f"kols:page:{back_page}",
+        callback_data=f"kols:page:{back_view}",
     )])
 
     return "\n".join(lines), InlineKeyboardMarkup(buttons)
 
 
-def _toggle_active(telegram_id: int):
-    """Toggle a KOL's is_active flag and return the new value."""
-    from db.connection import get_conn, ph
-    conn = get_conn()
-    cur = conn.cursor()
-    p = ph()
-    # Read current value
-    cur.execute(f"SELECT is_active FROM kols WHERE telegram_id = {p}", (telegram_id,))
-    row = cur.fetchone()
-    if not row:
-        conn.close()
-        return None
-    current = row[0]
-    new_val = not current
-    cur.execute(
-        f"UPDATE kols SET is_active = {p} WHERE telegram_id = {p}",
-        (new_val, telegram_id),
-    )
-    conn.commit()
-    conn.close()
-    return new_val
+def _search_results(query: str, admin_view: bool = False):
+    """Build message text + keyboard for a /kols <query> search."""
+    kols = kol_search.search(query, public=not admin_view, limit=SEARCH_LIMIT)
+    if not kols:
+        return f"No KOLs match “{html.escape(query)}”.", None
 
+    lines = [f"KOL search: “{html.escape(query)}”  ({len(kols)} shown)\n"]
+    for i, kol in enumerate(kols, start=1):
+        lines.append(_format_kol_line(kol, i, admin_view))
 
-def _get_visible_kols(admin_view: bool):
-    """Return KOLs visible to the user. Admins see all; others see only active."""
-    kols = get_all_kols()
-    if admin_view:
-        return kols
-    return [k for k in kols if k.get("is_active", True) and k.get("is_verified")]
+    back_view = _view(DEFAULT_SORT, 0, None)
+    rows = [
+        [InlineKeyboardButton(
+            f"{kol['name']}",
+            callback_data=f"kols:detail:{kol['telegram_id']}:{back_view}",
+        )]
+        for kol in kols
+    ]
+    return "\n".join(lines), InlineKeyboardMarkup(rows)
 
 
 async def kols_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Show the interactive KOL roster (public command)."""
+    """Show the interactive KOL roster (public command); /kols <query> searches it."""
     admin_view = is_admin(update.effective_user)
-    kols = _get_visible_kols(admin_view)
-    if not kols:
+    if context.args:
+        text, keyboard = _search_results(" ".join(context.args), admin_view)
+        await update.message.reply_text(text, reply_markup=keyboard, parse_mode="HTML")
+        return
+    text, keyboard = _list_page(DEFAULT_SORT, 0, None, admin_view)
+    if not text:
         await update.message.reply_text("No KOLs registered yet.")
         return
-
-    text, keyboard = _list_page(kols, 0, admin_view)
     await update.message.reply_text(text, reply_markup=keyboard, parse_mode="HTML")
 
 
@@ -157,27 +209,22 @@ async def kols_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     admin_view = is_admin(query.from_user)
     await query.answer()
 
-    data = query.data  # e.g. "kols:page:0", "kols:detail:123:0", "kols:toggle:123:0"
-    parts = data.split(":")
-
-    action = parts[1]
+    # e.g. "kols:page:f:2:12000,345", "kols:detail:123:f:2:12000,345", "kols:toggle:123:n:0:"
+    _, action, rest = query.data.split(":", 2)
 
     if action == "page":
-        page = int(parts[2])
-        kols = _get_visible_kols(admin_view)
-        if not kols:
+        text, keyboard = _list_page(*_parse_view(rest), admin_view)
+        if not text:
             await query.edit_message_text("No KOLs registered yet.")
             return
-        text, keyboard = _list_page(kols, page, admin_view)
         try:
             await query.edit_message_text(text, reply_markup=keyboard, parse_mode="HTML")
         except Exception:
             pass  # message unchanged (same page refresh, no new data)
 
     elif action == "detail":
-        telegram_id = int(parts[2])
-        back_page = int(parts[3])
-        kol = get_kol(telegram_id)
+        telegram_id, back_view = rest.split(":", 1)
+        kol = get_kol(int(telegram_id))
         if not kol:
             await query.edit_message_text("KOL not found.")
             return
@@ -185,23 +232,22 @@ async def kols_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not admin_view and not kol.get("is_active", True):
             await query.edit_message_text("KOL not found.")
             return
-        text, keyboard = _detail_view(kol, back_page, admin_view)
+        text, keyboard = _detail_view(kol, back_view, admin_view)
         await query.edit_message_text(text, reply_markup=keyboard, parse_mode="HTML")
 
     elif action == "toggle":
         if not admin_view:
             await query.edit_message_text("Admins only.")
             return
-        telegram_id = int(parts[2])
-        back_page = int(parts[3])
-        new_val = _toggle_active(telegram_id)
+        telegram_id, back_view = rest.split(":", 1)
+        new_val = toggle_kol_active(int(telegram_id))
         if new_val is None:
             await query.edit_message_text("KOL not found.")
             return
         status_text = "activated" if new_val else "deactivated"
         # Show updated detail view
-        kol = get_kol(telegram_id)
-        text, keyboard = _detail_view(kol, back_page, admin_view)
+        kol = get_kol(int(telegram_id))
+        text, keyboard = _detail_view(kol, back_view, admin_view)
         text = f"KOL {status_text}!\n\n" + text
         await query.edit_message_text(text, reply_markup=keyboard, parse_mode="HTML")
 
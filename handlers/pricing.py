@@ -13,10 +13,12 @@ from telegram.ext import (
 
 from db.tier_repo import get_all_tiers, get_tier, update_tier
 from handlers.common import require_admin, is_admin, format_cents
+from services import sessions
 
 logger = logging.getLogger(__name__)
 
 SHOW_TIERS, EDIT_RATE, EDIT_MIN, EDIT_MAX = range(4)
+SESSION = "pricing"
 
 
 @require_admin
@@ -56,8 +58,9 @@ async def tier_selected(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
         await query.edit_message_text("Tier not found.")
         return ConversationHandler.END
 
-    context.user_data["edit_tier_key"] = key
-    context.user_data["edit_tier"] = tier
+    session = sessions.scope(context, SESSION)
+    session["edit_tier_key"] = key
+    session["edit_tier"] = tier
 
     await query.edit_message_text(
         f"Editing: {tier['display_name']}\n\n"
@@ -75,22 +78,24 @@ async def rate_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
         dollars = float(text)
         if dollars <= 0:
             raise ValueError
-        context.user_data["new_rate"] = int(dollars * 100)
+        session = sessions.scope(context, SESSION)
+        session["new_rate"] = int(dollars * 100)
     except ValueError:
         await update.message.reply_text("Please enter a valid dollar amount (e.g. 25 or 12.50):")
         return EDIT_RATE
 
-    tier = context.user_data["edit_tier"]
+    tier = session["edit_tier"]
     await update.message.reply_text(
-        f"New rate: {format_cents(context.user_data['new_rate'])}/KOL\n\n"
+        f"New rate: {format_cents(session['new_rate'])}/KOL\n\n"
         f"Enter new minimum KOLs (currently {tier['min_kols']}), or /skip:"
     )
     return EDIT_MIN
 
 
 async def skip_rate(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["new_rate"] = None
-    tier = context.user_data["edit_tier"]
+    session = sessions.scope(context, SESSION)
+    session["new_rate"] = None
+    tier = session["edit_tier"]
     await update.message.reply_text(
         f"Rate unchanged.\n\n"
         f"Enter new minimum KOLs (currently {tier['min_kols']}), or /skip:"
@@ -104,12 +109,13 @@ async def min_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
         mn = int(text)
         if mn < 1:
             raise ValueError
-        context.user_data["new_min"] = mn
+        session = sessions.scope(context, SESSION)
+        session["new_min"] = mn
     except ValueError:
         await update.message.reply_text("Please enter a positive number:")
         return EDIT_MIN
 
-    tier = context.user_data["edit_tier"]
+    tier = session["edit_tier"]
     await update.message.reply_text(
         f"New min: {mn}\n\n"
         f"Enter new maximum KOLs (currently {tier['max_kols']}), or /skip:"
@@ -118,8 +124,9 @@ async def min_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
 
 
 async def skip_min(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["new_min"] = None
-    tier = context.user_data["edit_tier"]
+    session = sessions.scope(context, SESSION)
+    session["new_min"] = None
+    tier = session["edit_tier"]
     await update.message.reply_text(
         f"Min unchanged.\n\n"
         f"Enter new maximum KOLs (currently {tier['max_kols']}), or /skip:"
@@ -133,7 +140,7 @@ async def max_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
         mx = int(text)
         if mx < 1:
             raise ValueError
-        context.user_data["new_max"] = mx
+        sessions.scope(context, SESSION)["new_max"] = mx
     except ValueError:
         await update.message.reply_text("Please enter a positive number:")
         return EDIT_MAX
@@ -142,15 +149,16 @@ async def max_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
 
 
 async def skip_max(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["new_max"] = None
+    sessions.scope(context, SESSION)["new_max"] = None
     return await _save_tier(update, context)
 
 
 async def _save_tier(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    key = context.user_data["edit_tier_key"]
-    new_rate = context.user_data.get("new_rate")
-    new_min = context.user_data.get("new_min")
-    new_max = context.user_data.get("new_max")
+    session = sessions.scope(context, SESSION)
+    key = session["edit_tier_key"]
+    new_rate = session.get("new_rate")
+    new_min = session.get("new_min")
+    new_max = session.get("new_max")
 
     update_tier(key, per_kol_rate=new_rate, min_kols=new_min, max_kols=new_max)
 
@@ -172,7 +180,7 @@ async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
 
 def get_conversation_handler() -> ConversationHandler:
-    return ConversationHandler(
+    return sessions.scoped_conversation(SESSION, ConversationHandler(
         entry_points=[CommandHandler("pricing", pricing_start)],
         states={
             SHOW_TIERS: [CallbackQueryHandler(tier_selected, pattern=r"^pr_")],
@@ -191,4 +199,4 @@ def get_conversation_handler() -> ConversationHandler:
         },
         fallbacks=[CommandHandler("cancel", cancel)],
         allow_reentry=True,
-    )
+    ))
@@ -3,7 +3,6 @@
 Handles /start → role selection → KOL or Customer registration flow.
 """
 import logging
-import os
 import secrets
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
@@ -16,11 +15,11 @@ from telegram.ext import (
     filters,
 )
 
-from config import CHANNEL_LINK, POSTER_PATH
+from config import CHANNEL_LINK
 from db.kol_repo import save_kol, get_kol, update_kol_verification
 from db.customer_repo import save_customer
 from handlers.common import notify_admins
-from services import x_api
+from services import assets, sessions, x_api
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +35,7 @@ logger = logging.getLogger(__name__)
     CUST_X,
     CUST_TG,
 ) = range(9)
+SESSION = "registration"
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -45,19 +45,18 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
             InlineKeyboardButton("Register as Customer", callback_data="reg_customer"),
         ]
     ]
-    if os.path.exists(POSTER_PATH):
-        with open(POSTER_PATH, "rb") as photo:
-            await update.message.reply_photo(
-                photo=photo,
-                caption=(
-                    "Welcome to BrosOnPM Agency!\n"
-                    "The prediction markets amplification agency.\n\n"
-                    "Influencers — this is for you if you already talk about Polymarket on X.\n\n"
-                    "Customers — this is for you if you are building on top of Polymarket.\n\n"
-                    "How would you like to register?"
-                ),
-                reply_markup=InlineKeyboardMarkup(keyboard),
-            )
+    if assets.available("poster"):
+        await assets.send_photo(
+            context.bot, update.effective_chat.id, "poster",
+            caption=(
+                "Welcome to BrosOnPM Agency!\n"
+                "The prediction markets amplification agency.\n\n"
+                "Influencers — this is for you if you already talk about Polymarket on X.\n\n"
+                "Customers — this is for you if you are building on top of Polymarket.\n\n"
+                "How would you like to register?"
+            ),
+            reply_markup=InlineKeyboardMarkup(keyboard),
+        )
     else:
         await update.message.reply_text(
             "Welcome to BrosOnPM Agency!\n\nHow would you like to register?",
@@ -70,10 +69,11 @@ async def role_chosen(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
     query = update.callback_query
     await query.answer()
     user = query.from_user
-    context.user_data["telegram_handle"] = f"@{user.username}" if user.username else None
+    session = sessions.scope(context, SESSION)
+    session["telegram_handle"] = f"@{user.username}" if user.username else None
 
     if query.data == "reg_kol":
-        context.user_data["role"] = "kol"
+        session["role"] = "kol"
         existing = get_kol(user.id)
         if existing:
             await query.edit_message_caption(
@@ -90,7 +90,7 @@ async def role_chosen(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
         return KOL_NAME
 
     elif query.data == "reg_customer":
-        context.user_data["role"] = "customer"
+        session["role"] = "customer"
         await query.edit_message_caption(
             caption="Thanks for your interest in a campaign!\n\nWhat is your name?"
         )
@@ -102,7 +102,7 @@ async def role_chosen(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
 # --- KOL flow ---
 
 async def kol_name_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["name"] = update.message.text.strip()
+    sessions.scope(context, SESSION)["name"] = update.message.text.strip()
     await update.message.reply_text(
         "What is your X (Twitter) handle? (e.g. @yourhandle)"
     )
@@ -110,7 +110,7 @@ async def kol_name_received(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 
 async def kol_x_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["x_account"] = update.message.text.strip().lstrip("@")
+    sessions.scope(context, SESSION)["x_account"] = update.message.text.strip().lstrip("@")
     await update.message.reply_text(
         "What is your USDC wallet address on Base? (for payouts)"
     )
@@ -120,9 +120,10 @@ async def kol_x_received(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 async def kol_wallet_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     wallet_address = update.message.text.strip()
     user = update.effective_user
-    name = context.user_data["name"]
-    x_account = context.user_data["x_account"]
-    telegram_handle = context.user_data["telegram_handle"] or str(user.id)
+    session = sessions.scope(context, SESSION)
+    name = session["name"]
+    x_account = session["x_account"]
+    telegram_handle = session["telegram_handle"] or str(user.id)
 
     save_kol(
         telegram_id=user.id,
@@ -135,7 +136,7 @@ async def kol_wallet_received(update: Update, context: ContextTypes.DEFAULT_TYPE
     # If X API read access is available, offer verification
     if x_api.is_configured() and await x_api.is_read_available():
         code = secrets.token_hex(4).upper()
-        context.user_data["verify_code"] = code
+        session["verify_code"] = code
         await update.message.reply_text(
             f"Registration saved! Now let's verify your X account.\n\n"
             f"Please tweet the following code from @{x_account}:\n\n"
@@ -179,8 +180,9 @@ async def kol_verify_action(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     # reg_verify_check — attempt verification
     user = query.from_user
-    x_account = context.user_data.get("x_account", "")
-    code = context.user_data.get("verify_code", "")
+    session = sessions.scope(context, SESSION)
+    x_account = session.get("x_account", "")
+    code = session.get("verify_code", "")
 
     await query.edit_message_text("Checking your X account for the verification tweet...")
 
@@ -228,7 +230,7 @@ async def kol_verify_action(update: Update, context: ContextTypes.DEFAULT_TYPE)
 # --- Customer flow ---
 
 async def cust_name_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["name"] = update.message.text.strip()
+    sessions.scope(context, SESSION)["name"] = update.message.text.strip()
     await update.message.reply_text(
         "What is your project's X (Twitter) account? (e.g. @projecthandle)"
     )
@@ -236,9 +238,10 @@ async def cust_name_received(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 
 async def cust_x_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    context.user_data["project_x"] = update.message.text.strip().lstrip("@")
+    session = sessions.scope(context, SESSION)
+    session["project_x"] = update.message.text.strip().lstrip("@")
     user = update.effective_user
-    telegram_handle = context.user_data["telegram_handle"]
+    telegram_handle = session["telegram_handle"]
 
     if telegram_handle:
         return await _finish_customer(update, context, telegram_handle)
@@ -258,8 +261,9 @@ async def cust_tg_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -
 
 async def _finish_customer(update: Update, context: ContextTypes.DEFAULT_TYPE, telegram_handle: str) -> int:
     user = update.effective_user
-    name = context.user_data["name"]
-    project_x = context.user_data["project_x"]
+    session = sessions.scope(context, SESSION)
+    name = session["name"]
+    project_x = session["project_x"]
 
     save_customer(
         telegram_id=user.id,
@@ -314,7 +318,7 @@ async def skip(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
 
 def get_conversation_handler() -> ConversationHandler:
-    return ConversationHandler(
+    return sessions.scoped_conversation(SESSION, ConversationHandler(
         entry_points=[CommandHandler("start", start)],
         states={
             CHOOSE_ROLE: [CallbackQueryHandler(role_chosen, pattern="^reg_")],
@@ -331,4 +335,4 @@ def get_conversation_handler() -> ConversationHandler:
             CommandHandler("skip", skip),
         ],
         allow_reentry=True,
-    )
+    ))
@@ -1,7 +1,7 @@
 """FCFS campaign acceptance with database-level locking."""
 import logging
 
-from db.connection import get_conn, is_postgres, ph, dict_cursor
+from db.connection import get_conn, is_postgres, ph, begin_write, transactional
 from db import campaign_repo, acceptance_repo
 from db.kol_repo import get_kol
 from services import campaign_service
@@ -13,6 +13,7 @@ class AcceptanceError(Exception):
     pass
 
 
+@transactional
 def accept_campaign(campaign_id: int, kol_telegram_id: int) -> dict:
     """Atomically accept a campaign slot for a KOL.
 
@@ -35,12 +36,10 @@ def accept_campaign(campaign_id: int, kol_telegram_id: int) -> dict:
         cur = conn.cursor()
         p = ph()
 
+        begin_write(conn, cur)
         if is_postgres():
-            cur.execute("BEGIN")
             # Advisory lock scoped to this campaign
             cur.execute(f"SELECT pg_advisory_xact_lock({p})", (campaign_id,))
-        else:
-            conn.execute("BEGIN IMMEDIATE")
 
         # Re-check campaign state under lock
         cur.execute(
@@ -81,6 +80,7 @@ def accept_campaign(campaign_id: int, kol_telegram_id: int) -> dict:
             )
 
         conn.commit()
+        campaign_repo.notify_changed(campaign_id)
         logger.info(
             "KOL %s accepted campaign #%d (%d/%d)",
             kol_telegram_id, campaign_id, new_count, kol_count,
@@ -6,7 +6,7 @@ from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Bot
 from config import ANNOUNCEMENT_CHANNEL_ID
 from db.tier_repo import get_all_tiers
 from db.campaign_repo import set_announcement_message_id
-from handlers.common import format_cents
+from handlers.common import format_cents, send_campaign_media
 
 logger = logging.getLogger(__name__)
 
@@ -46,22 +46,10 @@ async def announce_campaign(bot: Bot, campaign: dict) -> str | None:
 
     try:
         # Send media first if attached
-        if campaign.get("media_file_id"):
-            try:
-                await bot.send_photo(
-                    chat_id=ANNOUNCEMENT_CHANNEL_ID,
-                    photo=campaign["media_file_id"],
-                    caption=f"Media for Campaign #{campaign['id']}"
-                )
-            except Exception:
-                try:
-                    await bot.send_document(
-                        chat_id=ANNOUNCEMENT_CHANNEL_ID,
-                        document=campaign["media_file_id"],
-                        caption=f"Media for Campaign #{campaign['id']}"
-                    )
-                except Exception as me:
-                    logger.warning("Could not send campaign media to channel: %s", me)
+        await send_campaign_media(
+            bot, ANNOUNCEMENT_CHANNEL_ID, campaign.get("media_file_id"),
+            caption=f"Media for Campaign #{campaign['id']}", media_kind=campaign.get("media_kind"),
+        )
 
         msg = await bot.send_message(
             chat_id=ANNOUNCEMENT_CHANNEL_ID,
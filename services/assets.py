@@ -0,0 +1,97 @@
+"""Static images the bot sends, uploaded once and re-sent by Telegram file_id.
+
+The first send of an asset uploads the file. The file_id Telegram returns is
+stored in telegram_assets with a hash of the file and the bot's id, and later
+sends pass the file_id so Telegram reuses its copy. A changed file, a
+different bot, or Telegram rejecting the file_id each lead to one fresh
+upload. warm() loads the registry at startup and, when ASSET_UPLOAD_CHAT_ID
+is set, uploads whatever is missing there, so not even the first /start
+uploads.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+
+from telegram.error import BadRequest
+
+from config import ASSET_UPLOAD_CHAT_ID, POSTER_PATH
+from db import asset_repo
+
+logger = logging.getLogger(__name__)
+
+# Asset name -> file on disk
+ASSETS = {
+    "poster": POSTER_PATH,
+}
+
+_file_ids = {}  # name -> file_id for this bot and the file's current content
+_hashes = {}    # name -> sha256 of the file on disk
+_locks = {}     # name -> asyncio.Lock, so concurrent first sends upload once
+
+
+def available(name: str) -> bool:
+    return os.path.exists(ASSETS[name])
+
+
+def _hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _load(bot_id: int):
+    hashes = {name: _hash(path) for name, path in ASSETS.items() if os.path.exists(path)}
+    file_ids = {
+        a.name: a.file_id
+        for a in asset_repo.get_all_assets()
+        if a.bot_id == bot_id and hashes.get(a.name) == a.content_hash
+    }
+    return hashes, file_ids
+
+
+async def warm(bot):
+    """Load the registry (and pre-upload missing assets to ASSET_UPLOAD_CHAT_ID)."""
+    hashes, file_ids = await asyncio.to_thread(_load, bot.id)
+    _hashes.update(hashes)
+    _file_ids.update(file_ids)
+    missing = [name for name in hashes if name not in file_ids]
+    logger.info("Telegram assets: %d reusable, %d to upload", len(file_ids), len(missing))
+    if not ASSET_UPLOAD_CHAT_ID:
+        return
+    for name in missing:
+        try:
+            message = await send_photo(bot, ASSET_UPLOAD_CHAT_ID, name, disable_notification=True)
+            await message.delete()
+        except Exception as e:
+            logger.warning("Could not pre-upload asset %s to %s: %s", name, ASSET_UPLOAD_CHAT_ID, e)
+
+
+async def send_photo(bot, chat_id, name: str, **kwargs):
+    """Send asset *name* as a photo, by file_id once one is known. Returns the Message."""
+    file_id = _file_ids.get(name)
+    if file_id:
+        try:
+            return await bot.send_photo(chat_id=chat_id, photo=file_id, **kwargs)
+        except BadRequest as e:
+            if "file" not in e.message.lower():
+                raise
+            logger.warning("Telegram rejected the file_id of asset %s (%s); re-uploading", name, e.message)
+            if _file_ids.get(name) == file_id:
+                del _file_ids[name]
+
+    async with _locks.setdefault(name, asyncio.Lock()):
+        file_id = _file_ids.get(name)
+        if file_id:
+            # Another send uploaded it while we waited
+            return await bot.send_photo(chat_id=chat_id, photo=file_id, **kwargs)
+
+        path = ASSETS[name]
+        if name not in _hashes:
+            _hashes[name] = await asyncio.to_thread(_hash, path)
+        with open(path, "rb") as photo:
+            message = await bot.send_photo(chat_id=chat_id, photo=photo, **kwargs)
+        if message.photo:
+            _file_ids[name] = message.photo[-1].file_id
+            asset_repo.save_asset(name, _file_ids[name], _hashes[name], bot.id)
+            logger.info("Uploaded asset %s; its file_id will be reused", name)
+        return message
@@ -0,0 +1,163 @@
+"""New-campaign DM alerts to opted-in KOLs.
+
+activate_campaign queues a campaign_broadcasts row in the same transaction
+that makes the campaign live. The scheduler leader sends it: active KOLs
+subscribed to the campaign's service type (/alerts) are read BATCH_SIZE at a
+time in telegram_id order and DMed as bulk sends, which the bot's rate
+limiter paces at ALERT_SEND_RATE behind replies to users (services.rate_limit).
+The last KOL reached is saved after every batch, so a restart or a new leader
+resumes the broadcast where it stopped; at most one batch is alerted twice
+after a crash. A broadcast stops early once the campaign fills or is no
+longer live, checked every batch and whenever a campaign_repo listener
+reports a change.
+"""
+import asyncio
+import logging
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import Forbidden, RetryAfter, TelegramError
+
+from db import alert_repo, campaign_repo
+from db.connection import on_commit
+from db.tier_repo import get_all_tiers
+from handlers.common import format_cents
+from services import leader
+from services.rate_limit import BULK
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+RESUME_INTERVAL = 60  # seconds between checks for broadcasts this process is not sending
+
+_tasks = {}       # campaign_id -> asyncio.Task sending its broadcast
+_changed = set()  # campaign ids written since their sender last looked
+
+
+def _on_campaign_changed(campaign_id):
+    """campaign_repo listener: have the sender re-check the campaign before its next DM."""
+    if campaign_id in _tasks:
+        _changed.add(campaign_id)
+
+
+campaign_repo.add_listener(_on_campaign_changed)
+
+
+def _accepting(campaign) -> bool:
+    return bool(campaign) and campaign["status"] == "live" and (campaign["accepted_count"] or 0) < campaign["kol_count"]
+
+
+def _alert(campaign):
+    """Text and keyboard of the DM for *campaign*."""
+    tier = get_all_tiers().get(campaign["service_type"], (campaign["service_type"],))
+    text = (
+        f"New campaign #{campaign['id']}: {campaign['project_name']}\n\n"
+        f"Service: {tier[0]}\n"
+        f"Rate: {format_cents(campaign['per_kol_rate'])} per KOL\n"
+        f"Spots: {campaign['kol_count']} — first come, first served\n"
+        f"Deadline: {str(campaign['deadline'])[:16]}\n\n"
+        "Use /alerts to choose which campaigns you hear about."
+    )
+    keyboard = InlineKeyboardMarkup([
+        [InlineKeyboardButton("Accept Campaign", callback_data=f"accept_campaign:{campaign['id']}")]
+    ])
+    return text, keyboard
+
+
+async def _send(bot, chat_id: int, text: str, keyboard) -> bool:
+    """DM one KOL, waiting out Telegram's flood control. Returns True if delivered."""
+    while True:
+        try:
+            await bot.send_message(chat_id=chat_id, text=text, reply_markup=keyboard, rate_limit_args=BULK)
+            return True
+        except RetryAfter:
+            continue  # the rate limiter holds the next attempt until retry_after has passed
+        except Forbidden:
+            # Blocked the bot or deleted their account: stop alerting them
+            await asyncio.to_thread(alert_repo.set_alert_services, chat_id, ())
+            return False
+        except TelegramError as e:
+            logger.warning("Could not send campaign alert to %s: %s", chat_id, e)
+            return False
+
+
+async def _recipients(service_type: str, after: int):
+    while True:
+        ids = await asyncio.to_thread(alert_repo.get_alert_recipients, service_type, after, BATCH_SIZE)
+        for kol_id in ids:
+            yield kol_id
+        if len(ids) < BATCH_SIZE:
+            return
+        after = ids[-1]
+
+
+async def _broadcast(application, b):
+    """Send (or resume) one campaign's broadcast, saving progress every batch."""
+    campaign_id = b.campaign_id
+    last, sent, failed = b.last_kol_telegram_id, b.sent_count, b.failed_count
+    status = "running"
+    campaign = text = keyboard = None
+    since_check = BATCH_SIZE
+    try:
+        async for kol_id in _recipients(b.service_type, last):
+            if not (application.running and leader.is_leader()):
+                return  # picked up again after the restart, or by the new leader
+            if since_check >= BATCH_SIZE or campaign_id in _changed:
+                _changed.discard(campaign_id)
+                if campaign is not None:
+                    await asyncio.to_thread(alert_repo.save_broadcast_progress, campaign_id, last, sent, failed)
+                campaign = await asyncio.to_thread(campaign_repo.get_campaign, campaign_id)
+                if not _accepting(campaign):
+                    status = "stopped"
+                    return
+                if text is None:
+                    text, keyboard = _alert(campaign)
+                since_check = 0
+            if await _send(application.bot, kol_id, text, keyboard):
+                sent += 1
+            else:
+                failed += 1
+            last = kol_id
+            since_check += 1
+        status = "done"
+    finally:
+        _tasks.pop(campaign_id, None)
+        _changed.discard(campaign_id)
+        await asyncio.to_thread(alert_repo.save_broadcast_progress, campaign_id, last, sent, failed, status)
+        if status != "running":
+            logger.info("Campaign #%d alerts %s: %d sent, %d failed", campaign_id, status, sent, failed)
+
+
+async def resume(application) -> int:
+    """Start a sender for every running broadcast this process is not already sending."""
+    started = 0
+    for b in await asyncio.to_thread(alert_repo.get_running_broadcasts):
+        if b.campaign_id not in _tasks:
+            # Not Application.create_task: stop() would wait for the whole broadcast
+            _tasks[b.campaign_id] = asyncio.create_task(_broadcast(application, b))
+            started += 1
+    return started
+
+
+@leader.leader_only("campaign_alerts")
+async def resume_job(context):
+    """Periodic and on-activation job: send queued and interrupted broadcasts."""
+    started = await resume(context.application)
+    if started:
+        logger.info("Sending new-campaign alerts for %d campaign(s)", started)
+
+
+def kick(job_queue):
+    """Start sending right after the activating transaction commits."""
+    if job_queue:
+        on_commit(lambda: job_queue.run_once(resume_job, 0, name="campaign_alerts"))
+
+
+leader.on_elected(kick)
+
+
+async def stop():
+    """Cancel the senders (shutdown); their progress is saved as they exit."""
+    tasks = list(_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
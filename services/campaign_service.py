@@ -4,7 +4,8 @@ from datetime import datetime
 
 from config import PLATFORM_FEE_PERCENT
 from db.tier_repo import get_all_tiers
-from db import campaign_repo
+from db import alert_repo, campaign_repo
+from db.connection import transactional
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +34,9 @@ def create_campaign(data: dict) -> int:
     return campaign_id
 
 
+@transactional
 def activate_campaign(campaign_id: int) -> dict | None:
-    """Transition campaign from pending_payment → live."""
+    """Transition campaign from pending_payment → live and queue its KOL alerts."""
     campaign = campaign_repo.get_campaign(campaign_id)
     if not campaign or campaign["status"] != "pending_payment":
         return None
@@ -42,6 +44,7 @@ def activate_campaign(campaign_id: int) -> dict | None:
         campaign_id, "live",
         extra_fields={"activated_at": datetime.utcnow().isoformat()},
     )
+    alert_repo.create_broadcast(campaign_id, campaign["service_type"])
     logger.info("Campaign #%d activated", campaign_id)
     return campaign_repo.get_campaign(campaign_id)
 
@@ -61,16 +64,16 @@ def complete_campaign(campaign_id: int):
     logger.info("Campaign #%d completed", campaign_id)
 
 
-def expire_campaigns():
-    """Expire all live/filled campaigns past their deadline. Returns count."""
+def expire_campaigns() -> list:
+    """Expire all live/filled campaigns past their deadline. Returns the expired campaigns."""
     now = datetime.utcnow().isoformat()
-    expired = campaign_repo.get_expired_campaigns(now)
+    expired = campaign_repo.expire_due_campaigns(now)
     for c in expired:
-        campaign_repo.update_campaign_status(c["id"], "expired")
         logger.info("Campaign #%d expired", c["id"])
-    return len(expired)
+    return expired
 
 
+@transactional
 def cancel_campaign(campaign_id: int) -> bool:
     campaign = campaign_repo.get_campaign(campaign_id)
     if not campaign or campaign["status"] not in ("pending_payment", "live"):
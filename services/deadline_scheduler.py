@@ -0,0 +1,125 @@
+"""Exact-time campaign expiry.
+
+Keeps an in-memory min-heap of (deadline, campaign_id) for live/filled
+campaigns and arms a single one-shot job for the earliest deadline. When it
+fires, every overdue campaign is expired in one ``UPDATE ... RETURNING``
+and the channel posts of the expired campaigns are edited in a debounced
+batch. The heap is rebuilt from the (status, deadline) index at startup and
+periodically resynced so campaigns activated elsewhere are picked up.
+
+Every replica tracks deadlines, but only the scheduler leader expires
+campaigns; a newly elected leader rebuilds the heap to catch up.
+"""
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timezone
+
+from db.campaign_repo import get_upcoming_deadlines, get_campaign
+from services import leader
+from services.campaign_service import expire_campaigns
+
+logger = logging.getLogger(__name__)
+
+ANNOUNCE_DEBOUNCE = 5  # seconds to collect expiries before editing channel posts
+ANNOUNCE_EDIT_INTERVAL = 3  # seconds between channel edits (Telegram per-chat limits)
+RESYNC_INTERVAL = 900  # seconds between heap rebuilds from the DB
+
+_heap = []  # (deadline: datetime, campaign_id: int)
+_armed_for = None  # deadline the current job fires at
+_job = None
+_pending_announcements = set()
+_announce_job = None
+
+
+def _to_datetime(value) -> datetime:
+    """Normalise a DB deadline (naive UTC datetime or ISO string) to a naive UTC datetime."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def rebuild(job_queue):
+    """Reload the heap from the DB and re-arm the expiry job."""
+    global _heap
+    _heap = [(_to_datetime(deadline), cid) for cid, deadline in get_upcoming_deadlines()]
+    heapq.heapify(_heap)
+    logger.info("Deadline scheduler tracking %d campaign(s)", len(_heap))
+    _arm(job_queue, force=True)
+
+
+def schedule(job_queue, campaign: dict):
+    """Track a newly live campaign's deadline."""
+    heapq.heappush(_heap, (_to_datetime(campaign["deadline"]), campaign["id"]))
+    _arm(job_queue)
+
+
+def _arm(job_queue, force: bool = False):
+    """Make sure the one-shot job fires at the earliest tracked deadline."""
+    global _job, _armed_for
+    if not job_queue:
+        return
+    earliest = _heap[0][0] if _heap else None
+    if not force and earliest == _armed_for:
+        return
+    if _job is not None:
+        _job.schedule_removal()
+        _job = None
+    _armed_for = earliest
+    if earliest is None:
+        return
+    delay = max(0.0, (earliest - datetime.utcnow()).total_seconds())
+    _job = job_queue.run_once(_fire, when=delay, name="campaign_deadline")
+
+
+async def _fire(context):
+    """Expire everything that is due and re-arm for the next deadline."""
+    global _job, _armed_for
+    _job = None
+    _armed_for = None
+    now = datetime.utcnow()
+    while _heap and _heap[0][0] <= now:
+        heapq.heappop(_heap)
+    await _expire_due(context)
+    _arm(context.job_queue)
+
+
+@leader.leader_only("campaign_deadline")
+async def _expire_due(context):
+    expired = expire_campaigns()
+    if expired:
+        logger.info("Expired %d campaign(s)", len(expired))
+        _queue_announcements(context.job_queue, [c["id"] for c in expired if c.get("announcement_message_id")])
+
+
+async def resync_job(context):
+    """Periodic safety net: rebuild the heap from the DB."""
+    rebuild(context.job_queue)
+
+
+leader.on_elected(rebuild)
+
+
+def _queue_announcements(job_queue, campaign_ids):
+    global _announce_job
+    _pending_announcements.update(campaign_ids)
+    if _pending_announcements and _announce_job is None:
+        _announce_job = job_queue.run_once(_flush_announcements, when=ANNOUNCE_DEBOUNCE)
+
+
+async def _flush_announcements(context):
+    """Edit the channel posts of every campaign expired since the last flush."""
+    global _announce_job
+    from services.announcement_service import update_announcement
+
+    _announce_job = None
+    ids = sorted(_pending_announcements)
+    _pending_announcements.clear()
+    for i, campaign_id in enumerate(ids):
+        if i > 0:
+            await asyncio.sleep(ANNOUNCE_EDIT_INTERVAL)
+        campaign = get_campaign(campaign_id)
+        if campaign:
+            await update_announcement(context.bot, campaign)
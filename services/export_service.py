@@ -0,0 +1,91 @@
+"""Streaming CSV export of the main tables.
+
+Rows are pulled in batches (a named server-side cursor on Postgres,
+``fetchmany`` on SQLite) and written straight into a gzip-compressed temp
+file, so memory stays flat regardless of table size. The sync work is
+meant to run in a worker thread via ``asyncio.to_thread``.
+"""
+import csv
+import gzip
+import logging
+import os
+import tempfile
+
+from db.connection import get_conn, is_postgres, ph
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 2000
+
+# table -> exported columns (id first; it is the incremental-export marker)
+EXPORT_TABLES = {
+    "kols": [
+        "id", "name", "x_account", "wallet_address", "telegram_handle", "telegram_id",
+        "follower_count", "is_verified", "is_active", "reputation_score", "registered_at",
+    ],
+    "customers": [
+        "id", "name", "project_x_account", "telegram_handle", "telegram_id",
+        "wallet_address", "registered_at",
+    ],
+    "campaigns": [
+        "id", "customer_telegram_id", "project_name", "service_type", "target_url",
+        "kol_count", "accepted_count", "per_kol_rate", "platform_fee", "total_cost",
+        "status", "deadline", "created_at", "activated_at", "completed_at",
+    ],
+    "campaign_acceptances": [
+        "id", "campaign_id", "kol_telegram_id", "status", "submission_tweet_url",
+        "payout_status", "payout_tx_hash", "payout_batch_id",
+        "accepted_at", "submitted_at", "verified_at", "paid_at",
+    ],
+}
+
+
+def export_table(table: str, since_id: int | None = None) -> dict:
+    """Stream *table* into a gzip CSV temp file.
+
+    Args:
+        since_id: only export rows with id greater than this (incremental delta).
+            Deltas capture newly inserted rows; updates to older rows only show
+            up in a full export.
+
+    Returns ``{"path", "rows", "last_id"}``. The caller deletes the file.
+    """
+    columns = EXPORT_TABLES[table]
+    sql = f"SELECT {', '.join(columns)} FROM {table}"
+    params = ()
+    if since_id:
+        sql += f" WHERE id > {ph()}"
+        params = (since_id,)
+    sql += " ORDER BY id"
+
+    fd, path = tempfile.mkstemp(prefix=f"{table}_", suffix=".csv.gz")
+    os.close(fd)
+    rows = 0
+    last_id = since_id
+    conn = get_conn()
+    try:
+        if is_postgres():
+            cur = conn.cursor(name=f"export_{table}")
+            cur.itersize = BATCH_SIZE
+        else:
+            cur = conn.cursor()
+        cur.execute(sql, params)
+        with gzip.open(path, "wt", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            while True:
+                batch = cur.fetchmany(BATCH_SIZE)
+                if not batch:
+                    break
+                writer.writerows(batch)
+                rows += len(batch)
+                last_id = batch[-1][0]
+        cur.close()
+    except Exception:
+        os.unlink(path)
+        raise
+    finally:
+        conn.close()
+
+    logger.info("Exported %d row(s) from %s", rows, table)
+    return {"path": path, "rows": rows, "last_id": last_id}
@@ -0,0 +1,58 @@
+"""Stack-frame helpers shared by the loop watchdog and the sampling profiler."""
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+_LIBRARY_MARKERS = ("site-packages", "dist-packages", os.sep + ".venv" + os.sep, os.sep + "venv" + os.sep)
+
+
+def is_project_file(filename: str) -> bool:
+    return filename.startswith(PROJECT_ROOT) and not any(m in filename for m in _LIBRARY_MARKERS)
+
+
+def frame_label(frame) -> str:
+    """'module.function' for a frame, e.g. 'campaign_repo.get_live_campaigns'."""
+    code = frame.f_code
+    if is_project_file(code.co_filename):
+        module = os.path.splitext(code.co_filename[len(PROJECT_ROOT):])[0].replace(os.sep, ".")
+        module = module.rsplit(".", 1)[-1]
+    else:
+        module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}.{code.co_name}"
+
+
+def walk(frame) -> list:
+    """Frames from the outermost caller down to *frame*."""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+def collapsed_stack(frame) -> str:
+    """Semicolon-joined stack (outermost first), the collapsed format flame graph tools read."""
+    return ";".join(frame_label(f) for f in walk(frame))
+
+
+def blocking_site(frame) -> tuple[str, str]:
+    """(offender, origin) for a stack: the innermost project function and the
+    outermost handler (or project) function that led to it."""
+    project = [f for f in walk(frame) if is_project_file(f.f_code.co_filename)]
+    if not project:
+        return (frame_label(frame) if frame is not None else "?", "?")
+    offender = frame_label(project[-1])
+    handlers = [f for f in project if os.sep + "handlers" + os.sep in f.f_code.co_filename]
+    origin = frame_label(handlers[0] if handlers else project[0])
+    return offender, origin
+
+
+def format_stack(frame, limit: int = 12) -> str:
+    """Readable project-only stack, innermost last."""
+    lines = []
+    for f in walk(frame):
+        if is_project_file(f.f_code.co_filename):
+            lines.append(f"  {frame_label(f)} ({os.path.relpath(f.f_code.co_filename, PROJECT_ROOT)}:{f.f_lineno})")
+    if frame is not None and not is_project_file(frame.f_code.co_filename):
+        lines.append(f"  -> {frame_label(frame)}")
+    return "\n".join(lines[-limit:])
@@ -8,6 +8,9 @@ from services.x_api import check_tweet_exists, extract_tweet_id
 
 logger = logging.getLogger(__name__)
 
+# Spacing between X lookups to stay under the read rate limit
+CHECK_INTERVAL_SECONDS = 9
+
 
 async def run_integrity_check(progress_callback=None):
     """Check recently verified tweets and ban KOLs who deleted them.
@@ -54,7 +57,7 @@ async def run_integrity_check(progress_callback=None):
     for i, (tweet_id, accs) in enumerate(tweet_map.items()):
         # Rate limit: ~9 seconds between calls
         if i > 0:
-            await asyncio.sleep(9)
+            await asyncio.sleep(CHECK_INTERVAL_SECONDS)
 
         exists = await check_tweet_exists(tweet_id)
 
@@ -0,0 +1,218 @@
+"""In-memory KOL search over name, X account and Telegram handle.
+
+The index is built from the roster at startup and kept current by a
+kol_repo listener that re-reads a KOL after every write in this process;
+rebuild_job picks up writes made by other replicas. Every match tier has its
+own postings (id sets): exact handles and names, handle prefixes and word
+prefixes (up to PREFIX_MAX characters), and trigrams of each whole field for
+substring queries. search() takes the tiers best first and only sorts what it
+returns, so broad queries cost about as much as narrow ones. It never touches
+the database.
+"""
+import asyncio
+import bisect
+import logging
+import re
+import threading
+import time
+
+from telegram.ext import ContextTypes
+
+from db import kol_repo
+
+logger = logging.getLogger(__name__)
+
+PREFIX_MAX = 12
+REBUILD_INTERVAL = 600
+# Tiers with more candidates than this are walked in roster order instead of sorted
+SORT_MAX = 256
+
+_WORD = re.compile(r"\w+")
+
+_lock = threading.Lock()
+_kols = {}              # telegram_id -> Kol
+_fields = {}            # telegram_id -> (name, x_account, telegram_handle), normalized
+_keys = {}              # telegram_id -> ((index, key), ...) it is posted under
+_public = set()         # active, verified KOLs
+_handles = {}           # exact x_account / telegram_handle -> {telegram_id}
+_names = {}             # exact name -> {telegram_id}
+_handle_prefixes = {}   # x_account / telegram_handle prefix -> {telegram_id}
+_word_prefixes = {}     # name / handle word prefix -> {telegram_id}
+_trigrams = {}          # trigram of any field -> {telegram_id}
+_order = []             # (-follower_count, id, telegram_id), most followers first
+_built = False
+
+
+def _normalize(text) -> str:
+    return (text or "").strip().lstrip("@").casefold()
+
+
+def _trigrams_of(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _prefixes_of(text: str) -> set:
+    return {text[:n] for n in range(1, min(len(text), PREFIX_MAX) + 1)}
+
+
+def _sort_key(telegram_id):
+    kol = _kols[telegram_id]
+    return -(kol.follower_count or 0), kol.id
+
+
+def _add(kol, ordered: bool = True):
+    fields = name, x_account, handle = (
+        _normalize(kol.name), _normalize(kol.x_account), _normalize(kol.telegram_handle),
+    )
+    postings = (
+        (_names, {name} if name else set()),
+        (_handles, {h for h in (x_account, handle) if h}),
+        (_handle_prefixes, {p for h in (x_account, handle) for p in _prefixes_of(h)}),
+        (_word_prefixes, {p for word in _WORD.findall(" ".join(fields)) for p in _prefixes_of(word)}),
+        (_trigrams, {g for field in fields for g in _trigrams_of(field)}),
+    )
+    keys = [(index, key) for index, index_keys in postings for key in index_keys]
+
+    tid = kol.telegram_id
+    _kols[tid] = kol
+    _fields[tid] = fields
+    _keys[tid] = tuple(keys)
+    for index, key in keys:
+        index.setdefault(key, set()).add(tid)
+    if kol.is_active and kol.is_verified:
+        _public.add(tid)
+    if ordered:
+        bisect.insort(_order, _sort_key(tid) + (tid,))
+
+
+def _remove(telegram_id):
+    keys = _keys.pop(telegram_id, None)
+    if keys is None:
+        return
+    del _order[bisect.bisect_left(_order, _sort_key(telegram_id) + (telegram_id,))]
+    del _kols[telegram_id], _fields[telegram_id]
+    _public.discard(telegram_id)
+    for index, key in keys:
+        ids = index[key]
+        ids.discard(telegram_id)
+        if not ids:
+            del index[key]
+
+
+def build():
+    """(Re)build the index from the whole roster."""
+    global _built
+    started = time.perf_counter()
+    kols = kol_repo.get_all_kols()
+    with _lock:
+        for index in (_kols, _fields, _keys, _public, _handles, _names,
+                      _handle_prefixes, _word_prefixes, _trigrams, _order):
+            index.clear()
+        for kol in kols:
+            _add(kol, ordered=False)
+        _order.extend(_sort_key(tid) + (tid,) for tid in _kols)
+        _order.sort()
+        _built = True
+    logger.info(
+        "KOL search index: %d KOLs, %d word prefixes, %d trigrams in %.0f ms",
+        len(_kols), len(_word_prefixes), len(_trigrams), (time.perf_counter() - started) * 1000,
+    )
+
+
+def refresh(telegram_id):
+    """Re-index one KOL from the database (kol_repo listener)."""
+    if not _built:
+        return
+    kol = kol_repo.get_kol(telegram_id)
+    with _lock:
+        _remove(telegram_id)
+        if kol is not None:
+            _add(kol)
+
+
+kol_repo.add_listener(refresh)
+
+
+async def rebuild_job(context: ContextTypes.DEFAULT_TYPE):
+    """Periodic rebuild so KOL writes made by other replicas show up."""
+    await asyncio.to_thread(build)
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def _postings(index: dict, keys) -> set:
+    """Ids posted under every one of *keys*."""
+    found = None
+    for key in sorted(keys, key=lambda k: len(index.get(k, ()))):
+        ids = index.get(key)
+        if not ids:
+            return set()
+        found = set(ids) if found is None else found & ids
+        if not found:
+            break
+    return found or set()
+
+
+def _tiers(query: str):
+    """(candidate ids, check) per match tier, best first; check confirms a
+    candidate where the postings only approximate the tier (long queries)."""
+    yield _handles.get(query, set()), None
+    yield _names.get(query, set()), None
+
+    yield _handle_prefixes.get(query[:PREFIX_MAX], set()), (
+        (lambda f: f[1].startswith(query) or f[2].startswith(query)) if len(query) > PREFIX_MAX else None
+    )
+
+    words = _WORD.findall(query)
+    long_words = [w for w in words if len(w) > PREFIX_MAX]
+    yield _postings(_word_prefixes, {w[:PREFIX_MAX] for w in words}), (
+        (lambda f: all(any(fw.startswith(w) for fw in _WORD.findall(" ".join(f))) for w in long_words))
+        if long_words else None
+    )
+
+    if len(query) >= 3:
+        yield _postings(_trigrams, _trigrams_of(query)), (
+            (lambda f: query in f[0] or query in f[1] or query in f[2]) if len(query) > 3 else None
+        )
+
+
+def _top(ids: set, n: int, check) -> list:
+    """Up to *n* of *ids* passing *check*, most followers first."""
+    if len(ids) <= SORT_MAX:
+        ranked = sorted(ids, key=_sort_key)
+    else:
+        ranked = (entry[2] for entry in _order if entry[2] in ids)
+    found = []
+    for tid in ranked:
+        if check is None or check(_fields[tid]):
+            found.append(tid)
+            if len(found) == n:
+                break
+    return found
+
+
+def search(query: str, public: bool = True, limit: int = 10) -> list:
+    """KOLs matching *query*, best first: exact handle, exact name, handle prefix,
+    word prefix, substring; ties by follower count. *public* keeps only active,
+    verified KOLs. Returns kol_repo Kol rows.
+    """
+    query = _normalize(query)
+    if not query:
+        return []
+    if not _built:
+        build()
+    with _lock:
+        found, seen = [], set()
+        for ids, check in _tiers(query):
+            if public:
+                ids = ids & _public
+            if seen:
+                ids = ids - seen
+            for tid in _top(ids, limit - len(found), check):
+                found.append(tid)
+                seen.add(tid)
+            if len(found) >= limit:
+                break
+        return [_kols[tid] for tid in found]
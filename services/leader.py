@@ -0,0 +1,204 @@
+"""Lease-based leader election for scheduled jobs.
+
+Every replica registers the same jobs, but only the current leader runs
+them. On Postgres leadership is a session-level advisory lock held by a
+dedicated connection (released the moment the process or connection dies);
+on SQLite it is a row in ``leader_lease`` that must be renewed before it
+expires. Renewal runs every few seconds, so a standby takes over within
+roughly ``LEASE_TTL`` seconds at worst.
+"""
+import inspect
+import logging
+import os
+import socket
+import time
+import uuid
+from functools import wraps
+
+from db.connection import connect, get_conn, is_postgres, ph
+from db.instrumentation import handler_scope
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "scheduler"
+LEASE_TTL = 15  # seconds (SQLite lease)
+RENEW_INTERVAL = 5  # seconds
+ADVISORY_LOCK_KEY = 0x42524F53  # "BROS"
+
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+_is_leader = False
+_pg_conn = None  # dedicated connection holding the advisory lock
+_on_elected = []  # callables(job_queue) run when this instance becomes leader
+_stats = {}  # job name -> run statistics
+
+
+def is_leader() -> bool:
+    return _is_leader
+
+
+def on_elected(callback):
+    """Register *callback(job_queue)* to run whenever this instance gains leadership."""
+    _on_elected.append(callback)
+
+
+def _try_acquire_pg() -> bool:
+    global _pg_conn
+    try:
+        reconnected = _pg_conn is None or _pg_conn.closed
+        if reconnected:
+            _pg_conn = connect()
+            _pg_conn.autocommit = True
+        cur = _pg_conn.cursor()
+        if _is_leader and not reconnected:
+            cur.execute("SELECT 1")  # liveness: the lock lives as long as this connection
+            return True
+        # A new session holds no lock, even if we were leader on the old one
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (ADVISORY_LOCK_KEY,))
+        return bool(cur.fetchone()[0])
+    except Exception as e:
+        logger.warning("Leader lease connection failed: %s", e)
+        try:
+            _pg_conn.close()
+        except Exception:
+            pass
+        _pg_conn = None
+        return False
+
+
+def _try_acquire_sqlite() -> bool:
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    now = time.time()
+    try:
+        cur.execute(
+            f"INSERT OR IGNORE INTO leader_lease (name, holder, expires_at) VALUES ({p}, '', 0)",
+            (LEASE_NAME,),
+        )
+        cur.execute(
+            f"""
+            UPDATE leader_lease SET holder = {p}, expires_at = {p}
+            WHERE name = {p} AND (holder = {p} OR expires_at < {p})
+            """,
+            (INSTANCE_ID, now + LEASE_TTL, LEASE_NAME, INSTANCE_ID, now),
+        )
+        acquired = cur.rowcount == 1
+        conn.commit()
+        return acquired
+    except Exception as e:
+        logger.warning("Leader lease renewal failed: %s", e)
+        conn.rollback()
+        return False
+    finally:
+        conn.close()
+
+
+async def renew_job(context):
+    """Acquire or renew leadership; fire on_elected callbacks on transition."""
+    global _is_leader
+    acquired = _try_acquire_pg() if is_postgres() else _try_acquire_sqlite()
+    if acquired and not _is_leader:
+        _is_leader = True
+        logger.info("Instance %s is now the scheduler leader", INSTANCE_ID)
+        for callback in _on_elected:
+            try:
+                callback(context.job_queue)
+            except Exception as e:
+                logger.error("on_elected callback failed: %s", e)
+    elif not acquired and _is_leader:
+        _is_leader = False
+        logger.warning("Instance %s lost scheduler leadership", INSTANCE_ID)
+
+
+def release():
+    """Give up leadership (called on shutdown) so a standby takes over immediately."""
+    global _is_leader, _pg_conn
+    if not _is_leader:
+        return
+    _is_leader = False
+    if is_postgres():
+        if _pg_conn is not None:
+            try:
+                _pg_conn.close()
+            except Exception:
+                pass
+            _pg_conn = None
+        return
+    conn = get_conn()
+    cur = conn.cursor()
+    p = ph()
+    cur.execute(
+        f"UPDATE leader_lease SET expires_at = 0 WHERE name = {p} AND holder = {p}",
+        (LEASE_NAME, INSTANCE_ID),
+    )
+    conn.commit()
+    conn.close()
+
+
+def start(job_queue):
+    """Begin competing for leadership and start counting missed job runs."""
+    job_queue.run_repeating(renew_job, interval=RENEW_INTERVAL, first=0, name="leader_lease")
+    try:
+        from apscheduler.events import EVENT_JOB_MISSED
+
+        def _on_missed(event):
+            job = job_queue.scheduler.get_job(event.job_id)
+            name = job.name if job else event.job_id
+            _job_stats(name)["missed"] += 1
+
+        job_queue.scheduler.add_listener(_on_missed, EVENT_JOB_MISSED)
+    except Exception as e:
+        logger.warning("Could not track missed job runs: %s", e)
+
+
+def _job_stats(name: str) -> dict:
+    return _stats.setdefault(name, {
+        "runs": 0,
+        "failures": 0,
+        "skipped": 0,   # fired on a non-leader
+        "missed": 0,    # misfired, or fired while the previous run was still going
+        "running": False,
+        "last_run_at": None,
+        "last_duration": 0.0,
+        "total_duration": 0.0,
+    })
+
+
+def leader_only(name: str):
+    """Decorator for job callbacks: run only on the leader and record run statistics."""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(context):
+            stats = _job_stats(name)
+            if not _is_leader:
+                stats["skipped"] += 1
+                return
+            if stats["running"]:
+                stats["missed"] += 1
+                logger.warning("Job %s still running; skipping this run", name)
+                return
+            stats["running"] = True
+            started = time.monotonic()
+            try:
+                with handler_scope(f"job:{name}"):
+                    result = func(context)
+                    if inspect.isawaitable(result):
+                        await result
+            except Exception:
+                stats["failures"] += 1
+                raise
+            finally:
+                duration = time.monotonic() - started
+                stats["running"] = False
+                stats["runs"] += 1
+                stats["last_run_at"] = time.time()
+                stats["last_duration"] = duration
+                stats["total_duration"] += duration
+        return wrapper
+    return decorator
+
+
+def get_job_stats() -> dict:
+    """Snapshot of per-job statistics."""
+    return {name: dict(s) for name, s in _stats.items()}
@@ -0,0 +1,145 @@
+"""In-memory index of open live campaigns for inline queries.
+
+Inline queries arrive on every keystroke, from any chat, so they must not
+each run get_live_campaigns. The index is reloaded at most once per
+MIN_REFRESH seconds after a campaign_repo listener marks it dirty (status
+change, slot taken), and every REFRESH_TTL seconds regardless, with a single
+reload in flight however many queries are waiting. Campaigns are kept best
+first (highest rate, then soonest deadline), so a query is one filtering pass.
+"""
+import asyncio
+import logging
+import re
+import time
+
+from db import campaign_repo
+from db.tier_repo import get_all_tiers
+
+logger = logging.getLogger(__name__)
+
+REFRESH_TTL = 30
+MIN_REFRESH = 2
+
+_campaigns = []   # open live campaigns, best first
+_services = {}    # service key -> display name
+_loaded_at = float("-inf")
+_dirty = True
+_lock = asyncio.Lock()
+_reloads = 0
+
+# Rate bounds in dollars: ">$20", ">=20", "<$50", "$15" (at least $15); a bare number is a word
+_RATE = re.compile(r"^(>=|<=|>|<)?(\$)?(\d+(?:\.\d{1,2})?)$")
+_SLOTS = re.compile(r"^(?:slots?|spots?)(>=|>|=|:)?(\d+)$")
+
+
+def invalidate(campaign_id=None):
+    """Mark the index stale (campaign_repo listener)."""
+    global _dirty
+    _dirty = True
+
+
+campaign_repo.add_listener(invalidate)
+
+
+def _stale(now: float) -> bool:
+    age = now - _loaded_at
+    return age >= REFRESH_TTL or (_dirty and age >= MIN_REFRESH)
+
+
+def _load():
+    rows = campaign_repo.get_live_campaigns()
+    tiers = get_all_tiers()
+    open_rows = [c for c in rows if c.status == "live" and (c.accepted_count or 0) < c.kol_count]
+    open_rows.sort(key=lambda c: (-c.per_kol_rate, str(c.deadline)))
+    return open_rows, {key: tier[0] for key, tier in tiers.items()}
+
+
+async def get_campaigns() -> list:
+    """The open live campaigns, reloading the index first if it is stale."""
+    global _campaigns, _services, _loaded_at, _dirty, _reloads
+    if _stale(time.monotonic()):
+        async with _lock:
+            if _stale(time.monotonic()):
+                _dirty = False  # invalidations during the reload mark it dirty again
+                _campaigns, _services = await asyncio.to_thread(_load)
+                _loaded_at = time.monotonic()
+                _reloads += 1
+                logger.debug("Live campaign index reloaded: %d open campaign(s)", len(_campaigns))
+    return _campaigns
+
+
+def service_name(service_type: str) -> str:
+    return _services.get(service_type, service_type)
+
+
+def get_stats() -> dict:
+    return {
+        "campaigns": len(_campaigns),
+        "reloads": _reloads,
+        "age_s": time.monotonic() - _loaded_at,
+        "dirty": _dirty,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Queries: "retweet", ">$20", "<=50", "slots>=5", "thread >$50 moon"
+# ---------------------------------------------------------------------------
+
+def _service_matches(word: str) -> set:
+    exact = {key for key in _services if key == word}
+    if exact:
+        return exact
+    if len(word) < 3:
+        return set()
+    return {
+        key for key, name in _services.items()
+        if key.startswith(word) or re.sub(r"\W", "", name.casefold()).startswith(word)
+    }
+
+
+def parse_query(text: str) -> dict:
+    """Filters from an inline query: service types, rate bounds (cents), min open slots, words."""
+    q = {"services": set(), "min_rate": None, "max_rate": None, "min_slots": 1, "words": []}
+    for word in text.casefold().split():
+        rate = _RATE.match(word)
+        slots = _SLOTS.match(word)
+        if rate and (rate.group(1) or rate.group(2)):
+            op = rate.group(1) or ">="
+            cents = round(float(rate.group(3)) * 100)
+            if op == ">":
+                q["min_rate"] = cents + 1
+            elif op == ">=":
+                q["min_rate"] = cents
+            elif op == "<":
+                q["max_rate"] = cents - 1
+            else:
+                q["max_rate"] = cents
+        elif slots:
+            q["min_slots"] = int(slots.group(2)) + (1 if slots.group(1) == ">" else 0)
+        elif services := _service_matches(word):
+            q["services"] |= services
+        else:
+            q["words"].append(word.lstrip("#@"))
+    return q
+
+
+def _matches(c, q: dict) -> bool:
+    if q["services"] and c.service_type not in q["services"]:
+        return False
+    if q["min_rate"] is not None and c.per_kol_rate < q["min_rate"]:
+        return False
+    if q["max_rate"] is not None and c.per_kol_rate > q["max_rate"]:
+        return False
+    if c.kol_count - (c.accepted_count or 0) < q["min_slots"]:
+        return False
+    if q["words"]:
+        text = " ".join(filter(None, (c.project_name, c.hashtags, c.mentions))).casefold()
+        return all(w in text for w in q["words"])
+    return True
+
+
+async def search(text: str) -> list:
+    """Open live campaigns matching an inline query, best first."""
+    campaigns = await get_campaigns()
+    q = parse_query(text)
+    return [c for c in campaigns if _matches(c, q)]
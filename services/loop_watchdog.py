@@ -0,0 +1,116 @@
+"""Event-loop lag watchdog.
+
+A heartbeat task on the event loop ticks every HEARTBEAT_INTERVAL seconds. A
+watcher thread notices when a tick is late by more than LOOP_LAG_THRESHOLD_MS,
+samples the loop thread's stack while it stays blocked, and charges the
+blocked time to the innermost project function and the handler that called
+it (e.g. ``campaign_repo.get_live_campaigns`` from
+``campaign_browse.browse_campaigns``). Each event is logged; /blocking shows
+the totals.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+
+from config import LOOP_LAG_THRESHOLD_MS
+from services.frames import blocking_site, format_stack
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL = 0.05
+POLL_INTERVAL = 0.02
+THREAD_NAME = "loop-watchdog"
+
+_lock = threading.Lock()
+_sites = {}  # (offender, origin) -> {"blocked_s", "events", "max_s"}
+_summary = {"events": 0, "blocked_s": 0.0, "max_lag_s": 0.0, "since": time.time()}
+
+_last_beat = 0.0
+_loop_thread_id = None
+_heartbeat_task = None
+_stop = threading.Event()
+
+
+async def _heartbeat():
+    global _last_beat
+    while True:
+        _last_beat = time.monotonic()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+
+def _watch():
+    threshold = LOOP_LAG_THRESHOLD_MS / 1000
+    event = None
+    while not _stop.wait(POLL_INTERVAL):
+        beat = _last_beat
+        now = time.monotonic()
+        lag = now - (beat + HEARTBEAT_INTERVAL)
+        if event is not None and beat != event["beat"]:
+            _finish(event)
+            event = None
+        if lag < threshold:
+            continue
+        frame = sys._current_frames().get(_loop_thread_id)
+        site = blocking_site(frame)
+        if event is None:
+            # Charge the lag accrued before we noticed to the first sample
+            event = {"beat": beat, "last": now - lag, "sites": {}, "stack": format_stack(frame), "site": site}
+        event["sites"][site] = event["sites"].get(site, 0.0) + now - event["last"]
+        event["last"] = now
+        del frame
+
+
+def _finish(event):
+    blocked = sum(event["sites"].values())
+    with _lock:
+        _summary["events"] += 1
+        _summary["blocked_s"] += blocked
+        _summary["max_lag_s"] = max(_summary["max_lag_s"], blocked)
+        for site, seconds in event["sites"].items():
+            s = _sites.setdefault(site, {"blocked_s": 0.0, "events": 0, "max_s": 0.0})
+            s["blocked_s"] += seconds
+            s["events"] += 1
+            s["max_s"] = max(s["max_s"], seconds)
+    offender, origin = event["site"]
+    logger.warning(
+        "Event loop blocked for %.0f ms in %s (from %s):\n%s",
+        blocked * 1000, offender, origin, event["stack"],
+    )
+
+
+def start():
+    """Start the heartbeat on the running loop and the watcher thread."""
+    global _loop_thread_id, _heartbeat_task, _last_beat
+    if _heartbeat_task is not None or LOOP_LAG_THRESHOLD_MS <= 0:
+        return
+    _loop_thread_id = threading.get_ident()
+    _last_beat = time.monotonic()
+    _stop.clear()
+    _heartbeat_task = asyncio.get_running_loop().create_task(_heartbeat())
+    threading.Thread(target=_watch, name=THREAD_NAME, daemon=True).start()
+    logger.info("Event-loop watchdog started (threshold %d ms)", LOOP_LAG_THRESHOLD_MS)
+
+
+def stop():
+    global _heartbeat_task
+    _stop.set()
+    if _heartbeat_task is not None:
+        _heartbeat_task.cancel()
+        _heartbeat_task = None
+
+
+def get_blocking_stats() -> tuple[dict, list]:
+    """(summary, [(offender, origin, stats), ...] sorted by blocked time)."""
+    with _lock:
+        sites = [(o, g, dict(s)) for (o, g), s in _sites.items()]
+        summary = dict(_summary)
+    sites.sort(key=lambda item: item[2]["blocked_s"], reverse=True)
+    return summary, sites
+
+
+def reset_stats():
+    with _lock:
+        _sites.clear()
+        _summary.update(events=0, blocked_s=0.0, max_lag_s=0.0, since=time.time())
@@ -0,0 +1,239 @@
+"""Per-update latency metrics published in Prometheus text format.
+
+A TypeHandler in the first handler group starts a tally for each update and
+one in the last group records it: end-to-end duration plus the number of DB
+queries and Bot API calls the update made, all labelled by command or
+callback prefix. ``METRICS_PORT`` serves the histograms at ``/metrics``.
+"""
+import contextvars
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from telegram import Update
+from telegram.ext import CommandHandler, ContextTypes, ConversationHandler, TypeHandler
+from telegram.request import HTTPXRequest
+
+from config import METRICS_HOST, METRICS_PORT
+from db import instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Handler groups for the timing middleware: before and after every real handler
+START_GROUP = -100
+FINISH_GROUP = 100
+
+# Callback data prefixes used as labels (first match wins)
+CALLBACK_PREFIXES = ("adm:", "kols:", "fc:", "alerts:", "accept_campaign:", "sub_pick:", "cc_", "pr_", "reg_")
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Labelled histogram rendered in Prometheus exposition format."""
+
+    def __init__(self, name: str, doc: str, buckets: tuple, label: str = "handler"):
+        self.name = name
+        self.doc = doc
+        self.buckets = buckets
+        self.label = label
+        self._series = {}  # label value -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, value: float):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for value, series in items:
+            lbl = f'{self.label}="{_escape(value)}"'
+            for bound, n in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{lbl},le="{bound}"}} {n}')
+            lines.append(f'{self.name}_bucket{{{lbl},le="+Inf"}} {series[-1]}')
+            lines.append(f"{self.name}_sum{{{lbl}}} {series[-2]}")
+            lines.append(f"{self.name}_count{{{lbl}}} {series[-1]}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+update_duration = Histogram(
+    "bot_update_duration_seconds", "End-to-end time to process one update.", DURATION_BUCKETS
+)
+update_db_queries = Histogram(
+    "bot_update_db_queries", "DB queries issued while processing one update.", COUNT_BUCKETS
+)
+update_api_calls = Histogram(
+    "bot_update_api_calls", "Bot API requests made while processing one update.", COUNT_BUCKETS
+)
+api_call_duration = Histogram(
+    "bot_api_request_duration_seconds", "Bot API request latency.", DURATION_BUCKETS, label="method"
+)
+
+HISTOGRAMS = [update_duration, update_db_queries, update_api_calls, api_call_duration]
+
+
+# ---------------------------------------------------------------------------
+# Per-update tally
+# ---------------------------------------------------------------------------
+
+class _Tally:
+    __slots__ = ("label", "started", "db_queries", "api_calls", "finished")
+
+    def __init__(self, label: str):
+        self.label = label
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.api_calls = 0
+        self.finished = False
+
+
+_current_tally = contextvars.ContextVar("metrics_update_tally", default=None)
+
+# Command names the application handles; any other "/..." text is labelled "other"
+_commands = set()
+
+
+def register_commands(application):
+    """Record the application's command names (call once its handlers are added)."""
+    def collect(handlers):
+        for handler in handlers:
+            if isinstance(handler, CommandHandler):
+                _commands.update(handler.commands)
+            elif isinstance(handler, ConversationHandler):
+                collect(handler.entry_points)
+                collect(handler.fallbacks)
+                for state_handlers in handler.states.values():
+                    collect(state_handlers)
+
+    for handlers in application.handlers.values():
+        collect(handlers)
+
+
+def update_label(update: object) -> str:
+    """Label for an update: the registered command or the known callback prefix.
+
+    Labels must come from a fixed set: every one is a Prometheus series.
+    """
+    if not isinstance(update, Update):
+        return "other"
+    if update.callback_query:
+        data = update.callback_query.data or ""
+        for prefix in CALLBACK_PREFIXES:
+            if data.startswith(prefix):
+                return prefix
+        return "callback"
+    if update.inline_query:
+        return "inline"
+    message = update.effective_message
+    text = message and (message.text or message.caption)
+    if text and text.startswith("/"):
+        command = text.split()[0][1:].split("@", 1)[0].lower()
+        return f"/{command}" if command in _commands else "other"
+    return "message"
+
+
+async def start_update(update: object, context: ContextTypes.DEFAULT_TYPE):
+    _current_tally.set(_Tally(update_label(update)))
+
+
+async def finish_update(update: object, context: ContextTypes.DEFAULT_TYPE):
+    record_current()
+
+
+def record_current():
+    """Record the running update's tally (once); safe to call more than once."""
+    tally = _current_tally.get()
+    if tally is None or tally.finished:
+        return
+    tally.finished = True
+    update_duration.observe(tally.label, time.perf_counter() - tally.started)
+    update_db_queries.observe(tally.label, tally.db_queries)
+    update_api_calls.observe(tally.label, tally.api_calls)
+
+
+def _count_query(template: str, elapsed_ms: float):
+    tally = _current_tally.get()
+    if tally is not None:
+        tally.db_queries += 1
+
+
+instrumentation.add_query_listener(_count_query)
+
+
+def get_handlers():
+    """Timing middleware; register each handler in its own group."""
+    return [
+        (TypeHandler(object, start_update), START_GROUP),
+        (TypeHandler(object, finish_update), FINISH_GROUP),
+    ]
+
+
+class CountingHTTPXRequest(HTTPXRequest):
+    """HTTPXRequest that counts and times Bot API calls for the running update."""
+
+    async def do_request(self, url, method, *args, **kwargs):
+        api_method = url.rsplit("/", 1)[-1]
+        tally = _current_tally.get()
+        if tally is not None:
+            tally.api_calls += 1
+        started = time.perf_counter()
+        try:
+            return await super().do_request(url, method, *args, **kwargs)
+        finally:
+            api_call_duration.observe(api_method, time.perf_counter() - started)
+
+
+# ---------------------------------------------------------------------------
+# HTTP endpoint
+# ---------------------------------------------------------------------------
+
+def render() -> str:
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    """Serve /metrics on METRICS_PORT in a daemon thread (no-op if the port is 0)."""
+    if not METRICS_PORT:
+        return None
+    try:
+        server = ThreadingHTTPServer((METRICS_HOST, METRICS_PORT), _MetricsHandler)
+    except OSError as e:
+        logger.warning("Metrics endpoint not started on %s:%d: %s", METRICS_HOST, METRICS_PORT, e)
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info("Serving Prometheus metrics on http://%s:%d/metrics", METRICS_HOST, METRICS_PORT)
+    return server
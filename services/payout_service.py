@@ -0,0 +1,60 @@
+"""KOL payout bookkeeping and payment notifications."""
+import asyncio
+import csv
+import io
+import logging
+
+from handlers.common import format_cents
+
+logger = logging.getLogger(__name__)
+
+# Stay under Telegram's ~30 messages/second global bot limit
+_SEND_INTERVAL = 0.05
+
+
+async def notify_kols_paid(bot, rows: list[dict]) -> int:
+    """DM each KOL once, summarising every payout in *rows* that belongs to them.
+
+    *rows* are the dicts returned by the bulk mark-paid repo functions.
+    Returns the number of KOLs successfully notified.
+    """
+    by_kol = {}
+    for r in rows:
+        by_kol.setdefault(r["kol_telegram_id"], []).append(r)
+
+    notified = 0
+    for i, (kol_id, kol_rows) in enumerate(by_kol.items()):
+        if i > 0:
+            await asyncio.sleep(_SEND_INTERVAL)
+        total = sum(r["per_kol_rate"] for r in kol_rows)
+        lines = ["Payment sent!\n"]
+        for r in kol_rows:
+            lines.append(f"Campaign #{r['campaign_id']}: {r['project_name']} — {format_cents(r['per_kol_rate'])}")
+        lines.append(f"\nTotal: {format_cents(total)} USDC")
+        tx_hashes = sorted({r["tx_hash"] for r in kol_rows if r.get("tx_hash")})
+        if tx_hashes:
+            lines.append("Tx: " + ", ".join(tx_hashes))
+        lines.append(
+            "\nThe payment has been sent to your registered wallet. "
+            "Thank you for your work!"
+        )
+        try:
+            await bot.send_message(chat_id=kol_id, text="\n".join(lines))
+            notified += 1
+        except Exception as e:
+            logger.warning("Could not notify KOL %s about payment: %s", kol_id, e)
+    return notified
+
+
+def build_batch_file(entries: list[dict]) -> io.BytesIO:
+    """Render per-wallet batch totals as a multisend CSV.
+
+    One ``address,amount`` line per wallet with the amount in USDC
+    (e.g. ``0xabc…,25.00``), the format accepted by Disperse-style
+    multisend contracts.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    for e in entries:
+        writer.writerow([e["wallet_address"], f"{e['amount_cents'] / 100:.2f}"])
+    return io.BytesIO(buf.getvalue().encode("utf-8"))
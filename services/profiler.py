@@ -0,0 +1,86 @@
+"""On-demand sampling profiler for the live process.
+
+Samples the stack of every thread (the event loop running async handlers and
+the worker threads running sync DB work) at a fixed interval and aggregates
+them as collapsed stacks, the input format of flamegraph.pl / speedscope.
+Idle threads (the loop waiting in select, pool workers waiting for work) and
+the watchdog's and profiler's own threads are left out, so the profile only
+shows work.
+"""
+import sys
+import threading
+import time
+from collections import Counter
+
+from services.frames import frame_label, is_project_file, walk
+from services.loop_watchdog import THREAD_NAME as WATCHDOG_THREAD
+
+SAMPLE_INTERVAL = 0.005
+MAX_SECONDS = 120
+
+# Innermost frames of a thread that is waiting rather than working
+_IDLE_FRAMES = {"selectors.select", "threading.wait", "queue.get", "thread._worker"}
+
+_running = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Another profile is already being collected."""
+
+
+def sample(seconds: float, interval: float = SAMPLE_INTERVAL) -> dict:
+    """Sample all threads for *seconds* (blocking; run it off the event loop).
+
+    Returns {"stacks": Counter(collapsed stack -> samples), "project": Counter(
+    function -> samples it was the innermost project frame), "samples": int,
+    "seconds": float}.
+    """
+    if not _running.acquire(blocking=False):
+        raise ProfilerBusy()
+    try:
+        me = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        stacks = Counter()
+        project = Counter()
+        rounds = 0
+        started = time.monotonic()
+        deadline = started + min(seconds, MAX_SECONDS)
+        while time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                name = names.get(ident, str(ident))
+                if name == WATCHDOG_THREAD or frame_label(frame) in _IDLE_FRAMES:
+                    continue
+                frames = walk(frame)
+                labels = [frame_label(f) for f in frames]
+                stacks[";".join([name] + labels)] += 1
+                own = [f for f in frames if is_project_file(f.f_code.co_filename)]
+                if own:
+                    project[frame_label(own[-1])] += 1
+            del frame
+            rounds += 1
+            time.sleep(interval)
+        return {
+            "stacks": stacks,
+            "project": project,
+            "samples": rounds,
+            "seconds": time.monotonic() - started,
+        }
+    finally:
+        _running.release()
+
+
+def collapsed(result: dict) -> bytes:
+    """Render a sample result as collapsed-stack text ("stack count" per line)."""
+    lines = [f"{stack} {count}" for stack, count in result["stacks"].most_common()]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def top_functions(result: dict, limit: int = 10) -> list[tuple[str, float]]:
+    """Project functions by self time: share of sampling rounds some thread was
+    in them, or in library code they called."""
+    rounds = result["samples"] or 1
+    return [(name, count / rounds) for name, count in result["project"].most_common(limit)]
@@ -0,0 +1,83 @@
+"""One send budget for the whole bot, with bulk sends going last.
+
+Telegram allows a bot about GLOBAL_RATE messages per second in total. Every
+message-sending Bot API call goes through BotRateLimiter (installed with
+ApplicationBuilder.rate_limiter): replies to users take a token from the
+shared bucket and only wait when it is empty, while bulk sends
+(``rate_limit_args=BULK``, the campaign alerts) are spaced ALERT_SEND_RATE per
+second and also wait while fewer than BULK_RESERVE tokens would be left for
+replies. A 429 holds every send for its retry_after; replies are then retried
+once, bulk callers get the RetryAfter and send again themselves.
+"""
+import asyncio
+import logging
+import time
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+from config import ALERT_SEND_RATE
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_RATE = 30
+BULK_RESERVE = 5
+BULK = "bulk"
+
+# Calls that deliver or change a message; answers to queries and reads are not limited
+_LIMITED_PREFIXES = ("send", "edit", "copy", "forward")
+
+
+class BotRateLimiter(BaseRateLimiter):
+    def __init__(self, rate: float = GLOBAL_RATE, bulk_rate: float = ALERT_SEND_RATE,
+                 bulk_reserve: float = BULK_RESERVE):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.bulk_interval = 1 / bulk_rate
+        self.bulk_reserve = bulk_reserve
+        self._next_bulk = 0.0
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def _take(self, keep: float):
+        """Take a token, waiting until one more than *keep* is available and any 429 pause is over."""
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1 + keep:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 + keep - self.tokens) / self.rate)
+
+    async def _space_bulk(self):
+        now = time.monotonic()
+        slot = max(now, self._next_bulk)
+        self._next_bulk = slot + self.bulk_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def process_request(self, callback, args, kwargs, endpoint, data, rate_limit_args):
+        if not endpoint.startswith(_LIMITED_PREFIXES):
+            return await callback(*args, **kwargs)
+        bulk = rate_limit_args == BULK
+        if bulk:
+            await self._space_bulk()
+        for attempt in range(2):
+            await self._take(self.bulk_reserve if bulk else 0)
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                self.paused_until = max(self.paused_until, time.monotonic() + e.retry_after)
+                logger.warning("Telegram flood control on %s; holding sends for %ss", endpoint, e.retry_after)
+                if bulk or attempt:
+                    raise
@@ -0,0 +1,203 @@
+"""Bounded per-user session state.
+
+Conversation data lives in one dict per conversation under
+``context.user_data[<scope>]``. scoped_conversation() creates that dict when
+the conversation is entered and drops it when a callback returns END, so
+nothing outlives the flow that wrote it. A TypeHandler records when each user
+was last seen; evict_job drops users idle longer than SESSION_TTL_SECONDS and
+then the least recently seen ones beyond SESSION_MAX_USERS, ending their
+scoped conversations along with their data.
+"""
+import logging
+import sys
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from telegram import Update
+from telegram.ext import ContextTypes, ConversationHandler, TypeHandler
+
+from config import SESSION_MAX_USERS, SESSION_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Runs right after the metrics middleware, before every real handler
+TOUCH_GROUP = -90
+EVICT_INTERVAL = 300
+
+_last_seen = OrderedDict()  # user_id -> monotonic time, least recent first
+_evicted = {"ttl": 0, "lru": 0}
+_conversations = []  # every scoped_conversation, so eviction can end them
+
+
+def scope(context: ContextTypes.DEFAULT_TYPE, name: str) -> dict:
+    """Return the user's data dict for conversation *name*."""
+    return context.user_data.setdefault(name, {})
+
+
+def clear(context: ContextTypes.DEFAULT_TYPE, name: str):
+    context.user_data.pop(name, None)
+
+
+def scoped_conversation(name: str, conversation: ConversationHandler) -> ConversationHandler:
+    """Tie ``user_data[name]`` to the lifetime of *conversation*.
+
+    Entry points start with a fresh dict; any callback returning END drops it.
+    A state callback whose dict has gone (the session was evicted) ends the
+    conversation with a message instead of failing on missing keys.
+    """
+    for handler in conversation.entry_points:
+        handler.callback = _wrap_entry(name, handler.callback)
+    for handlers in conversation.states.values():
+        for handler in handlers:
+            handler.callback = _wrap_state(name, handler.callback)
+    for handler in conversation.fallbacks:
+        handler.callback = _wrap_fallback(name, handler.callback)
+    _conversations.append(conversation)
+    return conversation
+
+
+def _wrap_entry(name, callback):
+    @wraps(callback)
+    async def wrapper(update, context):
+        context.user_data[name] = {}
+        result = await callback(update, context)
+        if result is None or result == ConversationHandler.END:
+            clear(context, name)
+        return result
+    return wrapper
+
+
+def _wrap_state(name, callback):
+    @wraps(callback)
+    async def wrapper(update, context):
+        if name not in context.user_data:
+            if update.callback_query:
+                await update.callback_query.answer()
+            await update.effective_message.reply_text(
+                "This session has expired. Please start again."
+            )
+            return ConversationHandler.END
+        result = await callback(update, context)
+        if result == ConversationHandler.END:
+            clear(context, name)
+        return result
+    return wrapper
+
+
+def _wrap_fallback(name, callback):
+    @wraps(callback)
+    async def wrapper(update, context):
+        result = await callback(update, context)
+        if result == ConversationHandler.END:
+            clear(context, name)
+        return result
+    return wrapper
+
+
+# ---------------------------------------------------------------------------
+# Idle-session eviction
+# ---------------------------------------------------------------------------
+
+async def touch(update: object, context: ContextTypes.DEFAULT_TYPE):
+    user = update.effective_user if isinstance(update, Update) else None
+    if user is None:
+        return
+    _last_seen[user.id] = time.monotonic()
+    _last_seen.move_to_end(user.id)
+
+
+def get_handlers():
+    """Last-seen tracker; register in TOUCH_GROUP."""
+    return [(TypeHandler(object, touch), TOUCH_GROUP)]
+
+
+def _end_conversations(user_ids: set):
+    """End the scoped conversations of *user_ids*, whose data is being dropped.
+
+    ConversationHandler keeps a state per (chat, user) key; left behind, it
+    would grow without bound and leave the user in a state with no data.
+    """
+    for conversation in _conversations:
+        if not conversation.per_user:
+            continue
+        position = 1 if conversation.per_chat else 0
+        # No public API removes a key; _update_state(END) is what the handler itself uses
+        for key in [k for k in conversation._conversations if k[position] in user_ids]:
+            conversation._update_state(ConversationHandler.END, key)
+
+
+def _drop(application, user_ids: set):
+    for user_id in user_ids:
+        application.drop_user_data(user_id)
+    _end_conversations(user_ids)
+
+
+def evict(application, now: float | None = None) -> tuple[int, int]:
+    """Drop idle and least-recently-seen users' data and conversations. Returns (ttl, lru) counts."""
+    now = time.monotonic() if now is None else now
+    dropped = set()
+    while _last_seen:
+        user_id, seen = next(iter(_last_seen.items()))
+        if now - seen < SESSION_TTL_SECONDS:
+            break
+        _last_seen.popitem(last=False)
+        dropped.add(user_id)
+    ttl = len(dropped)
+    while len(_last_seen) > SESSION_MAX_USERS:
+        user_id, _ = _last_seen.popitem(last=False)
+        dropped.add(user_id)
+    lru = len(dropped) - ttl
+    if dropped:
+        _drop(application, dropped)
+    _evicted["ttl"] += ttl
+    _evicted["lru"] += lru
+    return ttl, lru
+
+
+async def evict_job(context: ContextTypes.DEFAULT_TYPE):
+    ttl, lru = evict(context.application)
+    if ttl or lru:
+        logger.info("Evicted %d idle and %d least-recent user session(s)", ttl, lru)
+
+
+def _deep_size(obj, seen=None) -> int:
+    """Approximate memory held by *obj*, following containers and slotted objects (rows)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(v, seen) for v in obj)
+    else:
+        for cls in type(obj).__mro__:
+            slots = cls.__dict__.get("__slots__", ())
+            for slot in (slots,) if isinstance(slots, str) else slots:
+                value = None if slot.startswith("__") else getattr(obj, slot, None)
+                if value is not None:
+                    size += _deep_size(value, seen)
+    return size
+
+
+def get_session_stats(application) -> dict:
+    """Users held in memory and approximate bytes per user_data key."""
+    categories = {}
+    empty = 0
+    for data in list(application.user_data.values()):
+        if not data:
+            empty += 1
+        for key, value in list(data.items()):
+            entry = categories.setdefault(key, {"users": 0, "bytes": 0})
+            entry["users"] += 1
+            entry["bytes"] += _deep_size(value)
+    return {
+        "users": len(application.user_data),
+        "tracked": len(_last_seen),
+        "empty": empty,
+        "categories": categories,
+        "evicted_ttl": _evicted["ttl"],
+        "evicted_lru": _evicted["lru"],
+    }
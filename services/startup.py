@@ -0,0 +1,82 @@
+"""Startup timing: phases measured from process start and reported once as JSON.
+
+bot.py imports this module first, so the clock starts before the heavy
+telegram / handler imports.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_T0 = time.perf_counter()
+_lock = threading.Lock()
+_phases = []  # {"name", "start_s", "duration_s", "thread"}
+_background = {}  # name -> Future
+
+
+def _record(name: str, started: float):
+    ended = time.perf_counter()
+    with _lock:
+        _phases.append({
+            "name": name,
+            "start_s": round(started - _T0, 3),
+            "duration_s": round(ended - started, 3),
+            "thread": threading.current_thread().name,
+        })
+
+
+def mark(name: str):
+    """Record a phase that began at process start (e.g. module imports)."""
+    _record(name, _T0)
+
+
+@contextmanager
+def phase(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, started)
+
+
+async def timed(name: str, awaitable):
+    """Await *awaitable* as phase *name* (use with asyncio.gather for concurrent steps)."""
+    with phase(name):
+        return await awaitable
+
+
+def run_in_background(name: str, func) -> Future:
+    """Start *func* in a daemon thread as phase *name*; ``wait(name)`` joins it."""
+    future = Future()
+
+    def target():
+        with phase(name):
+            try:
+                future.set_result(func())
+            except BaseException as e:
+                future.set_exception(e)
+
+    _background[name] = future
+    threading.Thread(target=target, name=f"startup-{name}", daemon=True).start()
+    return future
+
+
+async def wait(name: str):
+    """Await a background phase from the event loop; re-raises its exception."""
+    future = _background.get(name)
+    if future is not None:
+        return await asyncio.wrap_future(future)
+
+
+def report() -> dict:
+    """Log the timing breakdown as one structured line and return it."""
+    with _lock:
+        phases = sorted(_phases, key=lambda p: p["start_s"])
+    data = {"ready_s": round(time.perf_counter() - _T0, 3), "phases": phases}
+    logger.info("Startup timing: %s", json.dumps(data))
+    return data
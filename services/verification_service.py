@@ -3,6 +3,7 @@ import json
 import logging
 
 from db import acceptance_repo, campaign_repo
+from db.connection import transactional, unit_of_work
 from db.kol_repo import get_kol
 from services import x_api
 from services.campaign_service import complete_campaign
@@ -18,25 +19,28 @@ async def verify_submission(acceptance_id: int, tweet_url: str) -> dict:
       - reason: str
       - auto: bool (True if auto-verified, False if needs manual review)
     """
-    acceptance = acceptance_repo.get_acceptance_by_id(acceptance_id)
-    if not acceptance:
-        return {"verified": False, "reason": "Acceptance not found.", "auto": False}
+    # One connection and one commit for the reads and the 'submitted' write;
+    # the X API calls below run outside any transaction
+    with unit_of_work():
+        acceptance = acceptance_repo.get_acceptance_by_id(acceptance_id)
+        if not acceptance:
+            return {"verified": False, "reason": "Acceptance not found.", "auto": False}
 
-    campaign = campaign_repo.get_campaign(acceptance["campaign_id"])
-    if not campaign:
-        return {"verified": False, "reason": "Campaign not found.", "auto": False}
+        campaign = campaign_repo.get_campaign(acceptance["campaign_id"])
+        if not campaign:
+            return {"verified": False, "reason": "Campaign not found.", "auto": False}
 
-    kol = get_kol(acceptance["kol_telegram_id"])
-    tweet_id = x_api.extract_tweet_id(tweet_url)
+        kol = get_kol(acceptance["kol_telegram_id"])
 
-    # Update the submission URL
-    acceptance_repo.update_acceptance_status(
-        acceptance_id, "submitted",
-        extra_fields={
-            "submission_tweet_url": tweet_url,
-            "submitted_at": __import__("datetime").datetime.utcnow().isoformat(),
-        },
-    )
+        # Update the submission URL
+        acceptance_repo.update_acceptance_status(
+            acceptance_id, "submitted",
+            extra_fields={
+                "submission_tweet_url": tweet_url,
+                "submitted_at": __import__("datetime").datetime.utcnow().isoformat(),
+            },
+        )
+    tweet_id = x_api.extract_tweet_id(tweet_url)
 
     # If X API is not configured, go to manual review
     if not x_api.is_configured():
@@ -113,7 +117,16 @@ async def verify_submission(acceptance_id: int, tweet_url: str) -> dict:
             result["reason"] = "Could not auto-verify authorship — manual review needed."
             result["auto"] = False
 
-    # Save verification result
+    _save_result(acceptance_id, campaign["id"], result)
+    return result
+
+
+@transactional
+def _save_result(acceptance_id: int, campaign_id: int, result: dict):
+    """Store the verification result (and complete the campaign) in one transaction.
+
+    Kept out of verify_submission so no transaction is open while X is queried.
+    """
     verification_json = json.dumps(result)
     if result["verified"]:
         acceptance_repo.update_acceptance_status(
@@ -124,16 +137,15 @@ async def verify_submission(acceptance_id: int, tweet_url: str) -> dict:
             },
         )
         # Check if all KOLs verified → complete campaign
-        _check_campaign_completion(campaign["id"])
+        _check_campaign_completion(campaign_id)
     else:
         acceptance_repo.update_acceptance_status(
             acceptance_id, "submitted",
             extra_fields={"verification_result": verification_json},
         )
 
-    return result
-
 
+@transactional
 def manually_verify(acceptance_id: int) -> bool:
     """Admin manually verifies a submission."""
     acceptance = acceptance_repo.get_acceptance_by_id(acceptance_id)
@@ -154,6 +166,7 @@ def manually_verify(acceptance_id: int) -> bool:
     return True
 
 
+@transactional
 def manually_reject(acceptance_id: int) -> bool:
     """Admin manually rejects a submission."""
     acceptance = acceptance_repo.get_acceptance_by_id(acceptance_id)
@@ -168,11 +181,46 @@ def manually_reject(acceptance_id: int) -> bool:
     return True
 
 
+@transactional
+def manually_verify_campaign(campaign_id: int) -> int:
+    """Admin approves every pending submission of a campaign in one transaction.
+
+    Returns the number of submissions verified.
+    """
+    from datetime import datetime
+    result_json = json.dumps({"verified": True, "reason": "Manually verified by admin.", "auto": False})
+    rows = acceptance_repo.bulk_update_submission_status(
+        campaign_id, "verified",
+        extra_fields={
+            "verification_result": result_json,
+            "verified_at": datetime.utcnow().isoformat(),
+        },
+    )
+    if rows:
+        _check_campaign_completion(campaign_id)
+    logger.info("Bulk-verified %d submission(s) for campaign #%d", len(rows), campaign_id)
+    return len(rows)
+
+
+@transactional
+def manually_reject_campaign(campaign_id: int) -> int:
+    """Admin rejects every pending submission of a campaign in one transaction.
+
+    Returns the number of submissions rejected.
+    """
+    result_json = json.dumps({"verified": False, "reason": "Rejected by admin.", "auto": False})
+    rows = acceptance_repo.bulk_update_submission_status(
+        campaign_id, "rejected",
+        extra_fields={"verification_result": result_json},
+    )
+    logger.info("Bulk-rejected %d submission(s) for campaign #%d", len(rows), campaign_id)
+    return len(rows)
+
+
 def _check_campaign_completion(campaign_id: int):
     """If all accepted KOLs are verified, mark campaign complete."""
     campaign = campaign_repo.get_campaign(campaign_id)
     if not campaign or campaign["status"] not in ("live", "filled"):
         return
-    verified_count = acceptance_repo.count_verified_for_campaign(campaign_id)
-    if verified_count >= campaign["kol_count"]:
+    if campaign["verified_count"] >= campaign["kol_count"]:
         complete_campaign(campaign_id)